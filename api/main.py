@@ -12,13 +12,56 @@ _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+import base64
+import dataclasses
+import itertools
+import json
+import math
+import time
+from contextlib import contextmanager
+
 import numpy as np
 import pandas as pd
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 
-from finance_app.services import get_ohlcv_with_indicators
-from finance_app.utils.exceptions import DataSourceError, ValidationError
+from finance_app.config import (
+    ENDPOINT_CONCURRENCY,
+    HEAVY_RANGE_DAYS,
+    MEMORY_BUDGET_ACTION,
+    MEMORY_PROFILING,
+    OVERLOAD_RETRY_AFTER_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+    REQUEST_MEMORY_BUDGET_MB,
+    SCREEN_DEADLINE_SECONDS,
+)
+from finance_app.services import (
+    get_corporate_actions,
+    get_many_with_indicators,
+    get_ohlcv_since,
+    get_ohlcv_with_indicators,
+    iter_ohlcv_with_indicators,
+    iter_screen,
+    resolve_date_range,
+    screen,
+)
+from finance_app.models.symbols import search_symbols
+from finance_app.services.screener_service import ScreenResult
+from finance_app.services.data_service import source_load, source_states
+from finance_app.utils.exceptions import (
+    DataSourceError,
+    DeadlineExceededError,
+    MemoryBudgetError,
+    SourceUnavailableError,
+    ValidationError,
+)
+from finance_app.utils.http_cache import http_cache_stats
+from finance_app.utils.memory import MB, MemoryBudget, MemoryMetrics, measure_memory
+from finance_app.utils.resilience import ConcurrencyLimiter, Deadline
+from finance_app.utils.binary_formats import MEDIA_TYPES, encode_frames, validate_format
+from finance_app.utils.validators import validate_interval
 
 app = FastAPI(title="NoKeyFinance API", version="0.1.0")
 
@@ -31,6 +74,71 @@ app.add_middleware(
 )
 
 
+_LIMITS = {name: ConcurrencyLimiter(name, n) for name, n in ENDPOINT_CONCURRENCY.items()}
+_MEMORY = MemoryMetrics()
+
+
+def _unavailable(e: SourceUnavailableError) -> HTTPException:
+    """503 with Retry-After for a source whose circuit is open or that is at capacity."""
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+
+def _timed_out(e: DeadlineExceededError) -> HTTPException:
+    return HTTPException(status_code=504, detail=str(e))
+
+
+def _acquire(name: str) -> ConcurrencyLimiter:
+    """Take a slot for an endpoint class, or fail fast with 429 + Retry-After."""
+    limiter = _LIMITS[name]
+    if not limiter.acquire():
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many concurrent {name} requests; retry shortly.",
+            headers={"Retry-After": str(OVERLOAD_RETRY_AFTER_SECONDS)},
+        )
+    return limiter
+
+
+@contextmanager
+def _admitted(name: str):
+    limiter = _acquire(name)
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+def _too_large(name: str, e: MemoryBudgetError) -> HTTPException:
+    _MEMORY.record(name, "rejected")
+    return HTTPException(status_code=413, detail=str(e))
+
+
+def _budget(fmt: str) -> MemoryBudget:
+    return MemoryBudget(int(REQUEST_MEMORY_BUDGET_MB * MB), MEMORY_BUDGET_ACTION, fmt)
+
+
+@contextmanager
+def _measured(name: str, label: str):
+    """Record the block's tracemalloc peak under name when MEMORY_PROFILING is on."""
+    with measure_memory(label, enabled=MEMORY_PROFILING) as usage:
+        yield
+    if usage.peak_bytes is not None:
+        _MEMORY.record_peak(name, usage.peak_bytes)
+
+
+def _ohlcv_class(start: str | None, end: str | None) -> str:
+    """Long ranges go to their own limit so they cannot crowd out cheap requests."""
+    try:
+        start_dt, end_dt = resolve_date_range(start, end)
+    except ValidationError:
+        return "ohlcv"  # rejected cheaply during the request itself
+    return "ohlcv_heavy" if (end_dt - start_dt).days > HEAVY_RANGE_DAYS else "ohlcv"
+
+
 def _df_to_records(df: pd.DataFrame) -> list[dict]:
     df = df.reset_index()
     df["date"] = df["date"].astype(str)
@@ -38,6 +146,66 @@ def _df_to_records(df: pd.DataFrame) -> list[dict]:
     return df.to_dict(orient="records")
 
 
+def _date_range(stock) -> list[str] | None:
+    if not stock.date_range:
+        return None
+    return [str(stock.date_range[0].date()), str(stock.date_range[1].date())]
+
+
+def _encode_cursor(stock, interval: str, adjusted: bool) -> str | None:
+    """Opaque resume point for /api/ohlcv?cursor=: the newest bar and the query it belongs to."""
+    if stock.empty:
+        return None
+    payload = {
+        "t": stock.df.index[-1].isoformat(),
+        "tk": stock.ticker,
+        "src": stock.source,
+        "iv": interval,
+        "adj": adjusted,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, ticker: str, source: str, interval: str, adjusted: bool):
+    """Timestamp of the cursor's newest bar; ValidationError if malformed or for another query."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        ts = pd.Timestamp(payload["t"])
+        query = (payload["tk"], payload["src"], payload["iv"], payload["adj"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationError("Invalid cursor.") from e
+    if query != (ticker.strip().upper(), source, interval, adjusted):
+        raise ValidationError(
+            "Cursor belongs to a different ticker, source, interval or adjustment."
+        )
+    return ts
+
+
+def _parse_since(since: str) -> pd.Timestamp:
+    try:
+        ts = pd.Timestamp(since.strip())
+    except ValueError as e:
+        raise ValidationError("since must be YYYY-MM-DD or an ISO date-time.") from e
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def _binary_response(frames, fmt: str, metadata: dict, name: str) -> Response:
+    """Arrow IPC / Parquet download of one frame or a {ticker: frame} mapping."""
+    try:
+        body = encode_frames(frames, fmt, metadata)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return Response(
+        content=body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
 @app.get("/api/ohlcv")
 def ohlcv(
     ticker: str = Query(..., min_length=1, max_length=20),
@@ -45,45 +213,369 @@ def ohlcv(
     end: str | None = Query(None),
     source: str = Query("yahoo"),
     show_indicators: bool = Query(True),
+    interval: str = Query("1d", max_length=5),
+    format: str = Query("json", max_length=10),
+    adjusted: bool = Query(False),
+    since: str | None = Query(None, max_length=40),
+    cursor: str | None = Query(None, max_length=500),
+):
+    """
+    Fetch OHLCV and optional indicators. Returns JSON: ticker, source, interval,
+    dateRange, rows, cursor. interval is 1m, 5m, 15m, 30m, 1h or 1d (intraday: Yahoo only).
+    format=arrow|parquet returns the frame as an Arrow IPC stream / Parquet file
+    (DatetimeIndex "date", original dtypes) instead of JSON. adjusted=true returns
+    split/dividend-adjusted prices (Stooq prices are already adjusted).
+    Requests over the memory budget get merged bars ("downsample": bars per row) or
+    413, depending on NOKEYFINANCE_MEMORY_BUDGET_ACTION.
+
+    Delta mode: since=<date or date-time> returns only rows after it (start is
+    ignored); cursor=<value from a previous response> returns rows from that
+    response's newest bar on, re-sending it since it may still have been forming.
+    Indicator values are computed with full warm-up, so the rows can be appended to
+    (or replace the tail of) the earlier series; drawdown/max_drawdown are omitted
+    as they depend on the whole series. Every response carries a new cursor.
+    """
+    with _measured("ohlcv", f"ohlcv {ticker} {interval}"):
+        source = source.strip().lower() or "yahoo"
+        try:
+            interval = validate_interval(interval)
+            if format != "json":
+                format = validate_format(format)
+            if since is not None and cursor is not None:
+                raise ValidationError("Pass either since or cursor, not both.")
+            delta_from = None
+            if cursor is not None:
+                delta_from = _decode_cursor(cursor, ticker, source, interval, adjusted)
+            elif since is not None:
+                delta_from = _parse_since(since)
+            limit = "ohlcv" if delta_from is not None else _ohlcv_class(start, end)
+            with _admitted(limit):
+                if delta_from is not None:
+                    stock, df = get_ohlcv_since(
+                        ticker,
+                        since=delta_from,
+                        end=end,
+                        source=source,
+                        interval=interval,
+                        adjusted=adjusted,
+                        deadline=Deadline(REQUEST_DEADLINE_SECONDS),
+                        budget=_budget(format),
+                        inclusive=cursor is not None,
+                    )
+                else:
+                    stock, df = get_ohlcv_with_indicators(
+                        ticker=ticker,
+                        start=start,
+                        end=end,
+                        source=source,
+                        interval=interval,
+                        adjusted=adjusted,
+                        deadline=Deadline(REQUEST_DEADLINE_SECONDS),
+                        budget=_budget(format),
+                    )
+        except MemoryBudgetError as e:
+            raise _too_large("ohlcv", e)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except SourceUnavailableError as e:
+            raise _unavailable(e)
+        except DeadlineExceededError as e:
+            raise _timed_out(e)
+        except DataSourceError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        downsample = df.attrs.get("downsample", 1)
+        if downsample > 1:
+            _MEMORY.record("ohlcv", "downsampled")
+        meta = {
+            "ticker": stock.ticker,
+            "source": stock.source,
+            "interval": interval,
+            "adjusted": adjusted,
+            "downsample": downsample,
+            "dateRange": _date_range(stock),
+            "cursor": _encode_cursor(stock, interval, adjusted) or cursor,
+        }
+        if delta_from is not None:
+            meta["since"] = delta_from.isoformat()
+        if format != "json":
+            return _binary_response(
+                df, format, meta, f"{stock.ticker}_{stock.source}_{interval}"
+            )
+        return {**meta, "rows": _df_to_records(df) if not df.empty else []}
+
+
+@app.get("/api/ohlcv/batch")
+def ohlcv_batch(
+    tickers: str = Query(..., min_length=1, max_length=2000),
+    start: str | None = Query(None),
+    end: str | None = Query(None),
+    source: str = Query("yahoo"),
+    interval: str = Query("1d", max_length=5),
+    format: str = Query("arrow", max_length=10),
+    adjusted: bool = Query(False),
 ):
     """
-    Fetch OHLCV and optional indicators. Returns JSON: ticker, source, dateRange, rows.
+    OHLCV + indicators for comma-separated tickers in one response. The default
+    format=arrow (or parquet) returns a single long table with a "ticker" column;
+    format=json returns {source, interval, tickers: {ticker: {dateRange, rows}},
+    errors}. Per-ticker failures are listed in errors (schema metadata for binary).
+    The memory budget is split across tickers; each reports its "downsample".
+    """
+    with _measured("batch", f"batch {len(tickers.split(','))} tickers"):
+        try:
+            interval = validate_interval(interval)
+            if format != "json":
+                format = validate_format(format)
+            with _admitted("batch"):
+                frames, errors = get_many_with_indicators(
+                    [t for t in tickers.split(",") if t.strip()],
+                    start=start,
+                    end=end,
+                    source=source.strip().lower() or "yahoo",
+                    interval=interval,
+                    adjusted=adjusted,
+                    deadline=Deadline(REQUEST_DEADLINE_SECONDS),
+                    budget=_budget(format),
+                )
+        except MemoryBudgetError as e:
+            raise _too_large("batch", e)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if any(df.attrs.get("downsample", 1) > 1 for _, df in frames.values()):
+            _MEMORY.record("batch", "downsampled")
+        meta = {
+            "source": source.strip().lower() or "yahoo",
+            "interval": interval,
+            "adjusted": adjusted,
+            "tickers": {
+                t: {"dateRange": _date_range(stock), "downsample": df.attrs.get("downsample", 1)}
+                for t, (stock, df) in frames.items()
+            },
+            "errors": errors,
+        }
+        if format != "json":
+            body = {t: df for t, (_, df) in frames.items()}
+            return _binary_response(body, format, meta, f"ohlcv_{len(frames)}_{interval}")
+        for t, (_, df) in frames.items():
+            meta["tickers"][t]["rows"] = _df_to_records(df) if not df.empty else []
+        return meta
+
+
+@app.get("/api/actions")
+def actions(
+    ticker: str = Query(..., min_length=1, max_length=20),
+    start: str | None = Query(None),
+    source: str = Query("yahoo"),
+):
+    """
+    Stored dividends and splits used by adjusted=true. Returns JSON: ticker, source,
+    events [{date, dividend, split, dividend_factor}].
     """
     try:
-        stock, df = get_ohlcv_with_indicators(
-            ticker=ticker,
-            start=start,
-            end=end,
-            source=source.strip().lower() or "yahoo",
-        )
+        with _admitted("actions"):
+            events = get_corporate_actions(
+                ticker,
+                start=start,
+                source=source.strip().lower(),
+                deadline=Deadline(REQUEST_DEADLINE_SECONDS),
+            )
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except SourceUnavailableError as e:
+        raise _unavailable(e)
+    except DeadlineExceededError as e:
+        raise _timed_out(e)
     except DataSourceError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "ticker": ticker.strip().upper(),
+        "source": source.strip().lower(),
+        "events": _df_to_records(events),
+    }
 
-    if df.empty:
-        return {
-            "ticker": stock.ticker,
-            "source": stock.source,
-            "dateRange": None,
-            "rows": [],
-        }
 
-    date_range = None
-    if stock.date_range:
-        date_range = [
-            str(stock.date_range[0].date()),
-            str(stock.date_range[1].date()),
-        ]
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/api/ohlcv/stream")
+def ohlcv_stream(
+    ticker: str = Query(..., min_length=1, max_length=20),
+    start: str | None = Query(None),
+    end: str | None = Query(None),
+    source: str = Query("yahoo"),
+    chunk_days: int = Query(365, ge=30, le=3650),
+    adjusted: bool = Query(False),
+):
+    """
+    Server-Sent Events version of /api/ohlcv for long ranges. Sends the most recent
+    chunk_days first, then older chunks as "chunk" events (ticker, source, chunk,
+    dateRange, rows; the first also has a cursor for /api/ohlcv delta polling), and
+    finally a "done" event ("backfill_error" if an older chunk fails). Indicators are
+    warmed up across chunk boundaries, so concatenated chunks match the non-streamed
+    response (drawdown/max_drawdown, which need the whole series, are omitted).
+    Each chunk's fetch gets its own REQUEST_DEADLINE_SECONDS.
+    """
+    limiter = _acquire("stream")
+    try:
+        try:
+            chunks = iter_ohlcv_with_indicators(
+                ticker=ticker,
+                start=start,
+                end=end,
+                source=source.strip().lower() or "yahoo",
+                chunk_days=chunk_days,
+                adjusted=adjusted,
+                deadline=Deadline(REQUEST_DEADLINE_SECONDS),
+            )
+            first = next(chunks)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except SourceUnavailableError as e:
+            raise _unavailable(e)
+        except DeadlineExceededError as e:
+            raise _timed_out(e)
+        except DataSourceError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    except BaseException:
+        limiter.release()
+        raise
+
+    def events():
+        count = rows = 0
+        try:
+            for stock, df in itertools.chain([first], chunks):
+                payload = {
+                    "ticker": stock.ticker,
+                    "source": stock.source,
+                    "chunk": count,
+                    "dateRange": _date_range(stock),
+                    "rows": _df_to_records(df) if not df.empty else [],
+                }
+                if count == 0:
+                    payload["cursor"] = _encode_cursor(stock, "1d", adjusted)
+                yield _sse("chunk", payload)
+                count += 1
+                rows += len(df)
+        except (ValidationError, DataSourceError) as e:
+            yield _sse("backfill_error", {"detail": str(e)})
+        finally:
+            # Held for the whole stream; also runs if the client disconnects
+            limiter.release()
+        yield _sse("done", {"chunks": count, "rows": rows})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class ScreenRequest(BaseModel):
+    universe: list[str] = Field(..., min_length=1)
+    expr: str = Field(..., min_length=1, max_length=500)
+    source: str = "yahoo"
+    stream: bool = False
+
+
+@app.post("/api/screen")
+def screen_universe(req: ScreenRequest):
+    """
+    Screen a universe with an indicator expression, e.g. "rsi < 30 and close > sma_200".
+    Returns JSON: expression, scanned, matches, errors, timings. With stream=true, returns
+    NDJSON: one line per finished chunk, then a final summary line.
+    """
+    source = req.source.strip().lower() or "yahoo"
+    deadline = Deadline(SCREEN_DEADLINE_SECONDS)
+    if not req.stream:
+        try:
+            with _admitted("screen"):
+                result = screen(req.universe, req.expr, source=source, deadline=deadline)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except DeadlineExceededError as e:
+            raise _timed_out(e)
+        return result.to_dict()
+
+    t0 = time.perf_counter()
+    limiter = _acquire("screen")
+    try:
+        chunks = iter_screen(req.universe, req.expr, source=source, deadline=deadline)
+        first = next(chunks, None)
+    except ValidationError as e:
+        limiter.release()
+        raise HTTPException(status_code=422, detail=str(e))
+    except DeadlineExceededError as e:
+        limiter.release()
+        raise _timed_out(e)
+    except BaseException:
+        limiter.release()
+        raise
+
+    def lines():
+        result = ScreenResult(expression=req.expr.strip())
+        try:
+            for chunk in itertools.chain([first] if first is not None else [], chunks):
+                result.add(chunk)
+                yield json.dumps({"type": "chunk", **chunk.to_dict()}) + "\n"
+        except DeadlineExceededError as e:
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        finally:
+            limiter.release()
+        result.timings["total"] = time.perf_counter() - t0
+        summary = result.to_dict()
+        summary.pop("matches")
+        summary.pop("errors")
+        summary["matched"] = len(result.matches)
+        yield json.dumps({"type": "done", **summary}) + "\n"
 
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/api/symbols")
+def symbols(
+    q: str = Query(..., max_length=64),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Ticker autocomplete from the local symbol directory (no upstream call): symbols
+    and names matching q by prefix, then close spellings. Returns JSON: query,
+    results [{symbol, name, exchange, stooq}].
+    """
     return {
-        "ticker": stock.ticker,
-        "source": stock.source,
-        "dateRange": date_range,
-        "rows": _df_to_records(df),
+        "query": q,
+        "results": [dataclasses.asdict(s) for s in search_symbols(q, limit)],
+    }
+
+
+@app.get("/api/metrics")
+def metrics():
+    """
+    Per-endpoint memory: tracemalloc peaks (when enabled), downsampled/rejected counts;
+    HTTP cache entries, bytes and this worker's hit rate.
+    """
+    return {
+        "memory": {
+            "budget_mb": REQUEST_MEMORY_BUDGET_MB,
+            "action": MEMORY_BUDGET_ACTION,
+            "profiling": MEMORY_PROFILING,
+            "endpoints": _MEMORY.snapshot(),
+        },
+        "http_cache": http_cache_stats(),
     }
 
 
 @app.get("/api/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "sources": source_states(),
+        "load": {
+            "endpoints": {
+                name: {"in_flight": lim.in_flight, "limit": lim.limit}
+                for name, lim in _LIMITS.items()
+            },
+            "sources": source_load(),
+        },
+    }
@@ -0,0 +1,397 @@
+"""
+Bulk OHLCV backfill into a local Parquet store.
+
+  python -m finance_app.backfill tickers.txt --start 2000-01-01 --source stooq
+  python -m finance_app.backfill --tickers AAPL,MSFT,NVDA --start 2015-01-01 --workers 8
+
+Tickers come from a file (one per line or first CSV column, "#" comments, "-" for
+stdin) and/or --tickers. Fetches run on --workers threads, paced by a per-source
+token bucket (--rate requests per second), and each ticker's normalized, unadjusted
+bars go to <out>/<source>/<interval>/<TICKER>.parquet. Finished tickers are appended
+to a checkpoint file, so rerunning the same command resumes where it stopped.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional, Sequence, TextIO
+
+import pandas as pd
+
+from .config import (
+    BACKFILL_RATE_LIMITS,
+    BACKFILL_RETRIES,
+    BACKFILL_WORKERS,
+    SOURCE_YAHOO,
+    STORE_DIR,
+)
+from .data_sources.base import split_windows
+from .services import get_ohlcv, resolve_date_range
+from .storage.parquet_store import ParquetStore
+from .utils.exceptions import (
+    DataSourceError,
+    NoDataError,
+    SourceUnavailableError,
+    ValidationError,
+)
+from .utils.resilience import RateLimiter
+from .utils.validators import (
+    MAX_DATE_RANGE_DAYS,
+    is_intraday,
+    validate_date_range,
+    validate_interval,
+)
+
+CHECKPOINT_NAME = "_backfill.jsonl"
+# Statuses that count as finished when resuming; "failed" tickers are tried again
+DONE_STATUSES = ("ok", "nodata")
+
+
+@dataclass
+class TickerResult:
+    ticker: str
+    status: str  # ok | nodata | failed
+    rows: int = 0
+    error: str = ""
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of one run; skipped tickers were already done per the checkpoint."""
+
+    total: int
+    skipped: int = 0
+    duration: float = 0.0
+    statuses: dict = field(default_factory=dict)
+    rows: int = 0
+    failed: list[str] = field(default_factory=list)
+    interrupted: bool = False
+
+    @property
+    def processed(self) -> int:
+        return sum(self.statuses.values())
+
+    def rate(self) -> float:
+        """Tickers per second processed in this run."""
+        return self.processed / self.duration if self.duration > 0 else 0.0
+
+    def progress_line(self) -> str:
+        done = self.skipped + self.processed
+        pct = 100.0 * done / self.total if self.total else 100.0
+        rate = self.rate()
+        remaining = self.total - done
+        eta = _format_seconds(remaining / rate) if rate > 0 else "--"
+        rows_per_s = self.rows / self.duration if self.duration > 0 else 0.0
+        counts = "  ".join(f"{k}={v}" for k, v in sorted(self.statuses.items()))
+        return (
+            f"{done:>{len(str(self.total))}}/{self.total}  {pct:5.1f}%  "
+            f"{rate:.2f} tickers/s  {rows_per_s:,.0f} rows/s  {counts}  ETA {eta}"
+        )
+
+    def format(self) -> str:
+        lines = [
+            f"tickers       {self.processed} fetched, {self.skipped} already done, "
+            f"{self.total} total",
+            f"duration      {self.duration:.1f}s ({self.rate():.2f} tickers/s)",
+            f"rows          {self.rows:,}",
+            "statuses      " + "  ".join(f"{k}={v}" for k, v in sorted(self.statuses.items())),
+        ]
+        if self.failed:
+            shown = ", ".join(self.failed[:20]) + (" ..." if len(self.failed) > 20 else "")
+            lines.append(f"failed        {shown}")
+        if self.interrupted:
+            lines.append("interrupted   rerun the same command to resume")
+        return "\n".join(lines)
+
+
+def read_tickers(paths: Sequence[str] = (), inline: Optional[str] = None) -> list[str]:
+    """Tickers from files ("-" = stdin) and a comma-separated string, uppercased, deduplicated."""
+    raw: list[str] = []
+    for path in paths:
+        if path == "-":
+            raw.extend(sys.stdin.read().splitlines())
+        else:
+            raw.extend(Path(path).read_text(encoding="utf-8").splitlines())
+    if inline:
+        raw.extend(inline.split(","))
+    tickers: list[str] = []
+    seen: set[str] = set()
+    for line in raw:
+        sym = line.split("#", 1)[0].split(",", 1)[0].strip().upper()
+        if not sym or sym in ("SYMBOL", "TICKER") or sym in seen:
+            continue
+        seen.add(sym)
+        tickers.append(sym)
+    return tickers
+
+
+def load_checkpoint(
+    path: Path, start: Optional[str], end: Optional[str]
+) -> dict[str, dict]:
+    """Finished tickers recorded for the same start/end arguments, keyed by ticker."""
+    done: dict[str, dict] = {}
+    if not path.is_file():
+        return done
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a killed run
+            if rec.get("start") != start or rec.get("end") != end:
+                continue
+            if rec.get("status") in DONE_STATUSES:
+                done[rec["ticker"]] = rec
+            else:
+                done.pop(rec.get("ticker"), None)
+    return done
+
+
+def backfill_ticker(
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    source: str,
+    interval: str,
+    store: ParquetStore,
+    limiter: RateLimiter,
+    retries: int = BACKFILL_RETRIES,
+    stop: Optional[threading.Event] = None,
+    fetch: Callable = get_ohlcv,
+) -> TickerResult:
+    """
+    Fetch one ticker (daily ranges longer than MAX_DATE_RANGE_DAYS in several calls),
+    pacing each call with limiter, and merge the bars into the store. Windows with no
+    data (e.g. before a listing) are skipped; retryable errors back off and retry.
+    """
+    if is_intraday(interval):
+        windows = [(start, end)]
+    else:
+        start_dt, end_dt = _full_range(start, end)
+        windows = [
+            (a.strftime("%Y-%m-%d"), b.strftime("%Y-%m-%d"))
+            for a, b in split_windows(start_dt, end_dt, MAX_DATE_RANGE_DAYS)
+        ]
+    frames = []
+    for w_start, w_end in windows:
+        if stop is not None and stop.is_set():
+            return TickerResult(ticker, "failed", error="interrupted")
+        try:
+            frames.append(
+                _fetch_with_retries(
+                    fetch, ticker, w_start, w_end, source, interval, limiter, retries, stop
+                )
+            )
+        except NoDataError:
+            continue
+        except (ValidationError, DataSourceError) as e:
+            return TickerResult(ticker, "failed", error=str(e))
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return TickerResult(ticker, "nodata")
+    df = pd.concat(frames)
+    df = df[~df.index.duplicated(keep="last")]
+    store.write(source, ticker, df, interval)
+    return TickerResult(ticker, "ok", rows=len(df))
+
+
+def run_backfill(
+    tickers: Sequence[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = SOURCE_YAHOO,
+    interval: str = "1d",
+    workers: int = BACKFILL_WORKERS,
+    rate: Optional[float] = None,
+    out: Path = STORE_DIR,
+    checkpoint: Optional[Path] = None,
+    resume: bool = True,
+    retries: int = BACKFILL_RETRIES,
+    progress: Optional[TextIO] = sys.stdout,
+    progress_every: float = 5.0,
+) -> BackfillReport:
+    """
+    Backfill tickers into a ParquetStore at out and return a BackfillReport.
+
+    rate is upstream requests per second (default BACKFILL_RATE_LIMITS[source]; 0 =
+    unpaced). Each finished ticker is appended to the checkpoint (default
+    <out>/<source>/<interval>/_backfill.jsonl); with resume, tickers already recorded
+    as ok/nodata for the same start/end are skipped. Ctrl-C stops after in-flight
+    fetches and returns a report marked interrupted.
+    """
+    interval = validate_interval(interval)
+    # Fail on bad dates before any work starts
+    if is_intraday(interval):
+        resolve_date_range(start, end)
+    else:
+        _full_range(start, end)
+    out = Path(out)
+    store = ParquetStore(out)
+    checkpoint = Path(checkpoint) if checkpoint else out / source / interval / CHECKPOINT_NAME
+    done = load_checkpoint(checkpoint, start, end) if resume else {}
+    todo = [t for t in tickers if t not in done]
+    report = BackfillReport(total=len(tickers), skipped=len(tickers) - len(todo))
+    limiter = RateLimiter(BACKFILL_RATE_LIMITS.get(source, 0.0) if rate is None else rate)
+    stop = threading.Event()
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    last_print = t0
+    pending: set = set()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill")
+    with checkpoint.open("a", encoding="utf-8") as log:
+
+        def collect(fut) -> None:
+            pending.discard(fut)
+            res = fut.result()
+            if res.error == "interrupted":
+                return
+            _record(log, res, start, end)
+            report.statuses[res.status] = report.statuses.get(res.status, 0) + 1
+            report.rows += res.rows
+            if res.status == "failed":
+                report.failed.append(res.ticker)
+            report.duration = time.perf_counter() - t0
+
+        try:
+            pending.update(
+                pool.submit(
+                    backfill_ticker, t, start, end, source, interval, store, limiter,
+                    retries, stop,
+                )
+                for t in todo
+            )
+            for fut in as_completed(list(pending)):
+                collect(fut)
+                now = time.perf_counter()
+                if progress is not None and now - last_print >= progress_every:
+                    print(report.progress_line(), file=progress, flush=True)
+                    last_print = now
+        except KeyboardInterrupt:
+            report.interrupted = True
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Tickers that finished while shutting down are stored; checkpoint them too
+            for fut in list(pending):
+                if fut.done() and not fut.cancelled():
+                    collect(fut)
+        finally:
+            pool.shutdown(wait=True)
+            report.duration = time.perf_counter() - t0
+    if progress is not None:
+        print(report.progress_line(), file=progress, flush=True)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill OHLCV into a local Parquet store.")
+    parser.add_argument("files", nargs="*", help="ticker list files ('-' for stdin)")
+    parser.add_argument("--tickers", default=None, help="comma-separated tickers")
+    parser.add_argument("--start", default=None, help="YYYY-MM-DD (default: lookback window)")
+    parser.add_argument("--end", default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--source", default=SOURCE_YAHOO, choices=sorted(BACKFILL_RATE_LIMITS))
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="upstream requests per second (default per source; 0 = unpaced)")
+    parser.add_argument("--out", type=Path, default=STORE_DIR)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint")
+    parser.add_argument("--retries", type=int, default=BACKFILL_RETRIES)
+    parser.add_argument("--progress-every", type=float, default=5.0, help="seconds")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every fetch")
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args.files, args.tickers)
+    if not tickers:
+        parser.error("no tickers given (pass a file or --tickers)")
+    if not args.verbose:
+        _quiet_logs()
+    try:
+        report = run_backfill(
+            tickers,
+            start=args.start,
+            end=args.end,
+            source=args.source,
+            interval=args.interval,
+            workers=args.workers,
+            rate=args.rate,
+            out=args.out,
+            checkpoint=args.checkpoint,
+            resume=not args.restart,
+            retries=args.retries,
+            progress_every=args.progress_every,
+        )
+    except ValidationError as e:
+        parser.error(str(e))
+    print(report.format())
+    if report.interrupted:
+        sys.exit(130)
+    if report.failed:
+        sys.exit(1)
+
+
+def _fetch_with_retries(fetch, ticker, start, end, source, interval, limiter, retries, stop):
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            return fetch(ticker, start, end, source=source, interval=interval).df
+        except (NoDataError, ValidationError):
+            raise
+        except DataSourceError as e:
+            attempt += 1
+            if attempt > retries or (stop is not None and stop.is_set()):
+                raise
+            delay = min(60.0, 2.0 ** attempt)
+            if isinstance(e, SourceUnavailableError) and e.retry_after:
+                delay = max(delay, float(e.retry_after))
+            if stop is not None:
+                stop.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+def _full_range(start: Optional[str], end: Optional[str]) -> tuple[datetime, datetime]:
+    """resolve_date_range without the MAX_DATE_RANGE_DAYS cap (long ranges are windowed)."""
+    if start is None:
+        return resolve_date_range(None, end)
+    now = datetime.now()
+    start_dt, end_dt = validate_date_range(start, end or now.strftime("%Y-%m-%d"))
+    return start_dt, end_dt if end else now
+
+
+def _record(log: TextIO, res: TickerResult, start: Optional[str], end: Optional[str]) -> None:
+    rec = {"ticker": res.ticker, "status": res.status, "rows": res.rows, "start": start, "end": end}
+    if res.error:
+        rec["error"] = res.error
+    log.write(json.dumps(rec) + "\n")
+    log.flush()
+
+
+def _quiet_logs() -> None:
+    """Drop per-fetch INFO logs from the app's module loggers; progress lines replace them."""
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if name.startswith("finance_app.") and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.WARNING)
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """Application configuration. No secrets, no API keys."""
 
+import os
 from pathlib import Path
+from typing import Optional
 
 # Project root (parent of finance_app)
 PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent
@@ -12,6 +14,63 @@ DEFAULT_LOOKBACK_DAYS: int = 365
 CACHE_DIR: Path = PROJECT_ROOT / ".cache"
 CACHE_ENABLED: bool = True
 CACHE_TTL_SECONDS: int = 300  # 5 minutes
+# HTTP cache upkeep: size cap on stored responses (LRU pruning), how long expired
+# responses stay as stale_if_error fallbacks, background prune/VACUUM interval and
+# how long a worker waits on the SQLite lock
+CACHE_MAX_BYTES: int = int(float(os.getenv("NOKEYFINANCE_CACHE_MAX_MB") or 512) * 1024 * 1024)
+CACHE_STALE_SECONDS: int = 24 * 3600
+CACHE_MAINTENANCE_SECONDS: float = 600.0
+CACHE_BUSY_TIMEOUT_MS: int = 5000
+# Per-source (live, historical) TTLs for bar requests: ranges ending within
+# CACHE_SETTLE_DAYS still change; older ones only on later adjustments (Stooq's
+# history is dividend-adjusted, so it is refreshed weekly). Only requests-based
+# traffic is cached: yfinance fetches through curl_cffi, which requests-cache never
+# sees, so Yahoo bars are reused through the in-process frame memo instead.
+CACHE_SETTLE_DAYS: int = 2
+CACHE_SOURCE_TTLS: dict[str, tuple[int, int]] = {
+    "stooq": (300, 7 * 24 * 3600),
+}
+
+# Stored corporate actions (dividends, splits) used for local price adjustment
+ACTIONS_DIR: Path = Path(os.getenv("NOKEYFINANCE_ACTIONS_DIR") or CACHE_DIR / "actions")
+
+# Failed lookups: "no data" answers are remembered briefly; repeated source errors
+# open a per-source circuit that fails fast until a probe succeeds
+NEGATIVE_CACHE_TTL_SECONDS: int = 60
+NEGATIVE_CACHE_MAX_ENTRIES: int = 10_000
+CIRCUIT_FAILURE_THRESHOLD: int = 5
+CIRCUIT_RECOVERY_SECONDS: float = 30.0
+
+# Load shedding: per-request deadline, concurrent requests per API endpoint class and
+# upstream calls per source (0 = unlimited). Excess requests get 429/503 + Retry-After.
+# Endpoint limits sum below uvicorn's 40 worker threads so cheap requests always get one.
+REQUEST_DEADLINE_SECONDS: float = float(os.getenv("NOKEYFINANCE_DEADLINE_SECONDS") or 20.0)
+SCREEN_DEADLINE_SECONDS: float = 300.0
+ENDPOINT_CONCURRENCY: dict[str, int] = {
+    "ohlcv": 16,
+    "ohlcv_heavy": 4,
+    "stream": 4,
+    "batch": 2,
+    "screen": 2,
+    "actions": 8,
+}
+SOURCE_CONCURRENCY: dict[str, int] = {"yahoo": 8, "stooq": 4}
+# How long a fetch may wait for a free source slot before giving up
+SOURCE_SLOT_WAIT_SECONDS: float = 0.5
+OVERLOAD_RETRY_AFTER_SECONDS: int = 1
+# /api/ohlcv ranges longer than this count against the "ohlcv_heavy" limit
+HEAVY_RANGE_DAYS: int = 5 * 365
+
+# Memory guard: requests whose rows x columns estimate exceeds the budget are
+# downsampled to merged bars or rejected (413); 0 disables. Per-request tracemalloc
+# peaks (logged and served at /api/metrics) are opt-in as tracing slows allocation.
+REQUEST_MEMORY_BUDGET_MB: float = float(os.getenv("NOKEYFINANCE_MEMORY_BUDGET_MB") or 256)
+MEMORY_BUDGET_ACTION: str = os.getenv("NOKEYFINANCE_MEMORY_BUDGET_ACTION") or "downsample"
+MEMORY_PROFILING: bool = os.getenv("NOKEYFINANCE_TRACEMALLOC", "") == "1"
+
+# Indicator kernels: "numba" (single-pass compiled loops, needs numba), "numpy"
+# (pandas/NumPy) or "auto" = numba when installed. Both give identical values.
+INDICATOR_BACKEND: str = os.getenv("NOKEYFINANCE_INDICATOR_BACKEND") or "auto"
 
 # Logging
 LOG_LEVEL: str = "INFO"
@@ -20,3 +79,54 @@ LOG_FORMAT: str = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 # Data source names
 SOURCE_YAHOO: str = "yahoo"
 SOURCE_STOOQ: str = "stooq"
+
+# Upstream base URLs. Unset = real Yahoo/Stooq; point them at a local stand-in
+# (python -m finance_app.devtools.fake_upstream) for offline load tests.
+YAHOO_BASE_URL: Optional[str] = os.getenv("NOKEYFINANCE_YAHOO_URL") or None
+STOOQ_BASE_URL: Optional[str] = os.getenv("NOKEYFINANCE_STOOQ_URL") or None
+UPSTREAM_TIMEOUT_SECONDS: float = 30.0
+
+# Concurrent window requests per intraday fetch
+INTRADAY_FETCH_WORKERS: int = 4
+
+# Multi-ticker requests: tickers per call and concurrent fetches
+BATCH_MAX_TICKERS: int = 100
+BATCH_WORKERS: int = 8
+
+# Bulk backfill (python -m finance_app.backfill): Parquet output directory, fetch
+# threads, upstream requests per second per source, and retries per failed window
+STORE_DIR: Path = Path(os.getenv("NOKEYFINANCE_STORE_DIR") or CACHE_DIR / "store")
+BACKFILL_WORKERS: int = 8
+BACKFILL_RATE_LIMITS: dict[str, float] = {"yahoo": 2.0, "stooq": 1.0}
+BACKFILL_RETRIES: int = 3
+
+# Stooq archive ingestion (python -m finance_app.ingest_stooq): worker processes and
+# archive members per task. Stooq requests whose range a stored file covers are served
+# from STORE_DIR without a network call while the file is younger than
+# STOOQ_STORE_MAX_DAYS (0 = any age); later dividends change Stooq's adjusted history.
+INGEST_WORKERS: int = min(8, os.cpu_count() or 1)
+INGEST_CHUNK_SIZE: int = 200
+STOOQ_USE_STORE: bool = os.getenv("NOKEYFINANCE_STOOQ_STORE", "1") != "0"
+STOOQ_STORE_MAX_DAYS: float = float(os.getenv("NOKEYFINANCE_STOOQ_STORE_MAX_DAYS") or 7)
+
+# Trading calendars: minutes after a session's close until a source has published its
+# final bars; ranges that are final are memoized in-process until the next open
+SESSION_SETTLE_MINUTES: dict[str, int] = {"yahoo": 30, "stooq": 180}
+FRAME_MEMO_MAX_ENTRIES: int = 256
+
+# Symbol directory for autocomplete and ticker checks: the refreshed copy written by
+# python -m finance_app.symbols when present, else the bundled subset. Unknown tickers
+# are rejected before any upstream call only on markets the file lists completely.
+BUNDLED_SYMBOLS_FILE: Path = PROJECT_ROOT / "finance_app" / "data" / "symbols.csv"
+SYMBOLS_FILE: Path = Path(os.getenv("NOKEYFINANCE_SYMBOLS_FILE") or CACHE_DIR / "symbols.csv")
+SYMBOL_CHECK: bool = os.getenv("NOKEYFINANCE_SYMBOL_CHECK", "1") != "0"
+# Nasdaq Trader symbol directory: every Nasdaq, NYSE, NYSE American/Arca and Cboe listing
+SYMBOLS_REFRESH_URLS: tuple[str, ...] = (
+    "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+)
+
+# Screener: tickers per process-pool task, pool size, and universe cap
+SCREEN_CHUNK_SIZE: int = 50
+SCREEN_WORKERS: int = min(8, os.cpu_count() or 1)
+SCREEN_MAX_UNIVERSE: int = 5000
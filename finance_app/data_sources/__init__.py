@@ -1,7 +1,14 @@
 """Data source adapters (Yahoo, Stooq)."""
 
-from .base import BaseDataSource, OHLCV_COLUMNS
+from .base import ACTION_COLUMNS, BaseDataSource, OHLCV_COLUMNS, split_windows
 from .stooq import StooqSource
 from .yahoo import YahooSource
 
-__all__ = ["BaseDataSource", "OHLCV_COLUMNS", "YahooSource", "StooqSource"]
+__all__ = [
+    "ACTION_COLUMNS",
+    "BaseDataSource",
+    "OHLCV_COLUMNS",
+    "YahooSource",
+    "StooqSource",
+    "split_windows",
+]
@@ -1,19 +1,47 @@
 """Base contract for data source adapters."""
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
 
 import pandas as pd
 
+from ..utils.exceptions import DataSourceError
+
 
 # Normalized OHLCV column names used across all sources
 OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
 
+# Corporate action columns returned by fetch_actions
+ACTION_COLUMNS = ("dividend", "split", "dividend_factor")
+
+
+def split_windows(
+    start: datetime, end: datetime, window_days: int
+) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive windows of at most window_days, oldest first."""
+    step = timedelta(days=window_days)
+    windows = []
+    cur = start
+    while cur < end:
+        nxt = min(cur + step, end)
+        windows.append((cur, nxt))
+        cur = nxt
+    return windows or [(start, end)]
+
 
 class BaseDataSource(ABC):
     """Abstract base for fetching OHLCV data. All sources must return the same shape."""
 
+    # Bar intervals this source can serve (see utils.validators.SUPPORTED_INTERVALS)
+    intervals: tuple[str, ...] = ("1d",)
+    # Adjustments ("split", "dividend") already applied to the prices the source serves
+    price_adjustments: tuple[str, ...] = ()
+    # True when fetch() includes the whole end date (Stooq's d2); False when end is an
+    # exclusive instant (Yahoo's period2)
+    end_inclusive: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -26,27 +54,113 @@ class BaseDataSource(ABC):
         ticker: str,
         start: datetime,
         end: datetime,
+        interval: str = "1d",
+        timeout: Optional[float] = None,
         **kwargs: Any,
     ) -> pd.DataFrame:
         """
-        Fetch historical OHLCV for the given ticker and date range.
+        Fetch historical OHLCV bars of the given interval for the ticker and date range.
 
         Returns a DataFrame with DatetimeIndex and columns: open, high, low, close, volume.
+        timeout caps each upstream HTTP request (None = UPSTREAM_TIMEOUT_SECONDS).
         Missing or invalid data should raise DataSourceError.
         """
         pass
 
+    def read_local(
+        self, ticker: str, start: datetime, end: datetime, interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        """
+        The fetch() result for this request from local data, or None when there is
+        none covering the range (the caller then fetches upstream).
+        """
+        return None
+
+    def max_lookback_days(self, interval: str) -> Optional[int]:
+        """How far back (days from today) the source serves this interval; None = no limit."""
+        return None
+
+    def fetch_actions(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timeout: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Corporate actions with ex-dates in [start, end]: DatetimeIndex and columns
+        dividend (cash per share, 0 if none), split (new shares per old, 1 if none) and
+        dividend_factor (1 - dividend / previous close). Empty frame if there were none.
+        Sources without action data raise DataSourceError.
+        """
+        raise DataSourceError(f"{self.name} does not provide corporate actions.")
+
+    @staticmethod
+    def _actions_from_bars(
+        df: pd.DataFrame, start: datetime, dividend_col: str, split_col: str
+    ) -> pd.DataFrame:
+        """
+        Build the fetch_actions frame from daily bars carrying per-bar dividend and split
+        columns (0 = no event). Bars should start a few days before start so the close
+        preceding the first ex-date is available.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame(
+                columns=list(ACTION_COLUMNS), index=pd.DatetimeIndex([], name="date")
+            )
+        bars = df.copy()
+        bars.index = pd.to_datetime(bars.index)
+        if bars.index.tz is not None:
+            bars.index = bars.index.tz_localize(None)
+        bars.index = bars.index.normalize()
+        bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+        dividend = pd.to_numeric(bars.get(dividend_col, 0.0), errors="coerce").fillna(0.0)
+        split = pd.to_numeric(bars.get(split_col, 0.0), errors="coerce").fillna(0.0)
+        prev_close = bars["close"].shift(1)
+        events = pd.DataFrame({
+            "dividend": dividend,
+            "split": split.where(split > 0, 1.0),
+            "dividend_factor": (1.0 - dividend / prev_close).where(dividend > 0, 1.0),
+        })
+        events.index.name = "date"
+        hit = (events["dividend"] > 0) | (events["split"] != 1.0)
+        events = events[hit & (events.index >= pd.Timestamp(start).normalize())]
+        # A dividend on the first bar has no prior close; leave its price factor neutral
+        return events.fillna({"dividend_factor": 1.0})
+
+    def _fetch_windows(
+        self,
+        fetch_one: Callable[[datetime, datetime], pd.DataFrame],
+        windows: list[tuple[datetime, datetime]],
+        max_workers: int,
+    ) -> pd.DataFrame:
+        """
+        Fetch windows with at most max_workers in flight, then merge with a single
+        concat and normalize (which drops timestamps repeated at window edges).
+        """
+        if len(windows) == 1:
+            frames = [fetch_one(*windows[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as pool:
+                frames = list(pool.map(lambda w: fetch_one(*w), windows))
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return self._normalize(None)
+        return self._normalize(pd.concat(frames) if len(frames) > 1 else frames[0])
+
     def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Ensure index is timezone-naive DatetimeIndex and columns are lowercase.
-        Drops rows with all NaN and fills missing volume with 0.
+        Drops rows with all NaN and repeated timestamps (keeping the last), and fills
+        missing volume with 0.
         """
         if df is None or df.empty:
             return pd.DataFrame(columns=list(OHLCV_COLUMNS))
         out = df.copy()
         if isinstance(out.columns, pd.MultiIndex):
             out.columns = out.columns.get_level_values(0)
-        out.index = pd.to_datetime(out.index)
+        if not isinstance(out.index, pd.DatetimeIndex):
+            out.index = pd.to_datetime(out.index)
         if out.index.tz is not None:
             out.index = out.index.tz_convert("UTC").tz_localize(None)
         out.index.name = "date"
@@ -62,6 +176,8 @@ class BaseDataSource(ABC):
                 out[c] = float("nan")
         out = out[list(OHLCV_COLUMNS)]
         out = out.dropna(how="all", subset=["open", "high", "low", "close"])
+        if not out.index.is_unique:
+            out = out[~out.index.duplicated(keep="last")]
         vol = out["volume"].fillna(0)
         vol = vol.clip(lower=0)  # disallow negative volume from bad data
         out["volume"] = vol.astype("int64")
@@ -1,51 +1,168 @@
 """Stooq data via pandas_datareader. No API key required."""
 
-from datetime import datetime
-from typing import Any
+import io
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
 import pandas as pd
 
-from ..utils.exceptions import DataSourceError
+from ..config import STOOQ_BASE_URL, STOOQ_STORE_MAX_DAYS, UPSTREAM_TIMEOUT_SECONDS
+from ..models.calendar import calendar_for
+from ..models.symbols import canonical, stooq_symbol
+from ..utils.exceptions import DataSourceError, NoDataError
 from ..utils.logger import get_logger
 from .base import BaseDataSource
 
+if TYPE_CHECKING:
+    from ..storage.parquet_store import ParquetStore
+
 _log = get_logger(__name__)
 
+# Columns read from Stooq's bulk text files
+# (<TICKER>,<PER>,<DATE>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>,<OPENINT>)
+_FILE_COLUMNS = {
+    "<DATE>": "int64",
+    "<OPEN>": "float64",
+    "<HIGH>": "float64",
+    "<LOW>": "float64",
+    "<CLOSE>": "float64",
+    "<VOL>": "float64",
+}
+
 
 def _get_stooq_reader():
-    """Lazy import to avoid loading pandas_datareader.data (has compat issues on Python 3.13)."""
+    """
+    Lazy import to avoid loading pandas_datareader.data (has compat issues on Python 3.13).
+    When STOOQ_BASE_URL is set, returns a reader that targets that host instead.
+    """
     from pandas_datareader.stooq import StooqDailyReader
-    return StooqDailyReader
+    if not STOOQ_BASE_URL:
+        return StooqDailyReader
+    url = f"{STOOQ_BASE_URL.rstrip('/')}/q/d/l/"
+
+    class _LocalStooqDailyReader(StooqDailyReader):
+        @property
+        def url(self):
+            return url
+
+    return _LocalStooqDailyReader
+
+
+def _yyyymmdd(values: np.ndarray) -> np.ndarray:
+    """datetime64 dates from YYYYMMDD integers, without parsing strings."""
+    year, rest = np.divmod(values, 10000)
+    month, day = np.divmod(rest, 100)
+    months = ((year - 1970) * 12 + month - 1).astype("M8[M]")
+    return (months.astype("M8[D]") + (day - 1).astype("m8[D]")).astype("M8[ns]")
+
+
+def read_stooq_file(data: bytes) -> pd.DataFrame:
+    """
+    Daily bars of one file from a Stooq bulk archive (e.g. aapl.us.txt), with Open..
+    Volume columns and a date index; empty for a header-only file. Raises ValueError
+    for intraday files (the period is the same on every row, so one is checked).
+    """
+    lines = data.split(b"\n", 2)
+    if len(lines) < 2 or not lines[1].strip():
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+    period = lines[1].split(b",", 2)[1:2]
+    if period != [b"D"]:
+        raise ValueError(f"not daily bars (period {b''.join(period).decode(errors='replace')!r})")
+    df = pd.read_csv(io.BytesIO(data), usecols=list(_FILE_COLUMNS), dtype=_FILE_COLUMNS)
+    return pd.DataFrame({
+        "Open": df["<OPEN>"].to_numpy(),
+        "High": df["<HIGH>"].to_numpy(),
+        "Low": df["<LOW>"].to_numpy(),
+        "Close": df["<CLOSE>"].to_numpy(),
+        "Volume": df["<VOL>"].to_numpy(),
+    }, index=pd.DatetimeIndex(_yyyymmdd(df["<DATE>"].to_numpy())))
 
 
 class StooqSource(BaseDataSource):
-    """Fetches OHLCV from Stooq using pandas_datareader StooqDailyReader."""
+    """
+    Fetches OHLCV from Stooq using pandas_datareader StooqDailyReader. With a store,
+    ranges a stored file covers (from python -m finance_app.ingest_stooq or a Stooq
+    backfill) are read from it instead.
+    """
+
+    # Stooq serves split- and dividend-adjusted prices
+    price_adjustments = ("split", "dividend")
+    end_inclusive = True
+
+    def __init__(self, store: Optional["ParquetStore"] = None) -> None:
+        self.store = store
 
     @property
     def name(self) -> str:
         return "stooq"
 
+    def read_local(
+        self, ticker: str, start: datetime, end: datetime, interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        """
+        Stored bars for [start, end] when a file younger than STOOQ_STORE_MAX_DAYS
+        holds the first and last session of the range (or the range's bounds for
+        tickers without a calendar); None otherwise.
+        """
+        if self.store is None or interval not in self.intervals:
+            return None
+        raw = ticker.strip().upper()
+        key = next(
+            (k for k in dict.fromkeys((canonical(raw), raw)) if self.store.has(self.name, k)),
+            None,
+        )
+        if key is None:
+            return None
+        if STOOQ_STORE_MAX_DAYS > 0:
+            mtime = self.store.path(self.name, key).stat().st_mtime
+            if time.time() - mtime > STOOQ_STORE_MAX_DAYS * 86400:
+                return None
+        df = self.store.read(self.name, key)
+        if df.empty:
+            return None
+        cal = calendar_for(raw)
+        first = cal.next_session(start.date()) if cal else start.date()
+        last = cal.previous_session(end.date()) if cal else end.date()
+        if df.index[0].date() > first or df.index[-1].date() < last:
+            return None
+        df = df[(df.index >= pd.Timestamp(start.date()))
+                & (df.index < pd.Timestamp(end.date() + timedelta(days=1)))]
+        if df.empty:
+            raise NoDataError(f"No stored Stooq data for {raw} in this range.")
+        _log.debug("Serving %s from the local Stooq store", raw)
+        return df
+
     def fetch(
         self,
         ticker: str,
         start: datetime,
         end: datetime,
+        interval: str = "1d",
+        timeout: Optional[float] = None,
         **kwargs: Any,
     ) -> pd.DataFrame:
         """
-        Download historical data for ticker from Stooq. Raises DataSourceError
-        on failure or empty result. Stooq may require suffixes (e.g. .US for US stocks).
+        Download historical data for ticker from Stooq. Raises NoDataError on an empty
+        result, DataSourceError on upstream failure. Yahoo-style tickers are sent in
+        Stooq's spelling (AAPL -> AAPL.US, VOD.L -> VOD.UK) via the symbol directory.
         """
         if not ticker or not ticker.strip():
             raise DataSourceError("Ticker cannot be empty.")
         ticker = ticker.strip().upper()
+        if interval not in self.intervals:
+            raise DataSourceError(f"Stooq only serves daily bars, not {interval!r}.")
         try:
             StooqDailyReader = _get_stooq_reader()
-            reader = StooqDailyReader(symbols=ticker, start=start, end=end)
+            reader = StooqDailyReader(symbols=stooq_symbol(ticker), start=start, end=end)
+            # _DailyBaseReader does not take timeout; _BaseReader reads the attribute
+            reader.timeout = UPSTREAM_TIMEOUT_SECONDS if timeout is None else timeout
             df = reader.read()
         except Exception as e:
-            _log.exception("Stooq failed for %s", ticker)
+            _log.warning("Stooq failed for %s: %s", ticker, e)
+            _log.debug("Stooq failure detail", exc_info=True)
             raise DataSourceError(f"Stooq fetch failed for {ticker}: {e}") from e
         if df is None or df.empty:
-            raise DataSourceError(f"No data returned from Stooq for {ticker}.")
+            raise NoDataError(f"No data returned from Stooq for {ticker}.")
         return self._normalize(df)
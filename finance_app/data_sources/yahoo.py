@@ -1,21 +1,128 @@
 """Yahoo Finance data via yfinance. No API key required."""
 
-from datetime import datetime
-from typing import Any
+from datetime import datetime, time, timedelta
+from typing import Any, Optional
 
 import pandas as pd
+import requests
 import yfinance as yf
 
-from ..utils.exceptions import DataSourceError
+from ..config import INTRADAY_FETCH_WORKERS, UPSTREAM_TIMEOUT_SECONDS, YAHOO_BASE_URL
+from ..models.calendar import calendar_for
+from ..utils.exceptions import DataSourceError, NoDataError
 from ..utils.logger import get_logger
-from .base import BaseDataSource, OHLCV_COLUMNS
+from .base import BaseDataSource, OHLCV_COLUMNS, split_windows
 
 _log = get_logger(__name__)
 
+# Have yfinance raise instead of logging and returning an empty frame (yfinance >= 1.0),
+# so transport failures reach the circuit breaker as DataSourceError
+_YF_DEBUG = getattr(getattr(yf, "config", None), "debug", None)
+if _YF_DEBUG is not None and hasattr(_YF_DEBUG, "hide_exceptions"):
+    _YF_DEBUG.hide_exceptions = False
+
+# yfinance errors meaning Yahoo answered without prices (unknown/delisted ticker, no
+# bars in range); treated as an empty result
+_YF_NO_DATA_ERRORS: tuple[type[Exception], ...] = tuple(
+    getattr(yf.exceptions, name)
+    for name in ("YFPricesMissingError", "YFTzMissingError", "YFTickerMissingError")
+    if hasattr(getattr(yf, "exceptions", None), name)
+)
+
+# Extra days of bars fetched before an actions range, to find the close before an ex-date
+ACTION_PRICE_LOOKBACK_DAYS: int = 10
+
+# Intraday limits Yahoo enforces: (max days per request, max days back from today)
+INTRADAY_LIMITS: dict[str, tuple[int, int]] = {
+    "1m": (7, 29),
+    "5m": (59, 59),
+    "15m": (59, 59),
+    "30m": (59, 59),
+    "1h": (729, 729),
+}
+
+
+def _bound(ticker: str, dt: datetime) -> datetime:
+    """
+    A fetch bound as ExchangeCalendar.localize reads it: naive midnights are dates on
+    the ticker's exchange, other naive datetimes (e.g. datetime.now()) local time.
+    yfinance takes naive datetimes as exchange time and _fetch_chart as local time,
+    so both get aware datetimes; naive midnights without a calendar stay as they are.
+    """
+    if dt.tzinfo is not None:
+        return dt
+    cal = calendar_for(ticker)
+    if cal is not None:
+        return cal.localize(dt)
+    return dt if dt.time() == time.min else dt.astimezone()
+
+
+def _fetch_chart(
+    base_url: str,
+    ticker: str,
+    start: datetime,
+    end: datetime,
+    interval: str = "1d",
+    timeout: float = UPSTREAM_TIMEOUT_SECONDS,
+) -> pd.DataFrame:
+    """
+    Read bars straight from a Yahoo-compatible v8 chart endpoint. Used when
+    YAHOO_BASE_URL points at a stand-in server, since yfinance's hosts are fixed.
+    """
+    resp = requests.get(
+        f"{base_url.rstrip('/')}/v8/finance/chart/{ticker}",
+        params={
+            "period1": int(start.timestamp()),
+            "period2": int(end.timestamp()),
+            "interval": interval,
+            "events": "div,splits",
+            "includeAdjustedClose": "true",
+        },
+        timeout=timeout,
+    )
+    if resp.status_code == 404:
+        return pd.DataFrame()
+    resp.raise_for_status()
+    result = (resp.json().get("chart") or {}).get("result") or []
+    if not result or not result[0].get("timestamp"):
+        return pd.DataFrame()
+    data = result[0]
+    quote = data["indicators"]["quote"][0]
+    df = pd.DataFrame(
+        {k: quote.get(k) for k in OHLCV_COLUMNS},
+        index=pd.to_datetime(data["timestamp"], unit="s"),
+    )
+    adj = data["indicators"].get("adjclose")
+    if adj:
+        df["adj close"] = adj[0].get("adjclose")
+    # Events are keyed by timestamp; line them up with the bar of the same day, as yfinance does
+    events = data.get("events") or {}
+    days = df.index.normalize()
+    df["dividends"] = 0.0
+    df["stock splits"] = 0.0
+    for ev in (events.get("dividends") or {}).values():
+        df.loc[days == pd.Timestamp(ev["date"], unit="s").normalize(), "dividends"] = ev["amount"]
+    for ev in (events.get("splits") or {}).values():
+        ratio = ev["numerator"] / ev["denominator"]
+        df.loc[days == pd.Timestamp(ev["date"], unit="s").normalize(), "stock splits"] = ratio
+    return df
+
+
+def _history(ticker: str, **kwargs: Any) -> pd.DataFrame:
+    """yf.Ticker(ticker).history(**kwargs), empty when Yahoo reports no prices."""
+    try:
+        return yf.Ticker(ticker).history(**kwargs)
+    except _YF_NO_DATA_ERRORS:
+        return pd.DataFrame()
+
 
 class YahooSource(BaseDataSource):
     """Fetches OHLCV from Yahoo Finance using yfinance."""
 
+    intervals = ("1m", "5m", "15m", "30m", "1h", "1d")
+    # Yahoo's unadjusted prices (auto_adjust=False) are still split-adjusted
+    price_adjustments = ("split",)
+
     @property
     def name(self) -> str:
         return "yahoo"
@@ -25,21 +132,87 @@ class YahooSource(BaseDataSource):
         ticker: str,
         start: datetime,
         end: datetime,
+        interval: str = "1d",
+        timeout: Optional[float] = None,
         **kwargs: Any,
     ) -> pd.DataFrame:
         """
-        Download historical data for ticker from Yahoo. Raises DataSourceError
-        on invalid ticker or empty result.
+        Download historical data for ticker from Yahoo. Raises NoDataError
+        on invalid ticker or empty result, DataSourceError on upstream failure.
+        Intraday ranges are split into Yahoo's per-request windows and fetched
+        concurrently (INTRADAY_FETCH_WORKERS at a time).
         """
         if not ticker or not ticker.strip():
             raise DataSourceError("Ticker cannot be empty.")
         ticker = ticker.strip().upper()
+        if interval not in self.intervals:
+            raise DataSourceError(f"Yahoo does not serve {interval!r} bars.")
+        timeout = UPSTREAM_TIMEOUT_SECONDS if timeout is None else timeout
+        start, end = _bound(ticker, start), _bound(ticker, end)
+
+        def fetch_one(window_start: datetime, window_end: datetime) -> pd.DataFrame:
+            if YAHOO_BASE_URL:
+                return _fetch_chart(
+                    YAHOO_BASE_URL, ticker, window_start, window_end, interval, timeout
+                )
+            return _history(
+                ticker,
+                start=window_start,
+                end=window_end,
+                interval=interval,
+                auto_adjust=False,
+                timeout=timeout,
+            )
+
+        if interval in INTRADAY_LIMITS:
+            windows = split_windows(start, end, INTRADAY_LIMITS[interval][0])
+        else:
+            windows = [(start, end)]
         try:
-            obj = yf.Ticker(ticker)
-            df = obj.history(start=start, end=end, auto_adjust=False)
+            df = self._fetch_windows(fetch_one, windows, INTRADAY_FETCH_WORKERS)
         except Exception as e:
-            _log.exception("yfinance failed for %s", ticker)
+            _log.warning("yfinance failed for %s: %s", ticker, e)
+            _log.debug("yfinance failure detail", exc_info=True)
             raise DataSourceError(f"Yahoo fetch failed for {ticker}: {e}") from e
         if df is None or df.empty:
-            raise DataSourceError(f"No data returned from Yahoo for {ticker}.")
-        return self._normalize(df)
+            raise NoDataError(f"No data returned from Yahoo for {ticker}.")
+        return df
+
+    def max_lookback_days(self, interval: str) -> Optional[int]:
+        limits = INTRADAY_LIMITS.get(interval)
+        return limits[1] if limits else None
+
+    def fetch_actions(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timeout: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Dividends and splits with ex-dates in [start, end], from daily bars over that
+        range only (plus a few days for the close before the first ex-date).
+        """
+        ticker = ticker.strip().upper()
+        bars_start = _bound(ticker, start - timedelta(days=ACTION_PRICE_LOOKBACK_DAYS))
+        bars_end = _bound(ticker, end + timedelta(days=1))
+        timeout = UPSTREAM_TIMEOUT_SECONDS if timeout is None else timeout
+        try:
+            if YAHOO_BASE_URL:
+                df = _fetch_chart(YAHOO_BASE_URL, ticker, bars_start, bars_end, timeout=timeout)
+            else:
+                df = _history(
+                    ticker,
+                    start=bars_start,
+                    end=bars_end,
+                    auto_adjust=False,
+                    actions=True,
+                    timeout=timeout,
+                )
+        except Exception as e:
+            _log.warning("yfinance actions failed for %s: %s", ticker, e)
+            _log.debug("yfinance failure detail", exc_info=True)
+            raise DataSourceError(f"Yahoo actions fetch failed for {ticker}: {e}") from e
+        if df is not None and not df.empty:
+            df = df.rename(columns=str.lower)
+        return self._actions_from_bars(df, start, "dividends", "stock splits")
@@ -0,0 +1 @@
+"""Development tools: local upstream stand-in, API load generator and kernel benchmark."""
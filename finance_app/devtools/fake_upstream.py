@@ -0,0 +1,382 @@
+"""
+Local stand-in for the Yahoo chart API and Stooq CSV download, serving synthetic OHLCV.
+
+Run:
+  python -m finance_app.devtools.fake_upstream --port 8900 --latency-ms 80 --error-rate 0.02
+
+Then start the API pointed at it:
+  NOKEYFINANCE_YAHOO_URL=http://127.0.0.1:8900 NOKEYFINANCE_STOOQ_URL=http://127.0.0.1:8900 \\
+    uvicorn api.main:app
+
+GET /__stats returns upstream call counters; POST /__reset clears them.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+import pandas as pd
+
+# Synthetic history spans these dates for every symbol
+HISTORY_START = "1995-01-02"
+HISTORY_END = "2035-12-31"
+
+
+@dataclass
+class FakeUpstreamConfig:
+    """
+    Behaviour of the stand-in. latency_ms/jitter_ms delay every response; error_rate
+    is the share of requests answered with 503; rate_limit caps requests per second
+    across all clients (excess gets 429 + Retry-After, 0 = unlimited). Symbols in
+    missing (or starting with "ZZ") have no data.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0
+    missing: frozenset = frozenset()
+    seed: int = 0
+
+
+@dataclass
+class _Stats:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    counts: dict = field(default_factory=dict)
+
+    def incr(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts.clear()
+
+
+class _TokenBucket:
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+@lru_cache(maxsize=4096)
+def synthetic_history(symbol: str) -> pd.DataFrame:
+    """Deterministic daily OHLCV random walk for a symbol (same bars for any range)."""
+    rng = np.random.default_rng(zlib.crc32(symbol.upper().encode()))
+    idx = pd.bdate_range(HISTORY_START, HISTORY_END, name="date")
+    n = len(idx)
+    close = 20 + rng.uniform(0, 180) * np.exp(np.cumsum(rng.normal(0.0002, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(100_000, 50_000_000, n),
+        },
+        index=idx,
+    )
+
+
+@lru_cache(maxsize=4096)
+def synthetic_actions(symbol: str) -> pd.DataFrame:
+    """
+    Quarterly dividends (~0.5% of the prior close) and one 2:1 split per symbol. Like
+    Yahoo's, the synthetic prices are already split-adjusted, so the split leaves no gap.
+    """
+    hist = synthetic_history(symbol)
+    idx = hist.index
+    first_of_month = ~idx.to_period("M").duplicated()
+    ex_dates = first_of_month & np.isin(idx.month, (2, 5, 8, 11))
+    dividend = (hist["close"].shift(1) * 0.005).round(4).where(ex_dates, 0.0).fillna(0.0)
+    split = pd.Series(1.0, index=idx)
+    rng = np.random.default_rng(zlib.crc32(f"{symbol.upper()}:split".encode()))
+    split.iloc[int(rng.integers(len(idx) // 4, len(idx) // 2))] = 2.0
+    actions = pd.DataFrame({"dividend": dividend, "split": split})
+    return actions[(actions["dividend"] > 0) | (actions["split"] != 1.0)]
+
+
+def _chart_events(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> dict:
+    actions = synthetic_actions(symbol)
+    actions = actions[(actions.index >= start) & (actions.index < end)]
+    dividends, splits = {}, {}
+    for day, row in actions.iterrows():
+        ts = int(day.replace(tzinfo=timezone.utc).timestamp())
+        if row["dividend"] > 0:
+            dividends[str(ts)] = {"amount": float(row["dividend"]), "date": ts}
+        if row["split"] != 1.0:
+            splits[str(ts)] = {
+                "date": ts,
+                "numerator": float(row["split"]),
+                "denominator": 1.0,
+                "splitRatio": f"{row['split']:g}:1",
+            }
+    return {"dividends": dividends, "splits": splits}
+
+
+def _bars(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    df = synthetic_history(symbol)
+    return df[(df.index >= start) & (df.index <= end)]
+
+
+# Intraday bar size (minutes) and Yahoo's max days per request for each interval
+INTRADAY = {
+    "1m": (1, 8), "5m": (5, 60), "15m": (15, 60), "30m": (30, 60), "1h": (60, 730), "60m": (60, 730),
+}
+# Bars are stamped like Yahoo's for a New York listing: daily at midnight and
+# intraday from the 09:30 open, exchange time (so 04:00/13:30 UTC in summer)
+EXCHANGE_TZ = "America/New_York"
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_MINUTES = 390
+
+
+def _utc_stamps(local: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Naive exchange-time stamps as naive UTC."""
+    return local.tz_localize(EXCHANGE_TZ).tz_convert("UTC").tz_localize(None)
+
+
+def yahoo_daily(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Daily bars stamped at exchange midnight (naive UTC) in [start, end)."""
+    df = synthetic_history(symbol)
+    df = df.set_axis(_utc_stamps(df.index))
+    return df[(df.index >= start) & (df.index < end)]
+
+
+def synthetic_intraday(
+    symbol: str, start: pd.Timestamp, end: pd.Timestamp, minutes: int
+) -> pd.DataFrame:
+    """Intraday bars in [start, end) walking from each day's open to its close."""
+    daily = _bars(symbol, start.normalize() - pd.Timedelta(days=1), end)
+    per_day = -(-SESSION_MINUTES // minutes)
+    offsets = SESSION_OPEN + pd.to_timedelta(np.arange(per_day) * minutes, unit="m")
+    frames = []
+    for day, row in daily.iterrows():
+        rng = np.random.default_rng(zlib.crc32(f"{symbol}:{minutes}:{day.date()}".encode()))
+        t = np.linspace(0.0, 1.0, per_day)
+        noise = np.cumsum(rng.normal(0, 0.001, per_day)) * row["close"]
+        path = row["open"] + (row["close"] - row["open"]) * t + noise - noise[-1] * t
+        frames.append(pd.DataFrame({
+            "open": np.r_[row["open"], path[:-1]],
+            "high": np.maximum(np.r_[row["open"], path[:-1]], path) * 1.0005,
+            "low": np.minimum(np.r_[row["open"], path[:-1]], path) * 0.9995,
+            "close": path,
+            "volume": np.full(per_day, int(row["volume"]) // per_day),
+        }, index=_utc_stamps(day + offsets)))
+    if not frames:
+        return daily.iloc[0:0]
+    df = pd.concat(frames)
+    return df[(df.index >= start) & (df.index < end)]
+
+
+class FakeUpstream:
+    """Threaded HTTP server emulating the upstream endpoints the adapters call."""
+
+    def __init__(
+        self,
+        config: Optional[FakeUpstreamConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or FakeUpstreamConfig()
+        self.stats = _Stats()
+        self._bucket = _TokenBucket(self.config.rate_limit)
+        self._random = random.Random(self.config.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeUpstream":
+        """Serve in a background thread; returns self."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeUpstream":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _is_missing(self, symbol: str) -> bool:
+        s = symbol.upper()
+        return s in self.config.missing or s.startswith("ZZ")
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - silence per-request logs
+                pass
+
+            def do_POST(self):
+                if urlparse(self.path).path == "/__reset":
+                    upstream.stats.reset()
+                    return self._send(200, "application/json", b"{}")
+                self._send(404, "text/plain", b"not found")
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                if parsed.path == "/__stats":
+                    body = json.dumps(upstream.stats.snapshot()).encode()
+                    return self._send(200, "application/json", body)
+                if parsed.path.startswith("/v8/finance/chart/"):
+                    kind = "yahoo"
+                elif parsed.path.rstrip("/") == "/q/d/l":
+                    kind = "stooq"
+                else:
+                    return self._send(404, "text/plain", b"not found")
+
+                upstream.stats.incr(kind)
+                cfg = upstream.config
+                if not upstream._bucket.take():
+                    upstream.stats.incr("throttled")
+                    return self._send(429, "text/plain", b"Too Many Requests", {"Retry-After": "1"})
+                delay = cfg.latency_ms + upstream._random.uniform(0, cfg.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000.0)
+                if cfg.error_rate and upstream._random.random() < cfg.error_rate:
+                    upstream.stats.incr("errors")
+                    return self._send(503, "text/plain", b"Service Unavailable")
+                if kind == "yahoo":
+                    symbol = unquote(parsed.path.rsplit("/", 1)[-1])
+                    return self._yahoo(symbol, query)
+                return self._stooq(query)
+
+            def _yahoo(self, symbol: str, query: dict):
+                if upstream._is_missing(symbol):
+                    body = {"chart": {"result": None, "error": {
+                        "code": "Not Found",
+                        "description": "No data found, symbol may be delisted",
+                    }}}
+                    return self._send(404, "application/json", json.dumps(body).encode())
+                start = pd.Timestamp(int(query.get("period1", 0)), unit="s")
+                end = pd.Timestamp(int(query.get("period2", time.time())), unit="s")
+                interval = query.get("interval", "1d")
+                if interval in INTRADAY:
+                    minutes, max_days = INTRADAY[interval]
+                    if end - start > pd.Timedelta(days=max_days):
+                        body = {"chart": {"result": None, "error": {
+                            "code": "Unprocessable Entity",
+                            "description": f"{interval} data not available for a range over {max_days} days",
+                        }}}
+                        return self._send(422, "application/json", json.dumps(body).encode())
+                    df = synthetic_intraday(symbol, start, end, minutes)
+                else:
+                    # Yahoo's period2 is exclusive
+                    df = yahoo_daily(symbol, start, end)
+                stamps = [
+                    int(d.replace(tzinfo=timezone.utc).timestamp()) for d in df.index
+                ]
+                quote = {c: df[c].round(4).tolist() for c in ("open", "high", "low", "close")}
+                quote["volume"] = df["volume"].astype(int).tolist()
+                body = {"chart": {"result": [{
+                    "meta": {"symbol": symbol, "currency": "USD", "dataGranularity": interval},
+                    "timestamp": stamps,
+                    "events": _chart_events(symbol, start, end),
+                    "indicators": {
+                        "quote": [quote],
+                        "adjclose": [{"adjclose": quote["close"]}],
+                    },
+                }], "error": None}}
+                self._send(200, "application/json", json.dumps(body).encode())
+
+            def _stooq(self, query: dict):
+                symbol = query.get("s", "")
+                base = symbol.split(".")[0]
+                if not base or upstream._is_missing(base):
+                    return self._send(200, "text/csv", b"No data")
+                start = pd.Timestamp(query.get("d1", "19950101"))
+                end = pd.Timestamp(query.get("d2", "20351231"))
+                df = _bars(base, start, end).round(4)
+                df.index = df.index.strftime("%Y-%m-%d")
+                df.index.name = "Date"
+                df.columns = [c.capitalize() for c in df.columns]
+                # Stooq serves newest-first
+                body = df.iloc[::-1].to_csv().encode()
+                self._send(200, "text/csv", body)
+
+            def _send(self, status: int, ctype: str, body: bytes, headers: Optional[dict] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fake Yahoo/Stooq upstream for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/second, 0 = off")
+    parser.add_argument("--missing", default="", help="comma-separated symbols with no data")
+    args = parser.parse_args(argv)
+    config = FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        missing=frozenset(s.strip().upper() for s in args.missing.split(",") if s.strip()),
+    )
+    server = FakeUpstream(config, host=args.host, port=args.port)
+    print(f"Fake upstream listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Parity check and benchmark for the indicator kernel backends.
+
+  python -m finance_app.devtools.kernel_bench --check
+  python -m finance_app.devtools.kernel_bench --sizes 10000,100000,1000000
+
+--check compares every kernel bit for bit with the pandas/NumPy indicators on seeded
+random walks (with gaps and flat runs): the plain-Python kernels always, the numba
+ones when numba is installed. Exits 1 on any mismatch. The benchmark times sma, ema,
+rsi, volatility and add_indicators per backend.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from finance_app.models import indicators, kernels
+
+PERIODS = (1, 2, 14, 20, 50, 200)
+
+# kernel name -> (indicator on the numpy backend, kernel input built from close and period)
+_CASES: dict[str, tuple[Callable, Callable]] = {
+    "rolling_mean": (
+        lambda close, p: indicators.sma(close, p),
+        lambda close, p: (close.to_numpy(dtype="float64"), p),
+    ),
+    "ewm_mean": (
+        lambda close, p: indicators.ema(close, p),
+        lambda close, p: (close.to_numpy(dtype="float64"), (p - 1) / 2),
+    ),
+    "wilder_rsi": (
+        lambda close, p: indicators.rsi(close, p),
+        lambda close, p: (close.to_numpy(dtype="float64"), p),
+    ),
+    "rolling_std": (
+        lambda close, p: indicators.volatility(close, window=p, annualize=False),
+        lambda close, p: (close.pct_change().to_numpy(dtype="float64"), p),
+    ),
+}
+
+
+def random_close(n: int, seed: int = 0, gaps: float = 0.01) -> pd.Series:
+    """Geometric random walk of n bars with a share of NaN gaps and a flat run."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    close[rng.random(n) < gaps] = np.nan
+    if n > 60:
+        close[40:60] = close[39]
+    index = pd.date_range("2000-01-03", periods=n, freq="min", name="date")
+    return pd.Series(close, index=index, name="close")
+
+
+def _ohlcv(close: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": np.full(len(close), 1e6),
+    })
+
+
+def check_parity(trials: int = 10, max_bars: int = 3000, seed: int = 0) -> list[str]:
+    """Mismatches between each available kernel set and the numpy backend (empty = parity)."""
+    previous = kernels.backend()
+    candidates: dict[str, dict[str, Callable]] = {"python": kernels.PYTHON_KERNELS}
+    if kernels.numba_available():
+        kernels.set_backend("numba")
+        candidates["numba"] = {name: kernels.compiled(name) for name in kernels.PYTHON_KERNELS}
+    kernels.set_backend("numpy")
+    rng = np.random.default_rng(seed)
+    failures = []
+    try:
+        for trial in range(trials):
+            close = random_close(int(rng.integers(1, max_bars)), seed=seed + trial)
+            for period in PERIODS:
+                for name, (reference, inputs) in _CASES.items():
+                    expected = reference(close, period).to_numpy()
+                    for backend, fns in candidates.items():
+                        got = fns[name](*inputs(close, period))
+                        if not np.array_equal(expected, got, equal_nan=True):
+                            diff = np.nanmax(np.abs(expected - got), initial=0.0)
+                            failures.append(
+                                f"{backend} {name} bars={len(close)} period={period} "
+                                f"max abs diff={diff:.3g}"
+                            )
+        if "numba" in candidates:
+            frame = _ohlcv(random_close(5000, seed=seed))
+            expected = indicators.add_indicators(frame)
+            kernels.set_backend("numba")
+            got = indicators.add_indicators(frame)
+            if not expected.equals(got):
+                failures.append("numba add_indicators frame differs")
+    finally:
+        kernels.set_backend(previous)
+    return failures
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def benchmark(sizes: list[int], repeat: int = 5) -> list[dict]:
+    """Best-of-repeat milliseconds per indicator, size and available backend."""
+    previous = kernels.backend()
+    backends = ["numpy"] + (["numba"] if kernels.numba_available() else [])
+    jobs: dict[str, Callable[[pd.Series], object]] = {
+        "sma_50": lambda c: indicators.sma(c, 50),
+        "ema_26": lambda c: indicators.ema(c, 26),
+        "rsi_14": lambda c: indicators.rsi(c, 14),
+        "volatility_20": lambda c: indicators.volatility(c, 20),
+    }
+    rows = []
+    try:
+        for n in sizes:
+            close = random_close(n)
+            frame = _ohlcv(close)
+            for backend in backends:
+                kernels.set_backend(backend)
+                # the first call compiles the numba kernels
+                indicators.add_indicators(frame.iloc[:100])
+                for name, job in jobs.items():
+                    rows.append({"bars": n, "indicator": name, "backend": backend,
+                                 "ms": _best_of(lambda: job(close), repeat)})
+                rows.append({"bars": n, "indicator": "add_indicators", "backend": backend,
+                             "ms": _best_of(lambda: indicators.add_indicators(frame), repeat)})
+    finally:
+        kernels.set_backend(previous)
+    return rows
+
+
+def format_benchmark(rows: list[dict]) -> str:
+    times = {(r["bars"], r["indicator"], r["backend"]): r["ms"] for r in rows}
+    lines = [f"{'bars':>9}  {'indicator':<15} {'numpy ms':>10} {'numba ms':>10} {'speedup':>8}"]
+    seen = []
+    for r in rows:
+        key = (r["bars"], r["indicator"])
+        if key in seen:
+            continue
+        seen.append(key)
+        base = times[key + ("numpy",)]
+        fast: Optional[float] = times.get(key + ("numba",))
+        lines.append(
+            f"{key[0]:>9}  {key[1]:<15} {base:>10.2f} "
+            + (f"{fast:>10.2f} {base / fast:>7.1f}x" if fast else f"{'-':>10} {'-':>8}")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check and benchmark indicator kernels.")
+    parser.add_argument("--check", action="store_true", help="only run the parity check")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated bar counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--trials", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"numba installed: {kernels.numba_available()}")
+    failures = check_parity(trials=args.trials)
+    for line in failures:
+        print("MISMATCH", line)
+    print("parity: " + ("ok" if not failures else f"{len(failures)} mismatch(es)"))
+    if failures:
+        sys.exit(1)
+    if args.check:
+        return
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(format_benchmark(benchmark(sizes, repeat=args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Concurrent load generator for /api/ohlcv.
+
+Run against an API that points at the fake upstream:
+  python -m finance_app.devtools.loadtest --api http://127.0.0.1:8000 \\
+    --upstream http://127.0.0.1:8900 --concurrency 16 --requests 500
+
+Reports throughput, latency percentiles, status counts and upstream calls per source.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+import numpy as np
+import requests
+
+DEFAULT_TICKERS = ("AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "JPM", "XOM", "KO")
+# Mix of request range lengths (days) to exercise cheap and expensive paths
+DEFAULT_RANGES = (30, 365, 365 * 5, 365 * 20)
+
+
+@dataclass
+class LoadReport:
+    """Summary of one load run. Latencies are in milliseconds."""
+
+    requests: int
+    duration: float
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    upstream_calls: dict = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else float("nan")
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "statuses": self.statuses,
+            "upstream_calls": self.upstream_calls,
+        }
+
+    def format(self) -> str:
+        d = self.to_dict()
+        lines = [
+            f"requests      {d['requests']} in {d['duration_s']}s",
+            f"throughput    {d['throughput_rps']} req/s",
+            f"latency (ms)  p50={d['p50_ms']}  p95={d['p95_ms']}  p99={d['p99_ms']}",
+            "statuses      " + "  ".join(f"{k}={v}" for k, v in sorted(d["statuses"].items())),
+        ]
+        if self.upstream_calls:
+            lines.append(
+                "upstream      " + "  ".join(f"{k}={v}" for k, v in sorted(self.upstream_calls.items()))
+            )
+        return "\n".join(lines)
+
+
+def upstream_stats(upstream_url: str) -> dict:
+    """Counter snapshot from a running fake upstream."""
+    resp = requests.get(f"{upstream_url.rstrip('/')}/__stats", timeout=5)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def run_load(
+    api_url: str,
+    total: int = 200,
+    concurrency: int = 8,
+    tickers: Sequence[str] = DEFAULT_TICKERS,
+    sources: Sequence[str] = ("yahoo", "stooq"),
+    ranges: Sequence[int] = DEFAULT_RANGES,
+    upstream_url: Optional[str] = None,
+    seed: int = 0,
+    timeout: float = 60.0,
+) -> LoadReport:
+    """
+    Fire total requests at /api/ohlcv from concurrency threads, drawing ticker, source
+    and range length at random (seeded) so runs are repeatable.
+    """
+    rng = random.Random(seed)
+    end = date.today()
+    plans = []
+    for _ in range(total):
+        days = rng.choice(list(ranges))
+        plans.append({
+            "ticker": rng.choice(list(tickers)),
+            "source": rng.choice(list(sources)),
+            "start": (end - timedelta(days=days)).isoformat(),
+            "end": end.isoformat(),
+        })
+
+    before = upstream_stats(upstream_url) if upstream_url else {}
+    local = threading.local()
+    lock = threading.Lock()
+    report = LoadReport(requests=total, duration=0.0)
+    url = f"{api_url.rstrip('/')}/api/ohlcv"
+
+    def one(params: dict) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        t0 = time.perf_counter()
+        try:
+            status = str(session.get(url, params=params, timeout=timeout).status_code)
+        except requests.RequestException as e:
+            status = type(e).__name__
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            report.latencies.append(elapsed)
+            report.statuses[status] = report.statuses.get(status, 0) + 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, plans))
+    report.duration = time.perf_counter() - t0
+
+    if upstream_url:
+        after = upstream_stats(upstream_url)
+        report.upstream_calls = {
+            k: after.get(k, 0) - before.get(k, 0) for k in set(after) | set(before)
+        }
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test /api/ohlcv.")
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--upstream", default=None, help="fake upstream URL for call counts")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--tickers", default=",".join(DEFAULT_TICKERS))
+    parser.add_argument("--sources", default="yahoo,stooq")
+    parser.add_argument("--ranges", default=",".join(str(d) for d in DEFAULT_RANGES),
+                        help="comma-separated range lengths in days")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run_load(
+        args.api,
+        total=args.requests,
+        concurrency=args.concurrency,
+        tickers=[t.strip() for t in args.tickers.split(",") if t.strip()],
+        sources=[s.strip() for s in args.sources.split(",") if s.strip()],
+        ranges=[int(d) for d in args.ranges.split(",") if d.strip()],
+        upstream_url=args.upstream,
+        seed=args.seed,
+    )
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Load Stooq bulk archives (zipped per-symbol daily text files) into the local store.
+
+  python -m finance_app.ingest_stooq d_us_txt.zip
+  python -m finance_app.ingest_stooq d_us_txt.zip d_uk_txt.zip --match "*nasdaq*" --workers 8
+
+Members are read straight from the zip (nothing is extracted) and parsed in --workers
+processes, --chunk files per task: each file goes through pandas' C CSV parser and the
+same normalization as fetched bars, and replaces <out>/stooq/1d/<TICKER>.parquet
+(--out, default NOKEYFINANCE_STORE_DIR or .cache/store). Tickers are stored in Yahoo
+form (aapl.us.txt -> AAPL, vod.uk.txt -> VOD.L). Each file keeps the member's
+timestamp as its mtime, so StooqSource serves it only while the archive is recent
+(STOOQ_STORE_MAX_DAYS). No network calls are made.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence, TextIO
+
+from .backfill import BackfillReport, TickerResult, _quiet_logs
+from .config import INGEST_CHUNK_SIZE, INGEST_WORKERS, SOURCE_STOOQ, STORE_DIR
+from .data_sources.stooq import StooqSource, read_stooq_file
+from .models.symbols import canonical
+from .storage.parquet_store import ParquetStore
+
+
+def archive_members(archive: Path, pattern: Optional[str] = None) -> list[str]:
+    """Per-symbol .txt members of a Stooq archive, optionally filtered by a glob on the path."""
+    with zipfile.ZipFile(archive) as zf:
+        names = [
+            info.filename for info in zf.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".txt")
+        ]
+    if pattern:
+        names = [n for n in names if fnmatch.fnmatch(n.lower(), pattern.lower())]
+    return names
+
+
+def member_ticker(name: str) -> str:
+    """Store key of a member: "data/daily/us/nasdaq stocks/1/aapl.us.txt" -> "AAPL"."""
+    return canonical(Path(name).name[: -len(".txt")])
+
+
+def ingest_members(archive: str, names: Sequence[str], out: str) -> list[TickerResult]:
+    """
+    Parse, normalize and store the given members of one archive. Runs in a worker
+    process: the archive is opened here, and only small results go back.
+    """
+    source = StooqSource()
+    store = ParquetStore(Path(out))
+    results = []
+    with zipfile.ZipFile(archive) as zf:
+        for name in names:
+            ticker = member_ticker(name)
+            try:
+                info = zf.getinfo(name)
+                df = source._normalize(read_stooq_file(zf.read(info)))
+                if df.empty:
+                    results.append(TickerResult(ticker, "nodata"))
+                    continue
+                rows = store.write(SOURCE_STOOQ, ticker, df, merge=False)
+                stamp = datetime(*info.date_time).timestamp()
+                os.utime(store.path(SOURCE_STOOQ, ticker), (stamp, stamp))
+            except Exception as e:  # one bad file must not stop the chunk
+                results.append(TickerResult(ticker, "failed", error=f"{name}: {e}"))
+                continue
+            results.append(TickerResult(ticker, "ok", rows=rows))
+    return results
+
+
+def run_ingest(
+    archives: Sequence[Path],
+    out: Path = STORE_DIR,
+    pattern: Optional[str] = None,
+    workers: int = INGEST_WORKERS,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    progress: Optional[TextIO] = sys.stdout,
+    progress_every: float = 5.0,
+) -> BackfillReport:
+    """Ingest every matching member of the archives into a ParquetStore at out."""
+    tasks = []
+    for archive in archives:
+        names = archive_members(archive, pattern)
+        tasks += [
+            (str(archive), names[i: i + chunk_size], str(out))
+            for i in range(0, len(names), max(1, chunk_size))
+        ]
+    report = BackfillReport(total=sum(len(t[1]) for t in tasks))
+    t0 = time.perf_counter()
+    last_print = t0
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(ingest_members, *task) for task in tasks]
+        try:
+            for fut in as_completed(futures):
+                for res in fut.result():
+                    report.statuses[res.status] = report.statuses.get(res.status, 0) + 1
+                    report.rows += res.rows
+                    if res.status == "failed":
+                        report.failed.append(res.error)
+                report.duration = time.perf_counter() - t0
+                now = time.perf_counter()
+                if progress is not None and now - last_print >= progress_every:
+                    print(report.progress_line(), file=progress, flush=True)
+                    last_print = now
+        except KeyboardInterrupt:
+            report.interrupted = True
+            pool.shutdown(wait=True, cancel_futures=True)
+    report.duration = time.perf_counter() - t0
+    if progress is not None:
+        print(report.progress_line(), file=progress, flush=True)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load Stooq bulk archives into the local store.")
+    parser.add_argument("archives", nargs="+", type=Path, help="Stooq .zip archives")
+    parser.add_argument("--out", type=Path, default=STORE_DIR)
+    parser.add_argument("--match", default=None,
+                        help='glob on member paths, e.g. "*nasdaq stocks*"')
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    parser.add_argument("--chunk", type=int, default=INGEST_CHUNK_SIZE,
+                        help="archive members per worker task")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="seconds")
+    args = parser.parse_args(argv)
+
+    missing = [str(a) for a in args.archives if not a.is_file()]
+    if missing:
+        parser.error(f"no such archive: {', '.join(missing)}")
+    _quiet_logs()
+    try:
+        report = run_ingest(
+            args.archives,
+            out=args.out,
+            pattern=args.match,
+            workers=args.workers,
+            chunk_size=args.chunk,
+            progress_every=args.progress_every,
+        )
+    except zipfile.BadZipFile as e:
+        parser.error(str(e))
+    print(report.format())
+    if report.interrupted:
+        sys.exit(130)
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
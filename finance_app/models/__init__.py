@@ -1,21 +1,49 @@
 """Data and indicator models."""
 
+from .adjustments import adjust_ohlcv, adjustment_factors
+from .backtest import BacktestResult, param_grid, run_grid, run_grid_panel
+from .calendar import TradingCalendar, calendar_for
 from .indicators import (
     add_indicators,
+    bars_per_year,
     daily_returns,
+    drawdown,
     ema,
+    max_drawdown,
+    rolling_max,
+    rolling_min,
     rsi,
     sma,
     volatility,
 )
+from .resample import downsample_ohlcv
 from .stock import StockData
+from .symbols import Symbol, SymbolDirectory, search_symbols, symbol_directory
 
 __all__ = [
+    "BacktestResult",
     "StockData",
+    "Symbol",
+    "SymbolDirectory",
+    "TradingCalendar",
     "add_indicators",
+    "adjust_ohlcv",
+    "adjustment_factors",
+    "bars_per_year",
+    "calendar_for",
     "daily_returns",
+    "downsample_ohlcv",
+    "drawdown",
     "ema",
+    "max_drawdown",
+    "param_grid",
+    "rolling_max",
+    "rolling_min",
     "rsi",
+    "run_grid",
+    "run_grid_panel",
+    "search_symbols",
     "sma",
+    "symbol_directory",
     "volatility",
 ]
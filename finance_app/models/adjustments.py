@@ -0,0 +1,59 @@
+"""Split/dividend adjustment of OHLCV with cumulative factors computed from stored actions."""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def adjustment_factors(
+    index: pd.DatetimeIndex,
+    events: pd.DataFrame,
+    skip: Sequence[str] = (),
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (price_factor, volume_factor) per bar: the product of every event with an ex-date
+    after the bar, so the latest prices are unchanged. A split of r multiplies earlier
+    prices by 1/r and volume by r; a dividend multiplies earlier prices by its
+    dividend_factor. Names in skip ("split", "dividend") are left out because the
+    source already applied them.
+    """
+    n = len(index)
+    if events is None or events.empty or n == 0:
+        return np.ones(n), np.ones(n)
+    events = events.sort_index()
+    split = events["split"].to_numpy(dtype="float64")
+    split = np.where(split > 0, split, 1.0)
+    per_event_price = np.ones(len(events))
+    per_event_volume = np.ones(len(events))
+    if "split" not in skip:
+        per_event_price /= split
+        per_event_volume *= split
+    if "dividend" not in skip:
+        per_event_price *= events["dividend_factor"].to_numpy(dtype="float64")
+    # Suffix products: cum[i] = product of events i.. (cum[len] = 1)
+    price_cum = np.append(np.cumprod(per_event_price[::-1])[::-1], 1.0)
+    volume_cum = np.append(np.cumprod(per_event_volume[::-1])[::-1], 1.0)
+    # Bars on or after an ex-date are not adjusted by it
+    pos = np.searchsorted(events.index.values, index.values, side="right")
+    return price_cum[pos], volume_cum[pos]
+
+
+def adjust_ohlcv(
+    df: pd.DataFrame,
+    events: pd.DataFrame,
+    skip: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Return a copy of df with prices and volume adjusted for events (see adjustment_factors)."""
+    price, volume = adjustment_factors(df.index, events, skip)
+    out = df.copy()
+    if np.all(price == 1.0) and np.all(volume == 1.0):
+        return out
+    for col in PRICE_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].to_numpy(dtype="float64") * price
+    if "volume" in out.columns:
+        out["volume"] = np.rint(out["volume"].to_numpy(dtype="float64") * volume).astype("int64")
+    return out
@@ -0,0 +1,321 @@
+"""Vectorized parameter-grid backtests for SMA/EMA crossover and RSI threshold rules."""
+
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from finance_app.utils.exceptions import ValidationError
+from finance_app.utils.logger import get_logger
+
+from .indicators import MAX_INDICATOR_PERIOD, ema, rsi, sma
+
+_log = get_logger(__name__)
+
+# Parameter names each rule expects in its grid
+RULE_PARAMS: dict[str, tuple[str, ...]] = {
+    "sma_cross": ("fast", "slow"),
+    "ema_cross": ("fast", "slow"),
+    "rsi": ("period", "lower", "upper"),
+}
+
+TRADING_DAYS_PER_YEAR: int = 252
+
+# Upper bound on combinations x bars evaluated per broadcast block (~16 MB per float64 array)
+MAX_BLOCK_CELLS: int = 2_000_000
+
+# Grids smaller than this are never sharded across processes
+MIN_SHARD_SIZE: int = 500
+
+_LINE_FUNCS = {"sma_cross": sma, "ema_cross": ema, "rsi": rsi}
+
+
+@dataclass
+class BacktestResult:
+    """
+    Output of a grid sweep for one price series.
+
+    metrics has one row per parameter combination: the parameter columns plus
+    total_return, annual_return, max_drawdown, sharpe and trades.
+    equity is (n_combinations, n_bars) with growth of 1.0, or None if not kept;
+    equity_curve() recomputes single curves from values either way.
+    """
+
+    rule: str
+    index: pd.DatetimeIndex
+    metrics: pd.DataFrame
+    equity: Optional[np.ndarray] = None
+    values: Optional[np.ndarray] = None
+    cost_bps: float = 0.0
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+
+    def equity_curve(self, row: int) -> pd.Series:
+        """
+        Equity curve for one combination (row of metrics) as a Series, e.g.
+        result.equity_curve(result.best(n=1).index[0]).
+        """
+        if self.equity is not None:
+            curve = self.equity[row]
+        elif self.values is not None:
+            params = {
+                c: self.metrics[c].to_numpy()[row: row + 1] for c in RULE_PARAMS[self.rule]
+            }
+            _, kept = _evaluate(
+                self.values, self.rule, params, self.cost_bps, True, self.periods_per_year
+            )
+            curve = kept[0]
+        else:
+            raise ValueError("no equity curves or prices kept to recompute them from")
+        return pd.Series(curve, index=self.index, name="equity")
+
+    def best(self, by: str = "sharpe", n: int = 10) -> pd.DataFrame:
+        """Top n combinations ranked by a metric column (descending)."""
+        return self.metrics.sort_values(by, ascending=False, na_position="last").head(n)
+
+
+def param_grid(rule: str, **axes: Sequence[float]) -> pd.DataFrame:
+    """
+    Cartesian product of parameter axes for a rule, one combination per row.
+
+    Crossover rules drop combinations with fast >= slow; the RSI rule drops lower >= upper.
+    Example: param_grid("sma_cross", fast=range(5, 50), slow=range(20, 250, 5)).
+    """
+    names = _rule_params(rule)
+    missing = [n for n in names if n not in axes]
+    extra = [n for n in axes if n not in names]
+    if missing or extra:
+        raise ValidationError(
+            f"Rule {rule!r} takes parameters {names}; missing {missing}, unexpected {extra}."
+        )
+    rows = list(itertools.product(*(list(axes[n]) for n in names)))
+    grid = pd.DataFrame(rows, columns=list(names))
+    return _filter_grid(rule, grid)
+
+
+def run_grid(
+    close: pd.Series,
+    rule: str,
+    grid: Union[pd.DataFrame, Mapping[str, Sequence[float]]],
+    cost_bps: float = 0.0,
+    keep_equity: bool = False,
+    workers: int = 0,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> BacktestResult:
+    """
+    Evaluate every parameter combination of a rule on one close series.
+
+    Indicator lines are computed once per distinct period, then all combinations are
+    evaluated together with NumPy broadcasting (in blocks bounded by MAX_BLOCK_CELLS).
+    Positions are long/flat, entered at the close of the signal bar. cost_bps is
+    charged on each position change. With workers > 1, large grids are sharded across
+    a process pool. keep_equity=True also returns every combination's equity curve
+    (n_combinations x n_bars floats); otherwise BacktestResult.equity_curve recomputes
+    the ones asked for. Raises ValidationError for periods above MAX_INDICATOR_PERIOD.
+    """
+    if close is None or close.empty:
+        raise ValidationError("close series is empty")
+    if not isinstance(grid, pd.DataFrame):
+        grid = param_grid(rule, **grid)
+    else:
+        names = _rule_params(rule)
+        missing = [n for n in names if n not in grid.columns]
+        if missing:
+            raise ValidationError(f"Grid for rule {rule!r} is missing columns {missing}.")
+        grid = _filter_grid(rule, grid[list(names)])
+    if grid.empty:
+        raise ValidationError("Parameter grid has no valid combinations.")
+
+    values = close.astype(float).ffill().to_numpy()
+    index = pd.DatetimeIndex(close.index)
+    params = {c: grid[c].to_numpy() for c in grid.columns}
+    n = len(grid)
+
+    if workers and workers > 1 and n >= 2 * MIN_SHARD_SIZE:
+        shards = min(workers, n // MIN_SHARD_SIZE)
+        bounds = np.linspace(0, n, shards + 1, dtype=int)
+        _log.info("Sharding %d combinations of %s across %d processes", n, rule, shards)
+        with ProcessPoolExecutor(max_workers=shards) as pool:
+            futures = [
+                pool.submit(
+                    _evaluate,
+                    values,
+                    rule,
+                    {k: v[lo:hi] for k, v in params.items()},
+                    cost_bps,
+                    keep_equity,
+                    periods_per_year,
+                )
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            parts = [f.result() for f in futures]
+        stats = {k: np.concatenate([p[0][k] for p in parts]) for k in parts[0][0]}
+        equity = np.vstack([p[1] for p in parts]) if keep_equity else None
+    else:
+        stats, equity = _evaluate(values, rule, params, cost_bps, keep_equity, periods_per_year)
+
+    metrics = grid.reset_index(drop=True).copy()
+    for k, v in stats.items():
+        metrics[k] = v
+    return BacktestResult(
+        rule=rule,
+        index=index,
+        metrics=metrics,
+        equity=equity,
+        values=values,
+        cost_bps=cost_bps,
+        periods_per_year=periods_per_year,
+    )
+
+
+def run_grid_panel(
+    closes: Union[pd.DataFrame, Mapping[str, pd.Series]],
+    rule: str,
+    grid: Union[pd.DataFrame, Mapping[str, Sequence[float]]],
+    **kwargs,
+) -> dict[str, BacktestResult]:
+    """
+    Run the same grid on several series. closes is a DataFrame with one close column
+    per ticker, or a mapping of ticker -> close Series. Returns ticker -> BacktestResult.
+    """
+    if isinstance(closes, pd.DataFrame):
+        closes = {str(c): closes[c].dropna() for c in closes.columns}
+    if not isinstance(grid, pd.DataFrame):
+        grid = param_grid(rule, **grid)
+    return {t: run_grid(s, rule, grid, **kwargs) for t, s in closes.items()}
+
+
+def default_workers() -> int:
+    """Process count for sharding large grids (CPU count, at least 1)."""
+    return max(1, os.cpu_count() or 1)
+
+
+def _rule_params(rule: str) -> tuple[str, ...]:
+    if rule not in RULE_PARAMS:
+        raise ValidationError(f"Unknown rule: {rule!r}. Use one of {sorted(RULE_PARAMS)}.")
+    return RULE_PARAMS[rule]
+
+
+def _filter_grid(rule: str, grid: pd.DataFrame) -> pd.DataFrame:
+    # Indicators cap periods at MAX_INDICATOR_PERIOD, so longer ones would be results
+    # for parameters that never ran
+    if rule == "rsi":
+        grid = grid[grid["lower"] < grid["upper"]]
+        if (grid["period"] < 1).any() or (grid["period"] > MAX_INDICATOR_PERIOD).any():
+            raise ValidationError(f"RSI period must be between 1 and {MAX_INDICATOR_PERIOD}")
+    else:
+        grid = grid[grid["fast"] < grid["slow"]]
+        if (grid["fast"] < 1).any() or (grid["slow"] > MAX_INDICATOR_PERIOD).any():
+            raise ValidationError(
+                f"Moving-average periods must be between 1 and {MAX_INDICATOR_PERIOD}"
+            )
+    return grid.reset_index(drop=True)
+
+
+def _indicator_lines(
+    values: np.ndarray, rule: str, periods: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """One indicator line per distinct period: returns (sorted periods, (n_periods, n_bars))."""
+    unique = np.unique(periods.astype(int))
+    series = pd.Series(values)
+    func = _LINE_FUNCS[rule]
+    lines = np.empty((len(unique), len(values)), dtype=float)
+    for i, p in enumerate(unique):
+        lines[i] = func(series, int(p)).to_numpy()
+    return unique, lines
+
+
+def _positions(
+    rule: str,
+    periods: np.ndarray,
+    lines: np.ndarray,
+    params: dict[str, np.ndarray],
+    n_bars: int,
+) -> np.ndarray:
+    """Long/flat position (1.0 / 0.0) per combination and bar, shape (n, n_bars)."""
+    bars = np.arange(n_bars)
+    if rule == "rsi":
+        level = lines[np.searchsorted(periods, params["period"].astype(int))]
+        entries = level < params["lower"][:, None]
+        exits = level > params["upper"][:, None]
+        warmup = params["period"].astype(int)
+        # Carry the most recent entry/exit forward: position is 1 after an entry until an exit
+        events = entries | exits
+        last = np.where(events, bars, -1)
+        np.maximum.accumulate(last, axis=1, out=last)
+        rows = np.arange(len(level))[:, None]
+        pos = np.where(last >= 0, entries[rows, np.maximum(last, 0)], False)
+    else:
+        fast = lines[np.searchsorted(periods, params["fast"].astype(int))]
+        slow = lines[np.searchsorted(periods, params["slow"].astype(int))]
+        pos = fast > slow
+        warmup = params["slow"].astype(int) - 1
+    pos &= bars[None, :] >= warmup[:, None]
+    return pos.astype(float)
+
+
+def _evaluate(
+    values: np.ndarray,
+    rule: str,
+    params: dict[str, np.ndarray],
+    cost_bps: float,
+    keep_equity: bool,
+    periods_per_year: int,
+) -> tuple[dict[str, np.ndarray], Optional[np.ndarray]]:
+    """Evaluate a block of combinations; module-level so process pools can pickle it."""
+    n = len(next(iter(params.values())))
+    n_bars = len(values)
+    period_key = "period" if rule == "rsi" else None
+    needed = params[period_key] if period_key else np.concatenate([params["fast"], params["slow"]])
+    periods, lines = _indicator_lines(values, rule, needed)
+
+    returns = np.zeros(n_bars)
+    if n_bars > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = values[1:] / values[:-1] - 1.0
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+    cost = cost_bps / 10_000.0
+
+    stats = {
+        k: np.empty(n)
+        for k in ("total_return", "annual_return", "max_drawdown", "sharpe", "trades")
+    }
+    equity_all = np.empty((n, n_bars)) if keep_equity else None
+    block = max(1, MAX_BLOCK_CELLS // max(n_bars, 1))
+    years = max(n_bars - 1, 1) / periods_per_year
+
+    for lo in range(0, n, block):
+        hi = min(lo + block, n)
+        part = {k: v[lo:hi] for k, v in params.items()}
+        signal = _positions(rule, periods, lines, part, n_bars)
+        # Signal at bar t is held over bar t+1's return
+        held = np.zeros_like(signal)
+        held[:, 1:] = signal[:, :-1]
+        changes = np.abs(np.diff(held, axis=1, prepend=0.0))
+        strat = held * returns[None, :] - changes * cost
+        equity = np.cumprod(1.0 + strat, axis=1)
+        peak = np.maximum.accumulate(equity, axis=1)
+        drawdown = equity / peak - 1.0
+
+        mean = strat.mean(axis=1)
+        std = strat.std(axis=1, ddof=1) if n_bars > 1 else np.zeros(hi - lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+        final = equity[:, -1]
+        stats["total_return"][lo:hi] = final - 1.0
+        # Wiped-out (final <= 0) combinations get -100%; the power only sees positive growth
+        growth = np.where(final > 0, final, 1.0)
+        stats["annual_return"][lo:hi] = np.where(final > 0, growth ** (1.0 / years) - 1.0, -1.0)
+        stats["max_drawdown"][lo:hi] = drawdown.min(axis=1)
+        stats["sharpe"][lo:hi] = sharpe
+        stats["trades"][lo:hi] = (np.diff(held, axis=1) > 0).sum(axis=1)
+        if equity_all is not None:
+            equity_all[lo:hi] = equity
+
+    stats["trades"] = stats["trades"].astype(int)
+    return stats, equity_all
@@ -0,0 +1,308 @@
+"""
+Exchange trading calendars: regular session hours and a bundled holiday table for
+the main exchanges, and the ticker-suffix mapping that picks one for a symbol.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    MO,
+    DateOffset,
+    EasterMonday,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    next_monday,
+    next_monday_or_tuesday,
+    sunday_to_monday,
+)
+
+# Rules are expanded per year within this span; outside it only weekends are closed
+HOLIDAY_YEARS: tuple[int, int] = (1990, 2040)
+
+
+@dataclass(frozen=True)
+class TradingCalendar:
+    """
+    Regular sessions of one exchange: weekdays from open to close in tz, minus the
+    dates its holiday rules and one-off closures produce. Early closes are treated as
+    full sessions, which only makes "session finished" checks later, never earlier.
+    """
+
+    code: str
+    name: str
+    tz: str
+    open: time
+    close: time
+    rules: tuple[Holiday, ...] = ()
+    closures: tuple[str, ...] = ()
+    _zone: ZoneInfo = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_zone", ZoneInfo(self.tz))
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return self._zone
+
+    def holidays(self, year: int) -> frozenset[date]:
+        return _holidays(self, year)
+
+    def is_session(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def sessions(self, start: date, end: date) -> list[date]:
+        """Session dates in [start, end]."""
+        out = []
+        day = start
+        while day <= end:
+            if self.is_session(day):
+                out.append(day)
+            day += timedelta(days=1)
+        return out
+
+    def previous_session(self, day: date) -> date:
+        """Latest session on or before day."""
+        while not self.is_session(day):
+            day -= timedelta(days=1)
+        return day
+
+    def next_session(self, day: date) -> date:
+        """Earliest session on or after day."""
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return day
+
+    def session_open(self, day: date) -> datetime:
+        return datetime.combine(day, self.open, tzinfo=self._zone)
+
+    def session_close(self, day: date) -> datetime:
+        return datetime.combine(day, self.close, tzinfo=self._zone)
+
+    def localize(self, dt: datetime) -> datetime:
+        """
+        dt in exchange time. Naive midnights are dates the caller meant on this
+        exchange; other naive datetimes (e.g. datetime.now()) are in local time.
+        """
+        if dt.tzinfo is not None:
+            return dt.astimezone(self._zone)
+        if dt.time() == time.min:
+            return dt.replace(tzinfo=self._zone)
+        return dt.astimezone(self._zone)
+
+    def in_session(self, at: datetime) -> bool:
+        at = self.localize(at)
+        day = at.date()
+        return self.is_session(day) and self.session_open(day) <= at < self.session_close(day)
+
+    def last_closed(self, at: datetime) -> date:
+        """Latest session whose close is at or before at."""
+        at = self.localize(at)
+        day = self.previous_session(at.date())
+        if self.session_close(day) > at:
+            day = self.previous_session(day - timedelta(days=1))
+        return day
+
+    def quiet_until(self, at: datetime, settle: timedelta = timedelta(0)) -> Optional[datetime]:
+        """
+        Next session open if no session is running at `at` and the last one closed at
+        least settle earlier, so bars up to `at` are final until then; otherwise None.
+        """
+        at = self.localize(at)
+        if self.in_session(at) or self.session_close(self.last_closed(at)) + settle > at:
+            return None
+        return self.next_open(at)
+
+    def next_open(self, at: datetime) -> datetime:
+        """First session open after at."""
+        at = self.localize(at)
+        day = self.next_session(at.date())
+        if self.session_open(day) <= at:
+            day = self.next_session(day + timedelta(days=1))
+        return self.session_open(day)
+
+
+@lru_cache(maxsize=None)
+def _holidays(calendar: TradingCalendar, year: int) -> frozenset[date]:
+    if not HOLIDAY_YEARS[0] <= year <= HOLIDAY_YEARS[1]:
+        return frozenset()
+    lo, hi = pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31)
+    days = {d.date() for rule in calendar.rules for d in rule.dates(lo, hi)}
+    days.update(d for d in map(date.fromisoformat, calendar.closures) if d.year == year)
+    return frozenset(days)
+
+
+def _years(rule: Holiday, *spans: tuple[Optional[int], Optional[int]]) -> tuple[Holiday, ...]:
+    """rule limited to each (first, last) year span, for holidays moved in some years."""
+    out = []
+    for first, last in spans:
+        out.append(Holiday(
+            rule.name,
+            month=rule.month,
+            day=rule.day,
+            offset=rule.offset,
+            start_date=f"{first}-01-01" if first else None,
+            end_date=f"{last}-12-31" if last else None,
+        ))
+    return tuple(out)
+
+
+NYSE = TradingCalendar(
+    code="XNYS",
+    name="New York Stock Exchange",
+    tz="America/New_York",
+    open=time(9, 30),
+    close=time(16, 0),
+    rules=(
+        # NYSE does not close the Friday before a Saturday New Year's Day
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday("Martin Luther King Jr. Day", month=1, day=1,
+                offset=DateOffset(weekday=MO(3)), start_date="1998-01-01"),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01",
+                observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ),
+    closures=(
+        "1994-04-27",  # Nixon funeral
+        "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+        "2004-06-11",  # Reagan funeral
+        "2007-01-02",  # Ford funeral
+        "2012-10-29", "2012-10-30",  # Hurricane Sandy
+        "2018-12-05",  # G. H. W. Bush funeral
+        "2025-01-09",  # Carter funeral
+    ),
+)
+
+LSE = TradingCalendar(
+    code="XLON",
+    name="London Stock Exchange",
+    tz="Europe/London",
+    open=time(8, 0),
+    close=time(16, 30),
+    rules=(
+        Holiday("New Year's Day", month=1, day=1, observance=next_monday),
+        GoodFriday,
+        EasterMonday,
+        *_years(
+            Holiday("Early May Bank Holiday", month=5, day=1, offset=DateOffset(weekday=MO(1))),
+            (None, 1994), (1996, 2019), (2021, None),
+        ),
+        *_years(
+            Holiday("Spring Bank Holiday", month=5, day=31, offset=DateOffset(weekday=MO(-1))),
+            (None, 2001), (2003, 2011), (2013, 2021), (2023, None),
+        ),
+        Holiday("Summer Bank Holiday", month=8, day=31, offset=DateOffset(weekday=MO(-1))),
+        Holiday("Christmas", month=12, day=25, observance=next_monday),
+        Holiday("Boxing Day", month=12, day=26, observance=next_monday_or_tuesday),
+    ),
+    closures=(
+        "1995-05-08", "2020-05-08",  # early May bank holiday moved to VE Day
+        "2002-06-04", "2012-06-04", "2022-06-02",  # spring bank holiday moved for jubilees
+        "1999-12-31", "2002-06-03", "2011-04-29", "2012-06-05",
+        "2022-06-03", "2022-09-19", "2023-05-08",
+    ),
+)
+
+XETRA = TradingCalendar(
+    code="XETR",
+    name="Xetra",
+    tz="Europe/Berlin",
+    open=time(9, 0),
+    close=time(17, 30),
+    rules=(
+        Holiday("New Year's Day", month=1, day=1),
+        GoodFriday,
+        EasterMonday,
+        Holiday("Labour Day", month=5, day=1),
+        Holiday("Christmas Eve", month=12, day=24),
+        Holiday("Christmas", month=12, day=25),
+        Holiday("Boxing Day", month=12, day=26),
+        Holiday("New Year's Eve", month=12, day=31),
+    ),
+)
+
+TSX = TradingCalendar(
+    code="XTSE",
+    name="Toronto Stock Exchange",
+    tz="America/Toronto",
+    open=time(9, 30),
+    close=time(16, 0),
+    rules=(
+        Holiday("New Year's Day", month=1, day=1, observance=next_monday),
+        Holiday("Family Day", month=2, day=1, offset=DateOffset(weekday=MO(3)),
+                start_date="2008-01-01"),
+        GoodFriday,
+        # Monday before May 25
+        Holiday("Victoria Day", month=5, day=24, offset=DateOffset(weekday=MO(-1))),
+        Holiday("Canada Day", month=7, day=1, observance=next_monday),
+        Holiday("Civic Holiday", month=8, day=1, offset=DateOffset(weekday=MO(1))),
+        Holiday("Labour Day", month=9, day=1, offset=DateOffset(weekday=MO(1))),
+        Holiday("Thanksgiving", month=10, day=1, offset=DateOffset(weekday=MO(2))),
+        Holiday("Christmas", month=12, day=25, observance=next_monday),
+        Holiday("Boxing Day", month=12, day=26, observance=next_monday_or_tuesday),
+    ),
+)
+
+EXCHANGES: dict[str, TradingCalendar] = {c.code: c for c in (NYSE, LSE, XETRA, TSX)}
+
+# Yahoo and Stooq ticker suffixes -> exchange code
+SUFFIX_EXCHANGES: dict[str, str] = {
+    "US": "XNYS",
+    "L": "XLON",
+    "UK": "XLON",
+    "DE": "XETR",
+    "TO": "XTSE",
+}
+
+# Index symbols whose constituents trade on one exchange
+INDEX_EXCHANGES: dict[str, str] = {
+    "^GSPC": "XNYS",
+    "^DJI": "XNYS",
+    "^IXIC": "XNYS",
+    "^NDX": "XNYS",
+    "^RUT": "XNYS",
+    "^FTSE": "XLON",
+    "^GDAXI": "XETR",
+    "^GSPTSE": "XTSE",
+}
+
+# Crypto pairs (BTC-USD) trade every day; FX (=X) and futures (=F) nearly around the clock
+_UNSCHEDULED = re.compile(r"=|-(USD|USDT|EUR|GBP|JPY|BTC|ETH)$")
+
+
+def calendar_for(ticker: str) -> Optional[TradingCalendar]:
+    """
+    Calendar of the exchange a ticker trades on, from its suffix (AAPL.US, VOD.L,
+    SAP.DE, RY.TO); plain symbols are US listings. None when unknown or when the
+    instrument does not follow exchange sessions (crypto, FX, futures, other indexes).
+    """
+    symbol = (ticker or "").strip().upper()
+    if not symbol:
+        return None
+    if symbol.startswith("^"):
+        code = INDEX_EXCHANGES.get(symbol)
+        return EXCHANGES[code] if code else None
+    if _UNSCHEDULED.search(symbol):
+        return None
+    if "." in symbol:
+        code = SUFFIX_EXCHANGES.get(symbol.rsplit(".", 1)[1])
+        return EXCHANGES[code] if code else None
+    return NYSE
@@ -5,6 +5,7 @@ from typing import Optional, Sequence
 import numpy as np
 import pandas as pd
 
+from finance_app.models import kernels
 from finance_app.utils.exceptions import IndicatorError
 from finance_app.utils.logger import get_logger
 
@@ -13,6 +14,20 @@ _log = get_logger(__name__)
 # Cap periods to avoid huge rolling windows (memory/CPU)
 MAX_INDICATOR_PERIOD: int = 500
 
+TRADING_DAYS_PER_YEAR: int = 252
+
+# Columns that depend on every bar since the first row rather than a trailing window;
+# they cannot be reproduced from a warm-up, so chunked/delta responses leave them out
+PATH_DEPENDENT_COLUMNS: tuple[str, ...] = ("drawdown", "max_drawdown")
+
+# Bars per regular US session for each interval (6.5h session; Yahoo's 1h bars start on the half hour)
+_BARS_PER_SESSION = {"1m": 390, "5m": 78, "15m": 26, "30m": 13, "1h": 7, "1d": 1}
+
+
+def bars_per_year(interval: str = "1d") -> int:
+    """Bars in a trading year for an interval, used to annualize volatility."""
+    return TRADING_DAYS_PER_YEAR * _BARS_PER_SESSION.get(interval, 1)
+
 
 def _require_close(df: pd.DataFrame) -> pd.Series:
     """Return close series or raise IndicatorError."""
@@ -23,11 +38,19 @@ def _require_close(df: pd.DataFrame) -> pd.Series:
     return df["close"].astype(float)
 
 
+def _values(series: pd.Series) -> np.ndarray:
+    """Contiguous float64 values for a compiled kernel."""
+    return np.ascontiguousarray(series.to_numpy(dtype="float64"))
+
+
 def sma(close: pd.Series, period: int) -> pd.Series:
     """Simple moving average of close. Returns Series aligned with close."""
     if period < 1:
         raise IndicatorError("period must be >= 1")
     period = min(period, MAX_INDICATOR_PERIOD)
+    kernel = kernels.compiled("rolling_mean")
+    if kernel is not None:
+        return pd.Series(kernel(_values(close), period), index=close.index, name=close.name)
     return close.rolling(window=period, min_periods=1).mean()
 
 
@@ -36,6 +59,11 @@ def ema(close: pd.Series, period: int) -> pd.Series:
     if period < 1:
         raise IndicatorError("period must be >= 1")
     period = min(period, MAX_INDICATOR_PERIOD)
+    kernel = kernels.compiled("ewm_mean")
+    if kernel is not None:
+        # pandas turns span into a center of mass
+        com = (period - 1) / 2
+        return pd.Series(kernel(_values(close), com), index=close.index, name=close.name)
     return close.ewm(span=period, adjust=False, min_periods=1).mean()
 
 
@@ -47,6 +75,9 @@ def rsi(close: pd.Series, period: int = 14) -> pd.Series:
     if period < 1:
         raise IndicatorError("period must be >= 1")
     period = min(period, MAX_INDICATOR_PERIOD)
+    kernel = kernels.compiled("wilder_rsi")
+    if kernel is not None:
+        return pd.Series(kernel(_values(close), period), index=close.index)
     delta = close.diff()
     gain = delta.where(delta > 0, 0.0)
     loss = (-delta).where(delta < 0, 0.0)
@@ -58,7 +89,7 @@ def rsi(close: pd.Series, period: int = 14) -> pd.Series:
 
 
 def daily_returns(close: pd.Series) -> pd.Series:
-    """Day-over-day percentage return. First value is NaN."""
+    """Bar-over-bar percentage return (day-over-day for daily bars). First value is NaN."""
     return close.pct_change()
 
 
@@ -66,30 +97,93 @@ def volatility(
     close: pd.Series,
     window: int = 20,
     annualize: bool = True,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
 ) -> pd.Series:
     """
-    Rolling standard deviation of daily returns. If annualize=True, multiply by sqrt(252).
+    Rolling standard deviation of bar returns. If annualize=True, multiply by
+    sqrt(periods_per_year) (252 for daily bars; see bars_per_year for intraday).
     """
     if window < 1:
         raise IndicatorError("window must be >= 1")
     window = min(window, MAX_INDICATOR_PERIOD)
     ret = close.pct_change()
-    vol = ret.rolling(window=window, min_periods=1).std()
+    kernel = kernels.compiled("rolling_std")
+    if kernel is not None:
+        vol = pd.Series(kernel(_values(ret), window), index=ret.index, name=ret.name)
+    else:
+        vol = ret.rolling(window=window, min_periods=1).std()
     if annualize:
-        vol = vol * np.sqrt(252)
+        vol = vol * np.sqrt(periods_per_year)
     return vol
 
 
+def _sliding_extreme(values: np.ndarray, window: int, op: np.ufunc) -> np.ndarray:
+    """
+    Trailing-window max (op=np.fmax) or min (np.fmin) in O(n), van Herk/Gil-Werman:
+    split into blocks of window bars, take running extremes forwards and backwards
+    within each block; every window then spans one block suffix and the next block's
+    prefix, so its extreme is op(suffix[i], prefix[i + window - 1]). The first bars
+    use the expanding extreme (min_periods=1). NaNs are skipped.
+    """
+    x = np.asarray(values, dtype="float64")
+    n = len(x)
+    w = min(window, n)
+    if w <= 1:
+        return x.copy()
+    # NaN padding is neutral for fmax/fmin
+    blocks = np.concatenate([x, np.full(-n % w, np.nan)]).reshape(-1, w)
+    prefix = op.accumulate(blocks, axis=1).ravel()
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    out = np.empty(n)
+    out[: w - 1] = op.accumulate(x[: w - 1])
+    out[w - 1:] = op(suffix[: n - w + 1], prefix[w - 1: n])
+    return out
+
+
+def rolling_max(series: pd.Series, window: int) -> pd.Series:
+    """Highest value over the trailing window bars (fewer at the start). O(n) in window."""
+    if window < 1:
+        raise IndicatorError("window must be >= 1")
+    return pd.Series(_sliding_extreme(series.to_numpy(), window, np.fmax), index=series.index)
+
+
+def rolling_min(series: pd.Series, window: int) -> pd.Series:
+    """Lowest value over the trailing window bars (fewer at the start). O(n) in window."""
+    if window < 1:
+        raise IndicatorError("window must be >= 1")
+    return pd.Series(_sliding_extreme(series.to_numpy(), window, np.fmin), index=series.index)
+
+
+def drawdown(close: pd.Series) -> pd.Series:
+    """Fraction below the highest close so far (0 at a new high, -0.25 = 25% below)."""
+    values = close.to_numpy(dtype="float64")
+    return pd.Series(values / np.fmax.accumulate(values) - 1.0, index=close.index)
+
+
+def max_drawdown(close: pd.Series) -> pd.Series:
+    """Deepest drawdown reached so far (running minimum of drawdown)."""
+    return pd.Series(np.fmin.accumulate(drawdown(close).to_numpy()), index=close.index)
+
+
 def add_indicators(
     df: pd.DataFrame,
     sma_periods: Optional[Sequence[int]] = None,
     ema_periods: Optional[Sequence[int]] = None,
     rsi_period: int = 14,
     volatility_window: int = 20,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    donchian_window: int = 20,
+    range_columns: bool = True,
 ) -> pd.DataFrame:
     """
     Add indicator columns to a copy of df. Expects columns: open, high, low, close, volume.
-    New columns: sma_<n>, ema_<n>, rsi, returns, volatility.
+    New columns: sma_<n>, ema_<n>, rsi, returns, volatility, high_52w/low_52w (highest
+    high / lowest low over periods_per_year bars), pct_from_high (close vs high_52w),
+    drawdown/max_drawdown (from the highest close since the first row) and
+    donchian_upper/lower/mid over donchian_window bars. Periods count bars, so they
+    work the same on intraday indexes; pass periods_per_year=bars_per_year(interval)
+    to annualize intraday volatility. range_columns=False leaves out high_52w, low_52w
+    and pct_from_high, for intraday bars where sources hold far less than a year.
     """
     if df is None or df.empty:
         raise IndicatorError("DataFrame is empty or None")
@@ -105,5 +199,21 @@ def add_indicators(
         out[f"ema_{n}"] = ema(c, n)
     out["rsi"] = rsi(c, rsi_period)
     out["returns"] = daily_returns(c)
-    out["volatility"] = volatility(c, window=volatility_window)
+    out["volatility"] = volatility(
+        c, window=volatility_window, periods_per_year=periods_per_year
+    )
+    high = out["high"].astype(float)
+    low = out["low"].astype(float)
+    if range_columns:
+        out["high_52w"] = rolling_max(high, periods_per_year)
+        out["low_52w"] = rolling_min(low, periods_per_year)
+        out["pct_from_high"] = c / out["high_52w"] - 1.0
+    out["drawdown"] = drawdown(c)
+    out["max_drawdown"] = max_drawdown(c)
+    if donchian_window < 1:
+        raise IndicatorError("donchian_window must be >= 1")
+    donchian_window = min(donchian_window, MAX_INDICATOR_PERIOD)
+    out["donchian_upper"] = rolling_max(high, donchian_window)
+    out["donchian_lower"] = rolling_min(low, donchian_window)
+    out["donchian_mid"] = (out["donchian_upper"] + out["donchian_lower"]) / 2.0
     return out
@@ -0,0 +1,279 @@
+"""
+Single-pass loop kernels for the recursive and rolling indicators (EMA, Wilder RSI,
+SMA, rolling std), compiled with numba when it is installed (optional, imported lazily).
+
+Each kernel repeats the arithmetic of the pandas routine the indicator otherwise
+uses (ewm adjust=False, rolling mean/var with Kahan-compensated running sums), in the
+same order, so both backends give identical floats. Without numba the indicators keep
+the pandas/NumPy path; the plain-Python kernels are only used to check parity.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from finance_app.config import INDICATOR_BACKEND
+from finance_app.utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+BACKENDS: tuple[str, ...] = ("numba", "numpy")
+
+
+def ewm_mean(values: np.ndarray, com: float) -> np.ndarray:
+    """
+    Series.ewm(com=com, adjust=False, min_periods=1).mean(): missing values keep the
+    previous average and decay its weight, as pandas does with ignore_na=False.
+    """
+    n = len(values)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 1 if weighted == weighted else 0
+    out[0] = weighted if nobs >= 1 else np.nan
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                # constant runs stay exact
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= 1 else np.nan
+    return out
+
+
+def wilder_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder smoothing (alpha = 1/period) in one pass: gains and losses are
+    averaged as they are read instead of being materialized as Series first.
+    """
+    n = len(close)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    com = (1.0 - 1.0 / period) / (1.0 / period)
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    # the first bar has no change: gain and loss are 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    gain_wt = 1.0
+    loss_wt = 1.0
+    for i in range(n):
+        if i > 0:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            gain_wt *= old_wt_factor
+            if avg_gain != gain:
+                avg_gain = (gain_wt * avg_gain + alpha * gain) / (gain_wt + alpha)
+            gain_wt = 1.0
+            loss_wt *= old_wt_factor
+            if avg_loss != loss:
+                avg_loss = (loss_wt * avg_loss + alpha * loss) / (loss_wt + alpha)
+            loss_wt = 1.0
+        if avg_loss == 0:
+            rs = 1.0 if avg_gain == 0 else np.inf
+        else:
+            rs = avg_gain / avg_loss
+        raw = 100 - (100 / (1 + rs))
+        out[i] = min(max(raw, 0.0), 100.0)
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Series.rolling(window, min_periods=1).mean(), NaNs skipped."""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same = 0
+    prev = np.nan
+    for i in range(n):
+        if i == 0 or window == 1:
+            # pandas starts over when a window shares no bar with the previous one
+            nobs = 0
+            neg_ct = 0
+            sum_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same = 0
+            prev = values[i]
+        elif i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, val) < 0:
+                    neg_ct -= 1
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if math.copysign(1.0, val) < 0:
+                neg_ct += 1
+            if val == prev:
+                same += 1
+            else:
+                same = 1
+            prev = val
+        if nobs > 0:
+            result = sum_x / nobs
+            if same >= nobs:
+                result = prev
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Series.rolling(window, min_periods=1).std() (ddof=1) with Welford updates; NaN
+    until two values are in the window.
+    """
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0.0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same = 0
+    prev = np.nan
+    for i in range(n):
+        if i == 0 or window == 1:
+            nobs = 0.0
+            mean_x = 0.0
+            ssqdm_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same = 0
+            prev = values[i]
+        elif i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                if nobs:
+                    prev_mean = mean_x - comp_remove
+                    y = val - comp_remove
+                    t = y - mean_x
+                    comp_remove = t + mean_x - y
+                    mean_x = mean_x - t / nobs
+                    ssqdm_x = ssqdm_x - (val - prev_mean) * (val - mean_x)
+                else:
+                    mean_x = 0.0
+                    ssqdm_x = 0.0
+        val = values[i]
+        if val == val:
+            if val == prev:
+                same += 1
+            else:
+                same = 1
+            prev = val
+            nobs += 1
+            prev_mean = mean_x - comp_add
+            y = val - comp_add
+            t = y - mean_x
+            comp_add = t + mean_x - y
+            mean_x = mean_x + t / nobs
+            ssqdm_x = ssqdm_x + (val - prev_mean) * (val - mean_x)
+        if nobs > 1:
+            var = 0.0 if same >= nobs else ssqdm_x / (nobs - 1.0)
+            # sqrt of a tiny negative from rounding is 0, as in pandas
+            out[i] = 0.0 if var < 0 else math.sqrt(var)
+        else:
+            out[i] = np.nan
+    return out
+
+
+PYTHON_KERNELS: dict[str, Callable] = {
+    "ewm_mean": ewm_mean,
+    "wilder_rsi": wilder_rsi,
+    "rolling_mean": rolling_mean,
+    "rolling_std": rolling_std,
+}
+
+_lock = threading.Lock()
+_compiled: Optional[dict[str, Callable]] = None
+_backend: Optional[str] = None
+
+
+def numba_available() -> bool:
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _compile() -> dict[str, Callable]:
+    import numba
+
+    return {
+        name: numba.njit(cache=True, nogil=True)(fn) for name, fn in PYTHON_KERNELS.items()
+    }
+
+
+def set_backend(name: str) -> str:
+    """
+    Select "numba", "numpy" or "auto" (numba when installed); returns the backend in
+    use. Asking for numba without it installed logs a warning and falls back to numpy.
+    """
+    global _backend, _compiled
+    if name not in BACKENDS + ("auto",):
+        raise ValueError(f"Unknown indicator backend {name!r}; use one of {BACKENDS} or 'auto'")
+    with _lock:
+        chosen = "numpy"
+        if name != "numpy":
+            if numba_available():
+                if _compiled is None:
+                    _compiled = _compile()
+                chosen = "numba"
+            elif name == "numba":
+                _log.warning("numba is not installed; indicators use the numpy backend")
+        _backend = chosen
+    return chosen
+
+
+def backend() -> str:
+    """Backend in use, resolved from NOKEYFINANCE_INDICATOR_BACKEND on first call."""
+    if _backend is None:
+        return set_backend(INDICATOR_BACKEND)
+    return _backend
+
+
+def compiled(name: str) -> Optional[Callable]:
+    """The numba kernel called name, or None when the numpy backend is active."""
+    if backend() != "numba":
+        return None
+    return _compiled[name]
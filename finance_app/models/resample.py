@@ -0,0 +1,31 @@
+"""Merging consecutive OHLCV bars into coarser ones."""
+
+import numpy as np
+import pandas as pd
+
+
+def downsample_ohlcv(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """
+    Merge every factor consecutive bars into one: first open, highest high, lowest
+    low, last close, summed volume, labelled with the last bar's timestamp. Groups are
+    anchored at the newest bar, so only the oldest group may be partial.
+    """
+    n = len(df)
+    if factor <= 1 or n == 0:
+        return df.copy()
+    lead = n % factor
+    starts = np.arange(lead, n, factor)
+    if lead:
+        starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], n) - 1
+    out = pd.DataFrame(
+        {
+            "open": df["open"].to_numpy()[starts],
+            "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+            "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+            "close": df["close"].to_numpy()[ends],
+            "volume": np.add.reduceat(df["volume"].to_numpy(), starts),
+        },
+        index=df.index[ends],
+    )
+    return out
@@ -0,0 +1,311 @@
+"""
+Local symbol directory: ticker, name, exchange and Stooq symbol of listed instruments,
+loaded from a CSV, with a prefix index for autocomplete and checks that catch unknown
+tickers before they reach a data source.
+"""
+
+from __future__ import annotations
+
+import csv
+import difflib
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from finance_app.config import BUNDLED_SYMBOLS_FILE, SYMBOL_CHECK, SYMBOLS_FILE
+from finance_app.utils.exceptions import ValidationError
+from finance_app.utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+COLUMNS: tuple[str, ...] = ("symbol", "name", "exchange", "stooq")
+# Header comment naming the markets a file lists completely, e.g. "# complete: US"
+_COMPLETE_PREFIX = "# complete:"
+
+# Stooq spellings of Yahoo suffixes ("" = plain US symbol), and back
+STOOQ_SUFFIXES: dict[str, str] = {"US": "US", "L": "UK", "DE": "DE"}
+_YAHOO_SUFFIXES: dict[str, str] = {"US": "", "UK": "L"}
+
+# Share-like symbols (class shares BRK-B, listing suffix VOD.L); crypto pairs (BTC-USD)
+# and other instruments do not match and are never rejected as unknown
+_SHARE = re.compile(r"^([A-Z0-9]+(?:-[A-Z]{1,2})?)(?:\.([A-Z]{1,3}))?$")
+
+# Shortest word the fuzzy fallback tries to correct, and how close a match must be
+_FUZZY_MIN_LENGTH = 3
+_FUZZY_CUTOFF = 0.75
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """One listing: Yahoo-style symbol (AAPL, VOD.L), name, exchange MIC, Stooq symbol."""
+
+    symbol: str
+    name: str
+    exchange: str
+    stooq: str = ""
+
+
+def canonical(ticker: str) -> str:
+    """Upper-case Yahoo form of a ticker: AAPL.US -> AAPL, VOD.UK -> VOD.L."""
+    symbol = (ticker or "").strip().upper()
+    base, dot, suffix = symbol.rpartition(".")
+    if dot and suffix in _YAHOO_SUFFIXES:
+        mapped = _YAHOO_SUFFIXES[suffix]
+        return f"{base}.{mapped}" if mapped else base
+    return symbol
+
+
+def market(ticker: str) -> Optional[str]:
+    """Listing market of a share-like ticker: its Yahoo suffix, or "US"; None otherwise."""
+    m = _SHARE.match(canonical(ticker))
+    if m is None:
+        return None
+    return m.group(2) or "US"
+
+
+def _fold(text: str) -> str:
+    """Upper case without accents, so "borse" finds "Börse"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).upper()
+
+
+def _words(text: str) -> tuple[str, ...]:
+    return tuple(re.findall(r"[A-Z0-9]+", _fold(text)))
+
+
+def _sorted_index(pairs: Iterable[tuple[str, int]]) -> tuple[list[str], list[int]]:
+    ordered = sorted(set(pairs))
+    return [k for k, _ in ordered], [i for _, i in ordered]
+
+
+def _prefixed(keys: list[str], ids: list[int], prefix: str) -> Iterator[int]:
+    """Ids of keys starting with prefix, in key order (one bisect, then a scan)."""
+    pos = bisect_left(keys, prefix)
+    while pos < len(keys) and keys[pos].startswith(prefix):
+        yield ids[pos]
+        pos += 1
+
+
+class SymbolDirectory:
+    """
+    Symbols held in sorted key arrays: one for symbols (with and without suffix, and
+    their Stooq form), one for the words of names. A prefix lookup is a bisect plus a
+    scan of the matching run, so autocomplete takes microseconds without a trie's
+    per-node dicts. complete names the markets (see market()) that are listed in
+    full, where a missing ticker is known not to exist.
+    """
+
+    def __init__(self, symbols: Iterable[Symbol], complete: Iterable[str] = ()) -> None:
+        self._rows: list[Symbol] = []
+        self._by_symbol: dict[str, int] = {}
+        for row in symbols:
+            key = canonical(row.symbol)
+            if key and key not in self._by_symbol:
+                self._by_symbol[key] = len(self._rows)
+                self._rows.append(row)
+        self.complete: frozenset[str] = frozenset(m.strip().upper() for m in complete)
+
+        symbol_keys: list[tuple[str, int]] = []
+        word_keys: list[tuple[str, int]] = []
+        self._name_words: list[tuple[str, ...]] = []
+        self._bases: dict[str, list[int]] = {}
+        for i, row in enumerate(self._rows):
+            key = canonical(row.symbol)
+            base = key.split(".", 1)[0]
+            symbol_keys += [(key, i), (base, i)]
+            if row.stooq:
+                symbol_keys.append((row.stooq.upper(), i))
+            self._bases.setdefault(base, []).append(i)
+            words = _words(row.name)
+            self._name_words.append(words)
+            word_keys += [(w, i) for w in words]
+        self._symbol_keys, self._symbol_ids = _sorted_index(symbol_keys)
+        self._word_keys, self._word_ids = _sorted_index(word_keys)
+
+        # Fuzzy candidates bucketed by first character, to keep difflib's scan short
+        self._symbol_vocab: dict[str, list[str]] = {}
+        for base in self._bases:
+            self._symbol_vocab.setdefault(base[0], []).append(base)
+        self._word_vocab: dict[str, list[str]] = {}
+        for word in dict.fromkeys(self._word_keys):
+            if len(word) >= _FUZZY_MIN_LENGTH:
+                self._word_vocab.setdefault(word[0], []).append(word)
+
+    @classmethod
+    def load(cls, path: Path) -> "SymbolDirectory":
+        """Read a CSV with COLUMNS; a leading "# complete: US,L" line sets complete."""
+        complete: list[str] = []
+        with open(path, newline="", encoding="utf-8") as f:
+            lines = []
+            for line in f:
+                if line.startswith(_COMPLETE_PREFIX):
+                    complete += line[len(_COMPLETE_PREFIX):].split(",")
+                elif not line.startswith("#"):
+                    lines.append(line)
+        rows = [
+            Symbol(
+                symbol=r["symbol"].strip().upper(),
+                name=(r.get("name") or "").strip(),
+                exchange=(r.get("exchange") or "").strip().upper(),
+                stooq=(r.get("stooq") or "").strip().upper(),
+            )
+            for r in csv.DictReader(lines)
+            if (r.get("symbol") or "").strip()
+        ]
+        directory = cls(rows, [m for m in complete if m.strip()])
+        _log.info("Loaded %d symbols from %s", len(directory), path)
+        return directory
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Symbol]:
+        return iter(self._rows)
+
+    def __contains__(self, ticker: object) -> bool:
+        return isinstance(ticker, str) and canonical(ticker) in self._by_symbol
+
+    def get(self, ticker: str) -> Optional[Symbol]:
+        i = self._by_symbol.get(canonical(ticker))
+        return None if i is None else self._rows[i]
+
+    def search(self, query: str, limit: int = 10) -> list[Symbol]:
+        """
+        Up to limit symbols for a partial ticker or name: the exact symbol first, then
+        symbols starting with the query, then names with a word starting with each
+        query word. Only when nothing matches are misspelt symbols and name words
+        corrected (difflib, same first letter).
+        """
+        words = _words(query)
+        if not words or limit <= 0:
+            return []
+        text = _fold(query).strip()
+        found: dict[int, None] = {}
+
+        def take(ids: Iterable[int]) -> bool:
+            for i in ids:
+                if len(found) >= limit:
+                    break
+                found.setdefault(i)
+            return len(found) >= limit
+
+        exact = self._by_symbol.get(canonical(text))
+        if exact is not None:
+            found[exact] = None
+        if not take(_prefixed(self._symbol_keys, self._symbol_ids, text)):
+            take(self._name_matches(words))
+        if not found:
+            if len(words) == 1:
+                take(self._close_symbols(words[0], limit))
+            corrected = tuple(self._closest_word(w) or w for w in words)
+            if corrected != words:
+                take(self._name_matches(corrected))
+        return [self._rows[i] for i in found]
+
+    def suggest(self, ticker: str, n: int = 3) -> list[str]:
+        """Known symbols spelt like ticker (e.g. APPL -> AAPL)."""
+        base = canonical(ticker).split(".", 1)[0]
+        return [self._rows[i].symbol for i in self._close_symbols(base, n)][:n]
+
+    def check(self, ticker: str) -> None:
+        """
+        Raise ValidationError if ticker is missing although its market is listed
+        completely; anything else (partial listings, crypto, FX) passes.
+        """
+        if ticker in self or market(ticker) not in self.complete:
+            return
+        hints = self.suggest(ticker)
+        hint = f" Did you mean {', '.join(hints)}?" if hints else ""
+        raise ValidationError(f"Unknown ticker: {ticker!r}.{hint}")
+
+    def stooq_symbol(self, ticker: str) -> str:
+        """
+        Stooq's spelling of ticker: the directory's entry, else the suffix mapped
+        (AAPL -> AAPL.US, VOD.L -> VOD.UK); other tickers are passed on unchanged.
+        """
+        row = self.get(ticker)
+        if row is not None and row.stooq:
+            return row.stooq
+        m = _SHARE.match(canonical(ticker))
+        suffix = STOOQ_SUFFIXES.get(m.group(2) or "US") if m else None
+        if suffix is None:
+            return ticker.strip().upper()
+        return f"{m.group(1)}.{suffix}"
+
+    def _name_matches(self, words: tuple[str, ...]) -> Iterator[int]:
+        # Scan the run of the longest (most selective) word, check the others per row
+        lead = max(words, key=len)
+        for i in _prefixed(self._word_keys, self._word_ids, lead):
+            name = self._name_words[i]
+            if all(any(w.startswith(q) for w in name) for q in words):
+                yield i
+
+    def _close_symbols(self, base: str, n: int) -> Iterator[int]:
+        if len(base) < _FUZZY_MIN_LENGTH - 1:
+            return
+        candidates = self._symbol_vocab.get(base[0], ())
+        for match in difflib.get_close_matches(base, candidates, n=n, cutoff=_FUZZY_CUTOFF):
+            yield from self._bases[match]
+
+    def _closest_word(self, word: str) -> Optional[str]:
+        if len(word) < _FUZZY_MIN_LENGTH:
+            return None
+        matches = difflib.get_close_matches(
+            word, self._word_vocab.get(word[0], ()), n=1, cutoff=_FUZZY_CUTOFF
+        )
+        return matches[0] if matches else None
+
+
+def write_symbols(path: Path, symbols: Iterable[Symbol], complete: Iterable[str] = ()) -> int:
+    """Write symbols as a directory CSV (atomically); returns the row count."""
+    rows = sorted(symbols, key=lambda s: s.symbol)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            markets = sorted(set(complete))
+            if markets:
+                f.write(f"{_COMPLETE_PREFIX} {','.join(markets)}\n")
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(COLUMNS)
+            writer.writerows((s.symbol, s.name, s.exchange, s.stooq) for s in rows)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(rows)
+
+
+_lock = threading.Lock()
+_directory: Optional[SymbolDirectory] = None
+
+
+def symbol_directory() -> SymbolDirectory:
+    """The process-wide directory: SYMBOLS_FILE if it exists, else the bundled file."""
+    global _directory
+    if _directory is None:
+        with _lock:
+            if _directory is None:
+                path = SYMBOLS_FILE if SYMBOLS_FILE.is_file() else BUNDLED_SYMBOLS_FILE
+                _directory = SymbolDirectory.load(path)
+    return _directory
+
+
+def search_symbols(query: str, limit: int = 10) -> list[Symbol]:
+    return symbol_directory().search(query, limit)
+
+
+def check_symbol(ticker: str) -> None:
+    """Reject a ticker the directory knows does not exist (unless SYMBOL_CHECK is off)."""
+    if SYMBOL_CHECK:
+        symbol_directory().check(ticker)
+
+
+def stooq_symbol(ticker: str) -> str:
+    return symbol_directory().stooq_symbol(ticker)
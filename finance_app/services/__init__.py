@@ -1,6 +1,27 @@
 """Business logic services."""
 
-from .analysis_service import add_indicators_to_stock, get_ohlcv_with_indicators
-from .data_service import get_ohlcv
+from .analysis_service import (
+    add_indicators_to_stock,
+    get_many_with_indicators,
+    get_ohlcv_since,
+    get_ohlcv_with_indicators,
+    iter_ohlcv_with_indicators,
+)
+from .backtest_service import backtest_ticker, backtest_universe
+from .data_service import get_corporate_actions, get_ohlcv, resolve_date_range
+from .screener_service import iter_screen, screen
 
-__all__ = ["get_ohlcv", "get_ohlcv_with_indicators", "add_indicators_to_stock"]
+__all__ = [
+    "get_ohlcv",
+    "get_corporate_actions",
+    "resolve_date_range",
+    "get_ohlcv_with_indicators",
+    "get_ohlcv_since",
+    "get_many_with_indicators",
+    "iter_ohlcv_with_indicators",
+    "add_indicators_to_stock",
+    "backtest_ticker",
+    "backtest_universe",
+    "iter_screen",
+    "screen",
+]
@@ -1,16 +1,71 @@
 """Helpers for fetching data and computing indicators."""
 
-from typing import Optional, Sequence
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence
 
 import pandas as pd
 
-from ..models.indicators import add_indicators
+from ..config import BATCH_MAX_TICKERS, BATCH_WORKERS
+from ..data_sources.base import OHLCV_COLUMNS
+from ..models.indicators import (
+    PATH_DEPENDENT_COLUMNS,
+    TRADING_DAYS_PER_YEAR,
+    add_indicators,
+    bars_per_year,
+)
+from ..models.resample import downsample_ohlcv
 from ..models.stock import StockData
+from ..utils.exceptions import NoDataError, NoKeyFinanceError, ValidationError
 from ..utils.logger import get_logger
-from .data_service import get_ohlcv
+from ..utils.memory import MB, MemoryBudget, indicator_columns
+from ..utils.resilience import Deadline
+from ..utils.validators import is_intraday, validate_interval, validate_ticker
+from .data_service import earliest_start, get_ohlcv, resolve_date_range
 
 _log = get_logger(__name__)
 
+# Periods of warm-up for recursive indicators; the seed's weight decays to
+# (1 - alpha) ** (factor * period). EMA (alpha = 2 / (p + 1)) reaches about e**-20
+# (~2e-9) after 10 periods, Wilder-smoothed RSI (alpha = 1 / p) only e**-10 (~4.5e-5),
+# so it gets twice as many.
+RECURSIVE_WARMUP_FACTOR: int = 10
+WILDER_WARMUP_FACTOR: int = 20
+
+# Days of history per streamed chunk
+STREAM_CHUNK_DAYS: int = 365
+
+
+def warmup_bars(
+    sma_periods: Optional[Sequence[int]] = None,
+    ema_periods: Optional[Sequence[int]] = None,
+    rsi_period: int = 14,
+    volatility_window: int = 20,
+    range_window: int = TRADING_DAYS_PER_YEAR,
+    donchian_window: int = 20,
+) -> int:
+    """
+    Bars of history needed before the first output row so indicator values match a
+    computation over the full series. Exact for SMA/volatility/52-week/Donchian
+    windows; EMA gets RECURSIVE_WARMUP_FACTOR and RSI WILDER_WARMUP_FACTOR periods to
+    converge (the seed keeps a weight of ~2e-9). Drawdowns depend on the whole series
+    and are not covered (see PATH_DEPENDENT_COLUMNS).
+    """
+    sma_periods = (20, 50) if sma_periods is None else sma_periods
+    ema_periods = (12, 26) if ema_periods is None else ema_periods
+    windows = max(tuple(sma_periods) + (volatility_window + 1, range_window, donchian_window))
+    recursive = max(
+        max(ema_periods, default=0) * RECURSIVE_WARMUP_FACTOR,
+        rsi_period * WILDER_WARMUP_FACTOR,
+    )
+    return max(windows, recursive)
+
+
+def warmup_days(bars: int) -> int:
+    """Calendar days that cover the given number of daily bars (with holiday slack)."""
+    return math.ceil(bars * 365 / 252) + 14
+
 
 def get_ohlcv_with_indicators(
     ticker: str,
@@ -21,26 +76,191 @@ def get_ohlcv_with_indicators(
     ema_periods: Optional[Sequence[int]] = None,
     rsi_period: int = 14,
     volatility_window: int = 20,
+    interval: str = "1d",
+    adjusted: bool = False,
+    deadline: Optional[Deadline] = None,
+    budget: Optional[MemoryBudget] = None,
 ) -> tuple[StockData, pd.DataFrame]:
     """
     Fetch OHLCV for the ticker and add technical indicators.
 
     Returns (StockData with raw OHLCV, DataFrame with OHLCV + indicator columns).
     Uses get_ohlcv for fetch; add_indicators for sma, ema, rsi, returns, volatility.
+    Indicator periods count bars of the given interval. adjusted=True computes them on
+    split/dividend-adjusted prices. deadline is passed on to get_ohlcv.
+    With a budget, the fetched rows x indicator columns are checked before computing:
+    over budget, bars are merged (enriched.attrs["downsample"] = bars per row, so
+    indicator periods count merged bars) or MemoryBudgetError is raised.
     """
-    stock = get_ohlcv(ticker, start=start, end=end, source=source)
+    stock = get_ohlcv(
+        ticker,
+        start=start,
+        end=end,
+        source=source,
+        interval=interval,
+        adjusted=adjusted,
+        deadline=deadline,
+    )
     if stock.empty:
         return stock, stock.df.copy()
+    factor = 1
+    if budget is not None:
+        columns = indicator_columns(
+            2 if sma_periods is None else len(sma_periods),
+            2 if ema_periods is None else len(ema_periods),
+        )
+        factor = budget.admit(len(stock.df), columns, f"{stock.ticker} {interval} request")
+        if factor > 1:
+            _log.warning(
+                "Merging %s bars %d:1 to fit the %.1f MB memory budget",
+                stock.ticker,
+                factor,
+                budget.limit / MB,
+            )
+            stock = StockData(stock.ticker, stock.source, downsample_ohlcv(stock.df, factor))
     enriched = add_indicators(
         stock.df,
         sma_periods=sma_periods,
         ema_periods=ema_periods,
         rsi_period=rsi_period,
         volatility_window=volatility_window,
+        periods_per_year=bars_per_year(validate_interval(interval)) // factor,
+        # intraday sources keep weeks of bars, not the year a 52-week range needs
+        range_columns=not is_intraday(interval),
     )
+    enriched.attrs["downsample"] = factor
     return stock, enriched
 
 
+def get_ohlcv_since(
+    ticker: str,
+    since: pd.Timestamp,
+    end: Optional[str] = None,
+    source: str = "yahoo",
+    sma_periods: Optional[Sequence[int]] = None,
+    ema_periods: Optional[Sequence[int]] = None,
+    rsi_period: int = 14,
+    volatility_window: int = 20,
+    interval: str = "1d",
+    adjusted: bool = False,
+    deadline: Optional[Deadline] = None,
+    budget: Optional[MemoryBudget] = None,
+    inclusive: bool = False,
+) -> tuple[StockData, pd.DataFrame]:
+    """
+    Bars after since (e.g. the last bar a client already has; inclusive=True keeps a
+    bar at since itself, for re-sending one that may still be forming) with indicator
+    values that match get_ohlcv_with_indicators over the full range: warmup_bars() of
+    history before since are fetched and dropped after computing. Daily bars are
+    compared by date, as sources stamp them at their session's start, not midnight. Drawdown columns
+    (PATH_DEPENDENT_COLUMNS) are left out since they need every earlier bar. Both
+    frames are empty when nothing newer exists yet, without a fetch when since is at
+    or past the end of the range (end's whole day, at most now).
+    """
+    interval = validate_interval(interval)
+    since = pd.Timestamp(since)
+    ticker_clean = validate_ticker(ticker)
+    earliest = earliest_start(source, interval)
+    now = datetime.now()
+    upper = now if end is None else min(now, resolve_date_range(None, end)[1] + timedelta(days=1))
+    if since >= pd.Timestamp(upper):
+        empty = pd.DataFrame(
+            columns=list(OHLCV_COLUMNS), index=pd.DatetimeIndex([], name="date")
+        )
+        return StockData(ticker_clean, source.strip().lower(), empty), empty.copy()
+    bars = warmup_bars(
+        sma_periods, ema_periods, rsi_period, volatility_window,
+        range_window=0 if is_intraday(interval) else TRADING_DAYS_PER_YEAR,
+    )
+    bars_per_session = max(1, bars_per_year(interval) // TRADING_DAYS_PER_YEAR)
+    fetch_start = since - timedelta(days=warmup_days(math.ceil(bars / bars_per_session)))
+    if earliest is not None:
+        fetch_start = max(fetch_start, pd.Timestamp(earliest))
+    stock, enriched = get_ohlcv_with_indicators(
+        ticker,
+        start=fetch_start.strftime("%Y-%m-%d"),
+        end=end,
+        source=source,
+        sma_periods=sma_periods,
+        ema_periods=ema_periods,
+        rsi_period=rsi_period,
+        volatility_window=volatility_window,
+        interval=interval,
+        adjusted=adjusted,
+        deadline=deadline,
+        budget=budget,
+    )
+    # enriched shares stock.df's index
+    if inclusive:
+        mask = stock.df.index >= since
+    elif is_intraday(interval):
+        mask = stock.df.index > since
+    else:
+        # Daily bars are stamped at their session's start instant (e.g. 04:00 UTC for
+        # New York), not midnight, so compare dates: the since day's bar is not new
+        mask = stock.df.index.normalize() > since.normalize()
+    newer = StockData(stock.ticker, stock.source, stock.df[mask])
+    sliced = enriched[mask].drop(columns=list(PATH_DEPENDENT_COLUMNS), errors="ignore")
+    sliced.attrs = dict(enriched.attrs)
+    return newer, sliced
+
+
+def get_many_with_indicators(
+    tickers: Sequence[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = "yahoo",
+    interval: str = "1d",
+    adjusted: bool = False,
+    workers: int = BATCH_WORKERS,
+    deadline: Optional[Deadline] = None,
+    budget: Optional[MemoryBudget] = None,
+) -> tuple[dict[str, tuple[StockData, pd.DataFrame]], dict[str, str]]:
+    """
+    get_ohlcv_with_indicators for several tickers, fetched on a bounded thread pool.
+
+    Returns ({ticker: (StockData, enriched DataFrame)}, {ticker: error message}) in
+    request order; one ticker failing does not fail the batch. Raises ValidationError
+    if the list is empty or longer than BATCH_MAX_TICKERS. All tickers share deadline;
+    ones not fetched in time are reported as errors. A budget is checked up front
+    against the expected bar count (so a rejecting budget fails before any fetch),
+    then split evenly across tickers.
+    """
+    if not tickers:
+        raise ValidationError("At least one ticker is required.")
+    if len(tickers) > BATCH_MAX_TICKERS:
+        raise ValidationError(f"At most {BATCH_MAX_TICKERS} tickers per batch.")
+    interval = validate_interval(interval)
+    names = list(dict.fromkeys(validate_ticker(t) for t in tickers))
+    # Shared inputs fail the whole batch up front rather than once per ticker
+    start_dt, end_dt = resolve_date_range(start, end)
+    if budget is not None:
+        days = (end_dt - start_dt).days + 1
+        expected = math.ceil(days * bars_per_year(interval) / 365) * len(names)
+        budget.admit(expected, indicator_columns(), f"Batch of {len(names)} tickers")
+        budget = budget.share(len(names))
+
+    def one(ticker: str):
+        try:
+            return get_ohlcv_with_indicators(
+                ticker, start=start, end=end, source=source, interval=interval,
+                adjusted=adjusted, deadline=deadline, budget=budget,
+            )
+        except NoKeyFinanceError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as pool:
+        results = list(pool.map(one, names))
+    frames: dict[str, tuple[StockData, pd.DataFrame]] = {}
+    errors: dict[str, str] = {}
+    for ticker, result in zip(names, results):
+        if isinstance(result, Exception):
+            errors[ticker] = str(result)
+        else:
+            frames[ticker] = result
+    return frames, errors
+
+
 def add_indicators_to_stock(
     stock: StockData,
     sma_periods: Optional[Sequence[int]] = None,
@@ -62,3 +282,71 @@ def add_indicators_to_stock(
         rsi_period=rsi_period,
         volatility_window=volatility_window,
     )
+
+
+def iter_ohlcv_with_indicators(
+    ticker: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = "yahoo",
+    chunk_days: int = STREAM_CHUNK_DAYS,
+    sma_periods: Optional[Sequence[int]] = None,
+    ema_periods: Optional[Sequence[int]] = None,
+    rsi_period: int = 14,
+    volatility_window: int = 20,
+    adjusted: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[tuple[StockData, pd.DataFrame]]:
+    """
+    Yield (StockData, enriched DataFrame) chunks newest first, each covering chunk_days.
+
+    Every chunk is fetched with warmup_bars() of extra history before it, so its
+    indicator values line up with the ones from get_ohlcv_with_indicators over the full
+    range; the oldest chunk is seeded at start, exactly like the non-streamed call.
+    Stops early when the source has no older data. Errors on the first chunk propagate.
+    Adjusted chunks share one anchor (today), so they join up like unadjusted ones.
+    Drawdown columns (PATH_DEPENDENT_COLUMNS) need every older bar and are left out.
+    deadline bounds the first chunk; each later chunk gets a renewed one.
+    """
+    start_dt, end_dt = resolve_date_range(start, end)
+    warm = timedelta(days=warmup_days(
+        warmup_bars(sma_periods, ema_periods, rsi_period, volatility_window)
+    ))
+    upper: Optional[pd.Timestamp] = None
+    chunk_end = end_dt
+    while chunk_end >= start_dt:
+        chunk_start = max(start_dt, chunk_end - timedelta(days=chunk_days - 1))
+        fetch_start = max(start_dt, chunk_start - warm)
+        try:
+            stock = get_ohlcv(
+                ticker,
+                start=fetch_start.strftime("%Y-%m-%d"),
+                end=end if upper is None else upper.strftime("%Y-%m-%d"),
+                source=source,
+                adjusted=adjusted,
+                deadline=deadline if upper is None or deadline is None else deadline.renewed(),
+            )
+        except NoDataError:
+            if upper is None:
+                raise
+            _log.info("No older data for %s before %s", ticker, chunk_end.date())
+            return
+        lower = pd.Timestamp(chunk_start.date())
+        # Sources differ on whether end is inclusive, so trim by the previous chunk's start
+        mask = stock.df.index >= lower
+        if upper is not None:
+            mask &= stock.df.index < upper
+        if stock.empty:
+            enriched = stock.df.copy()
+        else:
+            enriched = add_indicators(
+                stock.df,
+                sma_periods=sma_periods,
+                ema_periods=ema_periods,
+                rsi_period=rsi_period,
+                volatility_window=volatility_window,
+            )[mask].drop(columns=list(PATH_DEPENDENT_COLUMNS))
+        chunk = StockData(ticker=stock.ticker, source=stock.source, df=stock.df[mask])
+        yield chunk, enriched
+        upper = lower
+        chunk_end = chunk_start - timedelta(days=1)
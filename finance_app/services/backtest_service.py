@@ -0,0 +1,60 @@
+"""Run parameter-grid backtests on fetched OHLCV."""
+
+from typing import Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from ..models.backtest import BacktestResult, param_grid, run_grid, run_grid_panel
+from ..utils.exceptions import DataSourceError
+from ..utils.logger import get_logger
+from .data_service import get_ohlcv
+
+_log = get_logger(__name__)
+
+
+def backtest_ticker(
+    ticker: str,
+    rule: str,
+    grid: Union[pd.DataFrame, Mapping[str, Sequence[float]]],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = "yahoo",
+    **kwargs,
+) -> BacktestResult:
+    """
+    Fetch OHLCV for one ticker and sweep a parameter grid over its close.
+
+    kwargs are passed to run_grid (cost_bps, keep_equity, workers, periods_per_year).
+    Raises DataSourceError if there is no data for the range.
+    """
+    stock = get_ohlcv(ticker, start=start, end=end, source=source)
+    if stock.empty:
+        raise DataSourceError(f"No data for {stock.ticker} in the selected range.")
+    return run_grid(stock.df["close"], rule, grid, **kwargs)
+
+
+def backtest_universe(
+    tickers: Sequence[str],
+    rule: str,
+    grid: Union[pd.DataFrame, Mapping[str, Sequence[float]]],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = "yahoo",
+    **kwargs,
+) -> dict[str, BacktestResult]:
+    """
+    Sweep the same grid over several tickers. Tickers that fail to fetch are skipped
+    (and logged). Returns ticker -> BacktestResult.
+    """
+    if not isinstance(grid, pd.DataFrame):
+        grid = param_grid(rule, **grid)
+    closes: dict[str, pd.Series] = {}
+    for t in tickers:
+        try:
+            stock = get_ohlcv(t, start=start, end=end, source=source)
+        except DataSourceError as e:
+            _log.warning("Skipping %s in backtest: %s", t, e)
+            continue
+        if not stock.empty:
+            closes[stock.ticker] = stock.df["close"]
+    return run_grid_panel(closes, rule, grid, **kwargs)
@@ -1,40 +1,111 @@
 """Fetch OHLCV data from configured sources."""
 
-from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
 
-from ..config import DEFAULT_LOOKBACK_DAYS, SOURCE_STOOQ, SOURCE_YAHOO
+import pandas as pd
+
+from ..config import (
+    ACTIONS_DIR,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_SECONDS,
+    DEFAULT_LOOKBACK_DAYS,
+    FRAME_MEMO_MAX_ENTRIES,
+    NEGATIVE_CACHE_MAX_ENTRIES,
+    NEGATIVE_CACHE_TTL_SECONDS,
+    OVERLOAD_RETRY_AFTER_SECONDS,
+    SESSION_SETTLE_MINUTES,
+    SOURCE_CONCURRENCY,
+    SOURCE_SLOT_WAIT_SECONDS,
+    SOURCE_STOOQ,
+    SOURCE_YAHOO,
+    STOOQ_USE_STORE,
+    STORE_DIR,
+    UPSTREAM_TIMEOUT_SECONDS,
+)
 from ..data_sources import StooqSource, YahooSource
+from ..models.adjustments import adjust_ohlcv
+from ..models.calendar import calendar_for
+from ..models.symbols import check_symbol
 from ..models.stock import StockData
-from ..utils.exceptions import DataSourceError, ValidationError
+from ..storage.actions import ActionStore
+from ..storage.frame_memo import FrameMemo
+from ..storage.parquet_store import ParquetStore
+from ..utils.exceptions import (
+    DataSourceError,
+    DeadlineExceededError,
+    NoDataError,
+    SourceUnavailableError,
+    ValidationError,
+)
 from ..utils.logger import get_logger
-from ..utils import validate_date_range, validate_ticker
-from ..utils.validators import MAX_DATE_RANGE_DAYS
+from ..utils import validate_date_range, validate_interval, validate_ticker
+from ..utils.validators import MAX_DATE_RANGE_DAYS, is_intraday
 from ..utils.http_cache import install_http_cache
+from ..utils.resilience import CircuitBreaker, ConcurrencyLimiter, Deadline, NegativeCache
 
 _log = get_logger(__name__)
 
 _SOURCES = {
     SOURCE_YAHOO: YahooSource(),
-    SOURCE_STOOQ: StooqSource(),
+    # Ranges covered by ingested archives or a backfill are read from the local store
+    SOURCE_STOOQ: StooqSource(store=ParquetStore(STORE_DIR) if STOOQ_USE_STORE else None),
 }
 
+_NEGATIVE_CACHE = NegativeCache(
+    ttl_seconds=NEGATIVE_CACHE_TTL_SECONDS,
+    max_entries=NEGATIVE_CACHE_MAX_ENTRIES,
+)
 
-def get_ohlcv(
-    ticker: str,
+_ACTIONS = ActionStore(ACTIONS_DIR)
+
+# Frames of ranges whose last session is final, kept until the exchange opens again
+_FRAMES = FrameMemo(max_entries=FRAME_MEMO_MAX_ENTRIES)
+
+_BREAKERS = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+        recovery_seconds=CIRCUIT_RECOVERY_SECONDS,
+    )
+    for name in _SOURCES
+}
+
+
+_SOURCE_LIMITS = {
+    name: ConcurrencyLimiter(name, SOURCE_CONCURRENCY.get(name, 0)) for name in _SOURCES
+}
+
+# Runs upstream calls that have a deadline, so the caller can stop waiting on time.
+# Source limits bound what is in flight, so this pool does not queue in practice.
+_UPSTREAM_POOL = ThreadPoolExecutor(
+    max_workers=max(32, sum(SOURCE_CONCURRENCY.values())), thread_name_prefix="upstream"
+)
+
+
+def source_states() -> dict[str, str]:
+    """Circuit breaker state per source: closed, open or half_open."""
+    return {name: breaker.state for name, breaker in _BREAKERS.items()}
+
+
+def source_load() -> dict[str, dict[str, int]]:
+    """Upstream calls in flight and the concurrency limit per source (0 = unlimited)."""
+    return {
+        name: {"in_flight": lim.in_flight, "limit": lim.limit}
+        for name, lim in _SOURCE_LIMITS.items()
+    }
+
+
+def resolve_date_range(
     start: Optional[str] = None,
     end: Optional[str] = None,
-    source: str = SOURCE_YAHOO,
-) -> StockData:
+) -> tuple[datetime, datetime]:
     """
-    Fetch OHLCV for one ticker and return a StockData instance.
-
-    Dates (YYYY-MM-DD): if both omitted, uses last DEFAULT_LOOKBACK_DAYS; if only
-    start given, from start to today; if only end given, from (end - lookback) to end.
-    source must be 'yahoo' or 'stooq'. Raises ValidationError or DataSourceError on failure.
+    Turn optional YYYY-MM-DD strings into (start_dt, end_dt) using the same defaults
+    as get_ohlcv. Raises ValidationError on bad input or a range over the limit.
     """
-    ticker_clean = validate_ticker(ticker)
-    install_http_cache()
     now = datetime.now()
     if start is not None and end is not None:
         start_dt, end_dt = validate_date_range(
@@ -55,7 +126,179 @@ def get_ohlcv(
         start_dt = end_dt - timedelta(days=DEFAULT_LOOKBACK_DAYS)
     else:
         end_dt = now
-        start_dt = end_dt - timedelta(days=DEFAULT_LOOKBACK_DAYS)
+        # a date, so repeated default requests ask upstream for the same range
+        start_dt = datetime.combine(
+            (end_dt - timedelta(days=DEFAULT_LOOKBACK_DAYS)).date(), time.min
+        )
+    return start_dt, end_dt
+
+
+def earliest_start(source: str, interval: str) -> Optional[datetime]:
+    """Oldest start date get_ohlcv accepts for a source and interval; None = no limit."""
+    lookback = _get_adapter(source).max_lookback_days(validate_interval(interval))
+    if lookback is None:
+        return None
+    earliest = datetime.now() - timedelta(days=lookback)
+    return earliest.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def get_ohlcv(
+    ticker: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: str = SOURCE_YAHOO,
+    interval: str = "1d",
+    adjusted: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> StockData:
+    """
+    Fetch OHLCV for one ticker and return a StockData instance.
+
+    Dates (YYYY-MM-DD): if both omitted, uses last DEFAULT_LOOKBACK_DAYS; if only
+    start given, from start to today; if only end given, from (end - lookback) to end.
+    source must be 'yahoo' or 'stooq'; interval one of SUPPORTED_INTERVALS (intraday
+    ranges are limited to what the source serves, and a default start is clamped to it;
+    an intraday end date includes that day's session, so start=end asks for one day).
+    adjusted=True applies split and dividend adjustments (anchored at today's prices)
+    from the local actions store; only actions since the last check are fetched.
+    With a deadline, upstream calls get HTTP timeouts within it and are abandoned
+    when it passes.
+    For tickers with a known exchange calendar, a range with no trading session
+    raises NoDataError without an upstream call, the end is moved back to the last
+    finished session, and once that session's bars are final the frame is reused
+    until the next session opens.
+    Tickers the symbol directory knows not to exist raise ValidationError before
+    any upstream call.
+    Raises ValidationError or DataSourceError on failure (NoDataError for an empty
+    result, SourceUnavailableError while the source's circuit is open or it is at
+    capacity, DeadlineExceededError when the deadline passes).
+    """
+    ticker_clean = validate_ticker(ticker)
+    check_symbol(ticker_clean)
+    interval = validate_interval(interval)
+    install_http_cache()
+    start_dt, end_dt = resolve_date_range(start, end)
+    if end is not None and is_intraday(interval):
+        end_dt = min(end_dt + timedelta(days=1), datetime.now())
+    adapter = _get_adapter(source)
+    source_normalized = adapter.name
+    if interval not in adapter.intervals:
+        raise ValidationError(
+            f"{source_normalized} does not serve {interval} bars. "
+            f"Use one of {', '.join(adapter.intervals)}."
+        )
+    lookback = adapter.max_lookback_days(interval)
+    if lookback is not None:
+        earliest = datetime.now() - timedelta(days=lookback)
+        if start is None:
+            start_dt = max(start_dt, earliest)
+        day_floor = earliest.replace(hour=0, minute=0, second=0, microsecond=0)
+        if start_dt < day_floor:
+            raise ValidationError(
+                f"{interval} bars are only available for the last {lookback} days."
+            )
+    if start_dt >= end_dt:
+        raise NoDataError(
+            f"No {interval} bars for {ticker_clean} between {start_dt:%Y-%m-%d %H:%M} "
+            f"and {end_dt:%Y-%m-%d %H:%M}."
+        )
+    start_dt, end_dt, last_session, final_until = _session_bounds(
+        adapter, ticker_clean, start_dt, end_dt
+    )
+    key = (source_normalized, ticker_clean, interval, start_dt, end_dt)
+    df = _FRAMES.get(key)
+    if df is None:
+        _log.info(
+            "Fetching %s %s bars from %s for %s to %s",
+            ticker_clean,
+            interval,
+            source_normalized,
+            start_dt.date(),
+            end_dt.date(),
+        )
+        df = _fetch_guarded(adapter, ticker_clean, start_dt, end_dt, interval, deadline)
+        # Only once the source has published the last session's bar
+        if final_until is not None and df.index[-1].date() >= last_session:
+            _FRAMES.put(key, df, final_until.timestamp())
+    else:
+        _log.debug("Reusing %s %s bars from %s until the next session", ticker_clean,
+                   interval, source_normalized)
+    if adjusted and not df.empty and not _fully_adjusted(adapter):
+        events = _load_actions(adapter, ticker_clean, df.index[0].date(), deadline)
+        df = adjust_ohlcv(df, events, skip=adapter.price_adjustments)
+    return StockData(ticker=ticker_clean, source=source_normalized, df=df)
+
+
+def get_corporate_actions(
+    ticker: str,
+    start: Optional[str] = None,
+    source: str = SOURCE_YAHOO,
+    deadline: Optional[Deadline] = None,
+) -> pd.DataFrame:
+    """
+    Dividends and splits with ex-dates from start (default: DEFAULT_LOOKBACK_DAYS ago)
+    through today, with the dividend_factor used for adjustment. Served from the local
+    store, fetching only the uncovered days. Raises ValidationError for a source
+    without action data.
+    """
+    ticker_clean = validate_ticker(ticker)
+    check_symbol(ticker_clean)
+    start_dt, _ = resolve_date_range(start, None)
+    adapter = _get_adapter(source)
+    if _fully_adjusted(adapter):
+        raise ValidationError(
+            f"{adapter.name} serves adjusted prices and does not provide corporate actions."
+        )
+    events = _load_actions(adapter, ticker_clean, start_dt.date(), deadline)
+    return events[events.index >= pd.Timestamp(start_dt.date())]
+
+
+def _session_bounds(
+    adapter, ticker: str, start_dt: datetime, end_dt: datetime
+) -> tuple[datetime, datetime, Optional[date], Optional[datetime]]:
+    """
+    Fit [start_dt, end_dt] to the ticker's exchange sessions. When the range does not
+    end inside a running session, a date-only start moves to the first session and
+    the end back to the last finished one (same bars, a stable upstream request).
+    Returns (start_dt, end_dt, last_session, final_until): final_until is the next
+    session open when the range's bars are already final, else None. Raises
+    NoDataError if no session falls in the range. Unknown calendars leave the range
+    as it is.
+    """
+    cal = calendar_for(ticker)
+    if cal is None:
+        return start_dt, end_dt, None, None
+    now = datetime.now(cal.zone)
+    if adapter.end_inclusive:
+        upper = cal.localize(datetime.combine(end_dt.date() + timedelta(days=1), time.min))
+    else:
+        upper = cal.localize(end_dt)
+    upper = min(upper, now)
+    if cal.in_session(upper):
+        return start_dt, end_dt, None, None
+    last = cal.last_closed(upper)
+    first = cal.next_session(cal.localize(start_dt).date())
+    if first > last:
+        raise NoDataError(
+            f"No {cal.name} trading sessions for {ticker} between "
+            f"{start_dt.date()} and {end_dt.date()}."
+        )
+    if start_dt.time() == time.min:
+        start_dt = datetime.combine(first, time.min)
+    if adapter.end_inclusive:
+        end_dt = datetime.combine(last, time.min)
+    else:
+        # an aware instant: adapters read naive times in differing zones
+        end_dt = cal.session_close(last)
+    if last < cal.last_closed(now):
+        final_until = cal.next_open(now)
+    else:
+        settle = timedelta(minutes=SESSION_SETTLE_MINUTES.get(adapter.name, 0))
+        final_until = cal.quiet_until(now, settle)
+    return start_dt, end_dt, last, final_until
+
+
+def _get_adapter(source: str):
     source_normalized = (
         (source or "").strip().lower() if isinstance(source, str) else ""
     )
@@ -63,13 +306,146 @@ def get_ohlcv(
         raise ValidationError(
             f"Unknown source: {source!r}. Use {SOURCE_YAHOO} or {SOURCE_STOOQ}."
         )
-    adapter = _SOURCES[source_normalized]
-    _log.info(
-        "Fetching %s from %s for %s to %s",
-        ticker_clean,
-        source_normalized,
-        start_dt.date(),
-        end_dt.date(),
+    return _SOURCES[source_normalized]
+
+
+def _fully_adjusted(adapter) -> bool:
+    return {"split", "dividend"} <= set(adapter.price_adjustments)
+
+
+def _load_actions(
+    adapter, ticker: str, start: date, deadline: Optional[Deadline] = None
+) -> pd.DataFrame:
+    """
+    Stored actions for ex-dates from start through today. Fills coverage gaps: older
+    history once, then only the days since the last check. If that incremental check
+    fails, the stored events are used as they are.
+    """
+    today = date.today()
+    cal = calendar_for(ticker)
+    if cal is not None:
+        # no ex-dates fall on weekends or holidays
+        today = cal.previous_session(today)
+    record = _ACTIONS.load(adapter.name, ticker)
+    for lo, hi in record.missing(start, today):
+        lo_dt = datetime.combine(lo, datetime.min.time())
+        hi_dt = datetime.combine(hi, datetime.min.time())
+        try:
+            events = _call_guarded(
+                adapter,
+                lambda timeout: adapter.fetch_actions(ticker, lo_dt, hi_dt, timeout=timeout),
+                deadline,
+            )
+        except DataSourceError as e:
+            stale_ok = record.checked_through is not None and lo >= record.checked_through
+            if not stale_ok:
+                raise
+            _log.warning(
+                "Could not refresh actions for %s since %s; using stored: %s", ticker, lo, e
+            )
+            continue
+        _log.info("Stored %d action(s) for %s from %s to %s", len(events), ticker, lo, hi)
+        record = _ACTIONS.merge(adapter.name, ticker, events, lo, hi)
+    return record.events
+
+
+def _fetch_guarded(
+    adapter,
+    ticker: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    interval: str = "1d",
+    deadline: Optional[Deadline] = None,
+):
+    """
+    Call adapter.fetch behind the negative cache and the source's circuit breaker,
+    unless the adapter has the range locally. "No data" answers are cached briefly and
+    do not count as source failures, so the breaker only sees failures an adapter
+    reports as DataSourceError. YahooSource has yfinance raise transport errors where
+    its version allows (yf.config); with older yfinance an outage looks like an empty
+    result and does not open the circuit.
+    """
+    local = adapter.read_local(ticker, start_dt, end_dt, interval)
+    if local is not None:
+        return local
+    key = (adapter.name, ticker, interval, start_dt.date(), end_dt.date())
+    cached = _NEGATIVE_CACHE.get(key)
+    if cached is not None:
+        raise NoDataError(cached)
+    try:
+        return _call_guarded(
+            adapter,
+            lambda timeout: adapter.fetch(
+                ticker, start_dt, end_dt, interval=interval, timeout=timeout
+            ),
+            deadline,
+        )
+    except NoDataError as e:
+        _NEGATIVE_CACHE.put(key, str(e))
+        raise
+
+
+def _call_guarded(
+    adapter,
+    call: Callable[[Optional[float]], pd.DataFrame],
+    deadline: Optional[Deadline] = None,
+) -> pd.DataFrame:
+    """
+    Run call(timeout) under the source's concurrency limit and circuit breaker. With a
+    deadline the call runs on _UPSTREAM_POOL and is abandoned (not waited for) once
+    the deadline passes; its slot is freed when it actually finishes.
+    """
+    limiter = _SOURCE_LIMITS[adapter.name]
+    wait = SOURCE_SLOT_WAIT_SECONDS
+    if deadline is not None:
+        deadline.check(f"{adapter.name} fetch")
+        wait = deadline.timeout(wait)
+    if not limiter.acquire(wait):
+        raise SourceUnavailableError(
+            f"{adapter.name} is at capacity ({limiter.limit} calls in flight); retry shortly.",
+            retry_after=OVERLOAD_RETRY_AFTER_SECONDS,
+        )
+    breaker = _BREAKERS[adapter.name]
+    if not breaker.allow():
+        limiter.release()
+        retry_after = breaker.retry_after()
+        raise SourceUnavailableError(
+            f"{adapter.name} is temporarily unavailable; retry in {retry_after:.0f}s.",
+            retry_after=retry_after,
+        )
+    if deadline is None:
+        try:
+            return _recorded(breaker, call, None)
+        finally:
+            limiter.release()
+    future = _UPSTREAM_POOL.submit(
+        _recorded, breaker, call, deadline.timeout(UPSTREAM_TIMEOUT_SECONDS)
     )
-    df = adapter.fetch(ticker_clean, start_dt, end_dt)
-    return StockData(ticker=ticker_clean, source=source_normalized, df=df)
+    future.add_done_callback(lambda _: limiter.release())
+    try:
+        return future.result(timeout=deadline.remaining())
+    except FutureTimeoutError:
+        _log.warning("Abandoned %s call after its %gs deadline", adapter.name, deadline.budget)
+        raise DeadlineExceededError(
+            f"{adapter.name} did not answer within the {deadline.budget:g}s deadline."
+        ) from None
+
+
+def _recorded(breaker: CircuitBreaker, call, timeout: Optional[float]) -> pd.DataFrame:
+    """
+    call(timeout), reporting the outcome to the breaker ("no data" is a success). Any
+    other exception releases the call's probe slot so a half-open breaker is not stuck.
+    """
+    try:
+        result = call(timeout)
+    except NoDataError:
+        breaker.record_success()
+        raise
+    except DataSourceError:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return result
@@ -0,0 +1,244 @@
+"""Screen a universe of tickers with an indicator expression, in process-pool chunks."""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence
+
+from ..config import DEFAULT_LOOKBACK_DAYS, SCREEN_CHUNK_SIZE, SCREEN_MAX_UNIVERSE, SCREEN_WORKERS
+from ..models.indicators import add_indicators
+from ..utils.exceptions import DeadlineExceededError, NoKeyFinanceError, ValidationError
+from ..utils.expressions import Expression, parse_expression
+from ..utils.logger import get_logger
+from ..utils.resilience import Deadline
+from ..utils.validators import validate_ticker
+from .data_service import get_ohlcv
+
+_log = get_logger(__name__)
+
+STAGES = ("fetch", "indicators", "evaluate")
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS: int = 0
+
+
+@dataclass
+class ScreenChunk:
+    """Result of screening one chunk of the universe."""
+
+    tickers: list[str]
+    matches: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "scanned": len(self.tickers),
+            "matches": self.matches,
+            "errors": self.errors,
+            "timings": {k: round(v, 4) for k, v in self.timings.items()},
+        }
+
+
+@dataclass
+class ScreenResult:
+    """Aggregated screener output with per-stage timings (seconds)."""
+
+    expression: str
+    scanned: int = 0
+    matches: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def add(self, chunk: ScreenChunk) -> None:
+        self.scanned += len(chunk.tickers)
+        self.matches.extend(chunk.matches)
+        self.errors.extend(chunk.errors)
+        for k, v in chunk.timings.items():
+            self.timings[k] = self.timings.get(k, 0.0) + v
+
+    def to_dict(self) -> dict:
+        return {
+            "expression": self.expression,
+            "scanned": self.scanned,
+            "matches": sorted(self.matches, key=lambda m: m["ticker"]),
+            "errors": self.errors,
+            "timings": {k: round(v, 4) for k, v in self.timings.items()},
+        }
+
+
+def lookback_start(expr: Expression, end: datetime) -> datetime:
+    """Start date giving enough trading bars to warm up the longest period in expr."""
+    # ~252 trading days per 365 calendar days, plus slack for holidays
+    days = math.ceil(_rows_needed(expr) * 365 / 252) + 14
+    return end - timedelta(days=max(DEFAULT_LOOKBACK_DAYS, days))
+
+
+def iter_screen(
+    universe: Sequence[str],
+    expression: str,
+    source: str = "yahoo",
+    chunk_size: int = SCREEN_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[ScreenChunk]:
+    """
+    Screen tickers against expression, yielding each chunk's result as it finishes.
+
+    Chunks run on a shared process pool (workers=0 runs inline). The expression is
+    evaluated on the latest bar of each ticker. Raises ValidationError for a bad
+    expression or universe; per-ticker failures are reported in chunk.errors. When
+    deadline passes, unstarted chunks are cancelled and DeadlineExceededError raised
+    (tickers a running chunk could not reach in time are reported as errors).
+    """
+    expr = parse_expression(expression)
+    tickers, invalid = _clean_universe(universe)
+    if invalid:
+        yield ScreenChunk(tickers=[t for t, _ in invalid], errors=[
+            {"ticker": t, "error": msg} for t, msg in invalid
+        ])
+    if not tickers:
+        return
+    end = datetime.now()
+    start = lookback_start(expr, end)
+    chunk_size = max(1, chunk_size)
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    args = (expr.source, source, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    # Worker processes get a wall-clock expiry, since monotonic clocks are per process
+    expires_at = None if deadline is None else time.time() + deadline.remaining()
+    budget = None if deadline is None else deadline.remaining()
+
+    workers = SCREEN_WORKERS if workers is None else workers
+    if workers <= 0 or len(chunks) == 1:
+        for chunk in chunks:
+            if deadline is not None:
+                deadline.check("screen")
+            yield _screen_chunk(chunk, *args, expires_at)
+        return
+    pool = _get_pool(workers)
+    futures = [pool.submit(_screen_chunk, chunk, *args, expires_at) for chunk in chunks]
+    try:
+        for fut in as_completed(futures, timeout=budget):
+            yield fut.result()
+    except FutureTimeoutError:
+        for fut in futures:
+            fut.cancel()
+        raise DeadlineExceededError(f"screen missed its {deadline.budget:g}s deadline.") from None
+
+
+def screen(
+    universe: Sequence[str],
+    expression: str,
+    source: str = "yahoo",
+    chunk_size: int = SCREEN_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+) -> ScreenResult:
+    """Run iter_screen to completion and aggregate matches, errors and timings."""
+    t0 = time.perf_counter()
+    result = ScreenResult(expression=expression.strip())
+    for chunk in iter_screen(universe, expression, source, chunk_size, workers, deadline):
+        result.add(chunk)
+    result.timings["total"] = time.perf_counter() - t0
+    return result
+
+
+def shutdown_pool() -> None:
+    """Stop the shared screener process pool (e.g. on app shutdown)."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL, _POOL_WORKERS = None, 0
+
+
+def _get_pool(workers: int) -> Executor:
+    """Reuse one process pool across scans so workers keep their warm HTTP cache."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        shutdown_pool()
+        _POOL = ProcessPoolExecutor(max_workers=workers)
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def _clean_universe(universe: Sequence[str]) -> tuple[list[str], list[tuple[str, str]]]:
+    if not universe:
+        raise ValidationError("Universe must contain at least one ticker.")
+    if len(universe) > SCREEN_MAX_UNIVERSE:
+        raise ValidationError(f"Universe must have at most {SCREEN_MAX_UNIVERSE} tickers.")
+    seen: set[str] = set()
+    tickers: list[str] = []
+    invalid: list[tuple[str, str]] = []
+    for raw in universe:
+        try:
+            t = validate_ticker(raw)
+        except ValidationError as e:
+            invalid.append((str(raw), str(e)))
+            continue
+        if t not in seen:
+            seen.add(t)
+            tickers.append(t)
+    return tickers, invalid
+
+
+def _screen_chunk(
+    tickers: list[str],
+    expression: str,
+    source: str,
+    start: str,
+    end: str,
+    expires_at: Optional[float] = None,
+) -> ScreenChunk:
+    """
+    Fetch, enrich and evaluate one chunk; module-level so process pools can pickle it.
+    expires_at is the request deadline as a time.time() value (None = no deadline).
+    """
+    expr = parse_expression(expression)
+    deadline = None if expires_at is None else Deadline(max(0.0, expires_at - time.time()))
+    out = ScreenChunk(tickers=list(tickers), timings={s: 0.0 for s in STAGES})
+    for ticker in tickers:
+        try:
+            t0 = time.perf_counter()
+            stock = get_ohlcv(ticker, start=start, end=end, source=source, deadline=deadline)
+            t1 = time.perf_counter()
+            out.timings["fetch"] += t1 - t0
+            if stock.empty:
+                out.errors.append({"ticker": ticker, "error": "no data"})
+                continue
+            df = add_indicators(
+                stock.df.tail(_rows_needed(expr)),
+                sma_periods=expr.sma_periods,
+                ema_periods=expr.ema_periods,
+            )
+            t2 = time.perf_counter()
+            out.timings["indicators"] += t2 - t1
+            last = df.iloc[-1]
+            hit = bool(expr.evaluate(last))
+            out.timings["evaluate"] += time.perf_counter() - t2
+        except NoKeyFinanceError as e:
+            out.errors.append({"ticker": ticker, "error": str(e)})
+            continue
+        if hit:
+            out.matches.append({
+                "ticker": stock.ticker,
+                "date": str(df.index[-1].date()),
+                "values": {c: _json_float(last[c]) for c in sorted(expr.columns)},
+            })
+    return out
+
+
+def _rows_needed(expr: Expression) -> int:
+    """Bars to keep before computing indicators: longest window plus EMA/RSI settling room."""
+    longest = max(expr.sma_periods + (1,))
+    recursive = max(expr.ema_periods + (14,))
+    return max(longest, recursive * 10, 252)
+
+
+def _json_float(value) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
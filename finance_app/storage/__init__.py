@@ -0,0 +1,7 @@
+"""Local on-disk stores."""
+
+from .actions import ActionRecord, ActionStore
+from .frame_memo import FrameMemo
+from .parquet_store import ParquetStore
+
+__all__ = ["ActionRecord", "ActionStore", "FrameMemo", "ParquetStore"]
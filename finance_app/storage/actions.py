@@ -0,0 +1,147 @@
+"""Per-ticker JSON store of corporate actions (dividends, splits) and their price factors."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ..data_sources.base import ACTION_COLUMNS
+from ..utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+
+def _empty_events() -> pd.DataFrame:
+    return pd.DataFrame(
+        {c: pd.Series(dtype="float64") for c in ACTION_COLUMNS},
+        index=pd.DatetimeIndex([], name="date"),
+    )
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+@dataclass
+class ActionRecord:
+    """
+    Stored actions for one ticker from one source. Events are complete for ex-dates
+    in [covered_from, checked_through]; outside that range nothing is known.
+    """
+
+    ticker: str
+    source: str
+    covered_from: Optional[date] = None
+    checked_through: Optional[date] = None
+    events: Optional[pd.DataFrame] = None
+
+    def __post_init__(self) -> None:
+        if self.events is None:
+            self.events = _empty_events()
+
+    def missing(self, start: date, through: date) -> list[tuple[date, date]]:
+        """Sub-ranges of [start, through] not yet covered, oldest first."""
+        if self.covered_from is None or self.checked_through is None:
+            return [(start, through)]
+        gaps = []
+        if start < self.covered_from:
+            gaps.append((start, self.covered_from))
+        if through > self.checked_through:
+            gaps.append((self.checked_through, through))
+        return gaps
+
+    def to_json(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "source": self.source,
+            "covered_from": self.covered_from.isoformat() if self.covered_from else None,
+            "checked_through": self.checked_through.isoformat() if self.checked_through else None,
+            "events": [
+                {"date": str(d.date()), **{c: float(row[c]) for c in ACTION_COLUMNS}}
+                for d, row in self.events.iterrows()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ActionRecord":
+        events = _empty_events()
+        if data.get("events"):
+            events = pd.DataFrame(data["events"])
+            events.index = pd.DatetimeIndex(pd.to_datetime(events.pop("date")), name="date")
+            events = events[list(ACTION_COLUMNS)].astype("float64")
+        return cls(
+            ticker=data["ticker"],
+            source=data["source"],
+            covered_from=_parse_date(data.get("covered_from")),
+            checked_through=_parse_date(data.get("checked_through")),
+            events=events,
+        )
+
+
+class ActionStore:
+    """
+    Directory of <source>/<TICKER>.json files. merge() folds newly fetched events into
+    a record and widens its coverage, so refreshes only fetch the days since the last
+    check. Writes are atomic (temp file + rename); one lock serializes merges.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, source: str, ticker: str) -> Path:
+        return self.root / source / f"{ticker.upper()}.json"
+
+    def load(self, source: str, ticker: str) -> ActionRecord:
+        """Stored record, or an empty one (no coverage) if absent or unreadable."""
+        path = self.path(source, ticker)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return ActionRecord.from_json(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            _log.warning("Ignoring unreadable actions file %s: %s", path, e)
+        return ActionRecord(ticker=ticker.upper(), source=source)
+
+    def merge(
+        self,
+        source: str,
+        ticker: str,
+        events: pd.DataFrame,
+        start: date,
+        through: date,
+    ) -> ActionRecord:
+        """Add events fetched for ex-dates in [start, through] and persist the record."""
+        with self._lock:
+            record = self.load(source, ticker)
+            lo, hi = pd.Timestamp(start), pd.Timestamp(through)
+            # Fresh data replaces whatever was stored for the fetched range
+            kept = record.events[(record.events.index < lo) | (record.events.index > hi)]
+            fresh = events[list(ACTION_COLUMNS)].astype("float64") if not events.empty else None
+            merged = pd.concat([kept, fresh]) if fresh is not None else kept
+            record.events = merged.sort_index()
+            record.covered_from = min(filter(None, (record.covered_from, start)))
+            record.checked_through = max(filter(None, (record.checked_through, through)))
+            self._write(record)
+            return record
+
+    def _write(self, record: ActionRecord) -> None:
+        path = self.path(record.source, record.ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record.to_json(), f, indent=1)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,52 @@
+"""In-process memo of fetched OHLCV frames, each kept until its own expiry."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import pandas as pd
+
+
+class FrameMemo:
+    """
+    Thread-safe LRU of frames keyed by request. Entries expire at the epoch time given
+    to put() (e.g. the next session open); the least recently used go first when full.
+    get() returns a copy, so callers may modify it.
+    """
+
+    def __init__(self, max_entries: int = 256, clock: Callable[[], float] = time.time) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, pd.DataFrame]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, df = item
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return df.copy()
+
+    def put(self, key: Hashable, df: pd.DataFrame, expires_at: float) -> None:
+        if self.max_entries <= 0 or expires_at <= self._clock():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, df.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
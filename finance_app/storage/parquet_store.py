@@ -0,0 +1,95 @@
+"""Directory of per-ticker Parquet files holding normalized OHLCV (needs pyarrow)."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ..data_sources.base import OHLCV_COLUMNS
+from ..utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class ParquetStore:
+    """
+    OHLCV frames laid out as <root>/<source>/<interval>/<TICKER>.parquet, each with the
+    DatetimeIndex "date" and the normalized OHLCV columns. write() merges with what is
+    already stored (new rows win on equal timestamps) and replaces the file atomically,
+    so readers never see a partial file.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, source: str, ticker: str, interval: str = "1d") -> Path:
+        return self.root / source / interval / f"{ticker.upper()}.parquet"
+
+    def has(self, source: str, ticker: str, interval: str = "1d") -> bool:
+        return self.path(source, ticker, interval).is_file()
+
+    def tickers(self, source: str, interval: str = "1d") -> list[str]:
+        """Stored tickers for a source and interval, sorted."""
+        folder = self.root / source / interval
+        if not folder.is_dir():
+            return []
+        return sorted(p.stem for p in folder.glob("*.parquet"))
+
+    def read(
+        self,
+        source: str,
+        ticker: str,
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """Stored bars in [start, end] (either bound optional); empty frame if none."""
+        path = self.path(source, ticker, interval)
+        if not path.is_file():
+            return pd.DataFrame(
+                columns=list(OHLCV_COLUMNS), index=pd.DatetimeIndex([], name="date")
+            )
+        filters = []
+        if start is not None:
+            filters.append(("date", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("date", "<=", pd.Timestamp(end)))
+        return pd.read_parquet(path, filters=filters or None)
+
+    def write(
+        self,
+        source: str,
+        ticker: str,
+        df: pd.DataFrame,
+        interval: str = "1d",
+        merge: bool = True,
+    ) -> int:
+        """
+        Merge df into the stored frame (merge=False replaces it) and persist it; returns
+        the stored row count.
+        """
+        path = self.path(source, ticker, interval)
+        with self._lock:
+            if merge and path.is_file():
+                old = pd.read_parquet(path)
+                df = pd.concat([old, df])
+                df = df[~df.index.duplicated(keep="last")]
+            df = df[list(OHLCV_COLUMNS)].sort_index()
+            df.index.name = "date"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            os.close(fd)
+            try:
+                df.to_parquet(tmp, compression="zstd")
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        _log.debug("Stored %d rows for %s/%s/%s", len(df), source, interval, ticker)
+        return len(df)
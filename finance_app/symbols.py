@@ -0,0 +1,127 @@
+"""
+Refresh the local symbol directory from the Nasdaq Trader symbol lists.
+
+  python -m finance_app.symbols
+  python -m finance_app.symbols --from-dir ./symdir --out .cache/symbols.csv
+
+Downloads nasdaqlisted.txt and otherlisted.txt (every Nasdaq, NYSE, NYSE American,
+NYSE Arca and Cboe listing) or reads them from --from-dir, converts the symbols to
+Yahoo form (BRK.B -> BRK-B, ABR$D -> ABR-PD), keeps the bundled non-US rows and writes
+the file the app loads (--out, default NOKEYFINANCE_SYMBOLS_FILE or .cache/symbols.csv).
+The file marks the US listing as complete, so unknown US tickers are then rejected
+without an upstream call. Running servers pick it up on restart.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import requests
+
+from .config import (
+    BUNDLED_SYMBOLS_FILE,
+    SYMBOLS_FILE,
+    SYMBOLS_REFRESH_URLS,
+    UPSTREAM_TIMEOUT_SECONDS,
+)
+from .models.symbols import Symbol, SymbolDirectory, market, write_symbols
+from .utils.exceptions import DataSourceError
+from .utils.validators import MAX_TICKER_LENGTH
+
+# otherlisted.txt exchange codes -> MIC; nasdaqlisted.txt is all XNAS
+OTHER_EXCHANGES: dict[str, str] = {
+    "A": "XASE",
+    "N": "XNYS",
+    "P": "ARCX",
+    "Z": "BATS",
+    "V": "IEXG",
+}
+
+# CQS/ACT suffix conventions -> Yahoo's, applied in order
+_YAHOO_FORMS: tuple[tuple[str, str], ...] = ((".WS", "-WT"), ("$", "-P"), (".", "-"))
+
+
+def yahoo_symbol(symbol: str) -> Optional[str]:
+    """Yahoo spelling of a Nasdaq Trader symbol, or None for forms Yahoo does not use."""
+    out = symbol.strip().upper()
+    for old, new in _YAHOO_FORMS:
+        out = out.replace(old, new)
+    if not out or len(out) > MAX_TICKER_LENGTH or not out.replace("-", "").isalnum():
+        return None
+    return out
+
+
+def parse_listing(text: str, symbol_column: str, exchange: Optional[str] = None) -> list[Symbol]:
+    """
+    Rows of one pipe-delimited Nasdaq Trader file, minus test issues and the trailing
+    "File Creation Time" line. exchange=None reads the Exchange column.
+    """
+    df = pd.read_csv(io.StringIO(text), sep="|", dtype=str, keep_default_na=False)
+    df = df[~df[symbol_column].str.startswith("File Creation Time")]
+    if "Test Issue" in df:
+        df = df[df["Test Issue"] != "Y"]
+    out = []
+    for values in df.to_dict("records"):
+        symbol = yahoo_symbol(values[symbol_column])
+        if symbol is None:
+            continue
+        mic = exchange or OTHER_EXCHANGES.get(values.get("Exchange", ""), "")
+        # "Apple Inc. - Common Stock" -> "Apple Inc."
+        name = values["Security Name"].split(" - ", 1)[0].strip()
+        out.append(Symbol(symbol=symbol, name=name, exchange=mic, stooq=f"{symbol}.US"))
+    return out
+
+
+def _read(name: str, url: str, from_dir: Optional[Path]) -> str:
+    if from_dir is not None:
+        return (from_dir / name).read_text(encoding="utf-8")
+    try:
+        r = requests.get(url, timeout=UPSTREAM_TIMEOUT_SECONDS)
+        r.raise_for_status()
+    except requests.RequestException as e:
+        raise DataSourceError(f"Could not download {url}: {e}") from e
+    return r.text
+
+
+def refresh_symbols(
+    out: Path = SYMBOLS_FILE,
+    from_dir: Optional[Path] = None,
+    base: Path = BUNDLED_SYMBOLS_FILE,
+) -> int:
+    """
+    Write a directory with every US listing plus base's other markets; returns the row
+    count. Raises DataSourceError if a list cannot be downloaded.
+    """
+    nasdaq_url, other_url = SYMBOLS_REFRESH_URLS
+    listed = parse_listing(_read("nasdaqlisted.txt", nasdaq_url, from_dir), "Symbol", "XNAS")
+    listed += parse_listing(_read("otherlisted.txt", other_url, from_dir), "ACT Symbol")
+    if not listed:
+        raise DataSourceError("The Nasdaq Trader symbol lists were empty.")
+    # Nasdaq's own list wins for symbols in both files
+    rows = {s.symbol: s for s in reversed(listed)}
+    for s in SymbolDirectory.load(base):
+        if market(s.symbol) != "US":
+            rows.setdefault(s.symbol, s)
+    return write_symbols(out, rows.values(), complete=["US"])
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Refresh the local symbol directory.")
+    parser.add_argument("--out", type=Path, default=SYMBOLS_FILE)
+    parser.add_argument("--from-dir", type=Path, default=None,
+                        help="read nasdaqlisted.txt/otherlisted.txt from here instead")
+    args = parser.parse_args(argv)
+    try:
+        count = refresh_symbols(args.out, args.from_dir)
+    except (DataSourceError, OSError) as e:
+        print(f"refresh failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"wrote {count} symbols to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
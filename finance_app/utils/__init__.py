@@ -2,19 +2,28 @@
 
 from .exceptions import (
     DataSourceError,
+    DeadlineExceededError,
     IndicatorError,
+    MemoryBudgetError,
+    NoDataError,
     NoKeyFinanceError,
+    SourceUnavailableError,
     ValidationError,
 )
 from .logger import get_logger
-from .validators import validate_date_range, validate_ticker
+from .validators import validate_date_range, validate_interval, validate_ticker
 
 __all__ = [
     "DataSourceError",
+    "DeadlineExceededError",
     "IndicatorError",
+    "MemoryBudgetError",
+    "NoDataError",
     "NoKeyFinanceError",
+    "SourceUnavailableError",
     "ValidationError",
     "get_logger",
     "validate_date_range",
+    "validate_interval",
     "validate_ticker",
 ]
@@ -0,0 +1,108 @@
+"""Arrow IPC and Parquet encoding of OHLCV frames (needs pyarrow, imported lazily)."""
+
+from __future__ import annotations
+
+import json
+from typing import Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import ValidationError
+
+BINARY_FORMATS: tuple[str, ...] = ("arrow", "parquet")
+MEDIA_TYPES: dict[str, str] = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Schema metadata key holding ticker/source/interval details as JSON
+METADATA_KEY = b"nokeyfinance"
+
+
+def validate_format(fmt: str) -> str:
+    """Normalize a binary format name; raises ValidationError if unsupported."""
+    fmt = (fmt or "").strip().lower()
+    if fmt not in BINARY_FORMATS:
+        raise ValidationError(
+            f"Unsupported format: {fmt!r}. Use one of {', '.join(BINARY_FORMATS)}."
+        )
+    return fmt
+
+
+def encode_frames(
+    frames: Union[pd.DataFrame, Mapping[str, pd.DataFrame]],
+    fmt: str,
+    metadata: Optional[dict] = None,
+) -> bytes:
+    """
+    Serialize one frame, or several keyed by ticker, to Arrow IPC stream or Parquet bytes.
+
+    Columns are converted without copying where Arrow allows (numeric, no object
+    dtype) and the DatetimeIndex is kept via pandas schema metadata. Several frames
+    become one long table with a dictionary-encoded "ticker" column. metadata is
+    stored as JSON under the schema key "nokeyfinance".
+    """
+    fmt = validate_format(fmt)
+    pa = _pyarrow()
+    table = _to_table(pa, frames)
+    if metadata:
+        schema_meta = dict(table.schema.metadata or {})
+        schema_meta[METADATA_KEY] = json.dumps(metadata, default=str).encode()
+        table = table.replace_schema_metadata(schema_meta)
+    sink = pa.BufferOutputStream()
+    if fmt == "arrow":
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+
+def decode_frame(data: bytes, fmt: str) -> tuple[pd.DataFrame, dict]:
+    """Inverse of encode_frames: (DataFrame with its DatetimeIndex, metadata dict)."""
+    fmt = validate_format(fmt)
+    pa = _pyarrow()
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+    else:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(pa.BufferReader(data))
+    raw = (table.schema.metadata or {}).get(METADATA_KEY)
+    return table.to_pandas(), json.loads(raw) if raw else {}
+
+
+def binary_formats_available() -> bool:
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def _to_table(pa, frames):
+    if isinstance(frames, pd.DataFrame):
+        return pa.Table.from_pandas(frames, preserve_index=True)
+    tables = []
+    for ticker, df in frames.items():
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        ticker_col = pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(table.num_rows, dtype=np.int32)), pa.array([ticker])
+        )
+        tables.append(table.add_column(0, "ticker", ticker_col))
+    if not tables:
+        return pa.table({"ticker": pa.array([], type=pa.dictionary(pa.int32(), pa.string()))})
+    # Frames may differ in indicator columns; missing ones become nulls
+    return pa.concat_tables(tables, promote_options="default").unify_dictionaries()
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Arrow/Parquet output requires pyarrow (pip install pyarrow).") from e
+    return pa
@@ -23,3 +23,35 @@ class IndicatorError(NoKeyFinanceError):
     """Raised when indicator computation fails."""
 
     pass
+
+
+class NoDataError(DataSourceError):
+    """Raised when a source has no data for a ticker/range (the source itself is healthy)."""
+
+    pass
+
+
+class SourceUnavailableError(DataSourceError):
+    """
+    Raised without calling upstream while a source's circuit breaker is open or all
+    its concurrency slots are taken.
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(DataSourceError):
+    """Raised when a request's deadline passes before upstream answers; the work is abandoned."""
+
+    pass
+
+
+class MemoryBudgetError(ValidationError):
+    """Raised when a request's estimated memory exceeds the budget and rejection is configured."""
+
+    def __init__(self, message: str, estimate: int = 0, budget: int = 0) -> None:
+        super().__init__(message)
+        self.estimate = estimate
+        self.budget = budget
@@ -0,0 +1,169 @@
+"""Small, safe expression language over indicator columns (used by the screener)."""
+
+from __future__ import annotations
+
+import ast
+import operator
+import re
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+import numpy as np
+
+from ..models.indicators import MAX_INDICATOR_PERIOD
+from .exceptions import ValidationError
+
+MAX_EXPRESSION_LENGTH: int = 500
+
+# Column names an expression may reference; sma_<n> / ema_<n> are matched separately
+BASE_COLUMNS = frozenset(
+    {
+        "open", "high", "low", "close", "volume", "rsi", "returns", "volatility",
+        "high_52w", "low_52w", "pct_from_high", "drawdown", "max_drawdown",
+        "donchian_upper", "donchian_lower", "donchian_mid",
+    }
+)
+_PERIOD_COLUMN = re.compile(r"^(sma|ema)_(\d{1,3})$")
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+@dataclass(frozen=True)
+class Expression:
+    """
+    A parsed screening expression such as "rsi < 30 and close > sma_200".
+
+    Supports comparisons (chained too), and/or/not, + - * /, parentheses and numbers.
+    evaluate() accepts scalars or aligned Series/arrays (element-wise result).
+    """
+
+    source: str
+    tree: ast.Expression = field(repr=False, compare=False)
+    columns: frozenset = frozenset()
+
+    @property
+    def sma_periods(self) -> tuple[int, ...]:
+        return self._periods("sma")
+
+    @property
+    def ema_periods(self) -> tuple[int, ...]:
+        return self._periods("ema")
+
+    def _periods(self, kind: str) -> tuple[int, ...]:
+        found = (_PERIOD_COLUMN.match(c) for c in self.columns)
+        return tuple(sorted(int(m.group(2)) for m in found if m and m.group(1) == kind))
+
+    def evaluate(self, values: Mapping[str, Any]) -> Any:
+        """
+        Evaluate against a mapping of column -> value (e.g. the last row of a DataFrame).
+        Raises ValidationError when the arithmetic fails on these values (e.g. 1 / 0);
+        NumPy values divide to inf/nan instead, which compare as False.
+        """
+        try:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _eval(self.tree.body, values)
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ValidationError(f"Could not evaluate {self.source!r}: {e}") from e
+
+
+def parse_expression(text: str) -> Expression:
+    """
+    Parse and validate a screening expression. Raises ValidationError on syntax
+    errors, unknown columns or disallowed constructs (calls, attributes, etc.).
+    """
+    if not text or not isinstance(text, str) or not text.strip():
+        raise ValidationError("Expression must be a non-empty string.")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValidationError(f"Expression must be at most {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValidationError(f"Invalid expression: {e.msg}") from e
+    columns: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            name = node.id.lower()
+            if name not in BASE_COLUMNS and not _PERIOD_COLUMN.match(name):
+                raise ValidationError(
+                    f"Unknown column {node.id!r}. Use {sorted(BASE_COLUMNS)}, sma_<n> or ema_<n>."
+                )
+            columns.add(name)
+        elif not isinstance(
+            node,
+            (
+                ast.Expression,
+                ast.BoolOp,
+                ast.And,
+                ast.Or,
+                ast.UnaryOp,
+                ast.Not,
+                ast.USub,
+                ast.UAdd,
+                ast.BinOp,
+                ast.Compare,
+                ast.Constant,
+                ast.Load,
+                *_COMPARE,
+                *_BINARY,
+            ),
+        ):
+            raise ValidationError(f"Unsupported syntax in expression: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValidationError("Only numeric constants are allowed in expressions.")
+        if (
+            isinstance(node, ast.BinOp)
+            and isinstance(node.op, ast.Div)
+            and isinstance(node.right, ast.Constant)
+            and node.right.value == 0
+        ):
+            raise ValidationError("Division by zero in expression.")
+    for m in filter(None, (_PERIOD_COLUMN.match(c) for c in columns)):
+        if not 1 <= int(m.group(2)) <= MAX_INDICATOR_PERIOD:
+            raise ValidationError(
+                f"Period must be between 1 and {MAX_INDICATOR_PERIOD} in {m.group(0)!r}."
+            )
+    return Expression(source=text.strip(), tree=tree, columns=frozenset(columns))
+
+
+def _eval(node: ast.AST, values: Mapping[str, Any]) -> Any:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return values[node.id.lower()]
+    if isinstance(node, ast.BoolOp):
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        result = _eval(node.values[0], values)
+        for v in node.values[1:]:
+            result = combine(result, _eval(v, values))
+        return result
+    if isinstance(node, ast.UnaryOp):
+        operand = _eval(node.operand, values)
+        if isinstance(node.op, ast.Not):
+            return np.logical_not(operand)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp):
+        return _BINARY[type(node.op)](_eval(node.left, values), _eval(node.right, values))
+    if isinstance(node, ast.Compare):
+        left = _eval(node.left, values)
+        result = True
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _eval(comparator, values)
+            result = np.logical_and(result, _COMPARE[type(op)](left, right))
+            left = right
+        return result
+    raise ValidationError(f"Unsupported syntax in expression: {type(node).__name__}")
@@ -1,33 +1,347 @@
-"""HTTP caching helpers (optional)."""
+"""
+HTTP caching helpers (optional): a requests-cache SQLite store in WAL mode with
+per-source TTLs, a size cap enforced by LRU pruning and background compaction.
+
+requests-cache only sees traffic sent through requests: Stooq (pandas_datareader),
+the fake upstream's Yahoo chart endpoint and the symbol refresh. yfinance 1.x uses
+curl_cffi and refuses caching sessions, so real Yahoo calls bypass it.
+"""
 
 from __future__ import annotations
 
 import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
 
-from ..config import CACHE_DIR, CACHE_ENABLED, CACHE_TTL_SECONDS
+from ..config import (
+    CACHE_BUSY_TIMEOUT_MS,
+    CACHE_DIR,
+    CACHE_ENABLED,
+    CACHE_MAINTENANCE_SECONDS,
+    CACHE_MAX_BYTES,
+    CACHE_SETTLE_DAYS,
+    CACHE_SOURCE_TTLS,
+    CACHE_STALE_SECONDS,
+    CACHE_TTL_SECONDS,
+    SESSION_SETTLE_MINUTES,
+)
+from ..models.calendar import calendar_for
 from .logger import get_logger
 
+try:
+    import fcntl
+except ImportError:  # Windows: maintenance runs without the cross-process lock
+    fcntl = None
+
 _log = get_logger(__name__)
 
 _INSTALLED: bool = False
+_MANAGER: Optional["HttpCacheManager"] = None
+
+# Pruning stops once content is back under this share of max_bytes, so a full cache
+# is not pruned again on the next pass
+PRUNE_TARGET_RATIO: float = 0.8
+# VACUUM once free pages make up this share of the file (and at least 1 MB)
+COMPACT_FREE_RATIO: float = 0.25
+COMPACT_MIN_FREE_BYTES: int = 1024 * 1024
+
+
+def _source_of(path: str) -> Optional[str]:
+    if path.rstrip("/").endswith("/q/d/l"):
+        return "stooq"
+    return None
+
+
+def _range_end(query: dict[str, str]) -> Optional[datetime]:
+    """End of the requested Stooq range (UTC) from the query, if it has one."""
+    try:
+        if "d2" in query:
+            return datetime.strptime(query["d2"], "%Y%m%d").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def cache_ttl(
+    url: str, params: Any = None, now: Optional[datetime] = None
+) -> Optional[int]:
+    """
+    Seconds to keep a Stooq bar response for url (+ params): the historical TTL for
+    ranges ending over CACHE_SETTLE_DAYS ago; for recent ranges, until the next
+    session opens while the ticker's exchange is closed and its last session's bars
+    are final, else the live TTL (today's bars still change). None (the default TTL)
+    for other requests.
+    """
+    parts = urlsplit(url)
+    source = _source_of(parts.path)
+    if source is None or source not in CACHE_SOURCE_TTLS:
+        return None
+    query = dict(parse_qsl(parts.query))
+    if isinstance(params, dict):
+        query.update({str(k): str(v) for k, v in params.items()})
+    live, historical = CACHE_SOURCE_TTLS[source]
+    now = now or datetime.now(timezone.utc)
+    end = _range_end(query)
+    if end is not None and (now - end).total_seconds() > CACHE_SETTLE_DAYS * 86400:
+        return historical
+    cal = calendar_for(query.get("s", ""))
+    if cal is not None:
+        settle = timedelta(minutes=SESSION_SETTLE_MINUTES.get(source, 0))
+        reopens = cal.quiet_until(now, settle)
+        if reopens is not None:
+            return max(live, int((reopens - now).total_seconds()))
+    return live
+
+
+class HttpCacheManager:
+    """
+    Keeps the SQLite cache bounded: drops responses expired for longer than
+    stale_seconds (kept until then for stale_if_error), then least recently used ones
+    while stored content exceeds max_bytes, and VACUUMs once enough pages are free.
+    Uvicorn workers share the file; a lock file lets one of them maintain it at a time.
+    Hits and last use are counted per process in memory and flushed on maintenance.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_bytes: int = CACHE_MAX_BYTES,
+        stale_seconds: float = CACHE_STALE_SECONDS,
+        busy_timeout_ms: int = CACHE_BUSY_TIMEOUT_MS,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.stale_seconds = stale_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._hits = 0
+        self._misses = 0
+        self._pruned = 0
+        self._compactions = 0
+        self._last_maintenance: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout_ms / 1000, isolation_level=None
+        )
+        con.execute("CREATE TABLE IF NOT EXISTS access (key TEXT PRIMARY KEY, used REAL)")
+        return con
+
+    def record(self, response: Any) -> None:
+        """Count a response as a hit or miss and note when its entry was last used."""
+        key = getattr(response, "cache_key", None)
+        with self._lock:
+            if getattr(response, "from_cache", False):
+                self._hits += 1
+            else:
+                self._misses += 1
+            if key:
+                self._touched[key] = time.time()
+
+    def _flush(self, con: sqlite3.Connection) -> None:
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            con.executemany(
+                "INSERT INTO access (key, used) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET used = max(used, excluded.used)",
+                touched.items(),
+            )
+
+    def prune(self, con: Optional[sqlite3.Connection] = None) -> int:
+        """Delete long-expired, then least recently used responses; returns how many."""
+        own = con is None
+        con = con or self._connect()
+        try:
+            self._flush(con)
+            con.execute("BEGIN IMMEDIATE")
+            removed = con.execute(
+                "DELETE FROM responses WHERE expires IS NOT NULL AND expires < ?",
+                (time.time() - self.stale_seconds,),
+            ).rowcount
+            total = con.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()[0]
+            if self.max_bytes > 0 and total > self.max_bytes:
+                target = int(self.max_bytes * PRUNE_TARGET_RATIO)
+                victims = []
+                rows = con.execute(
+                    "SELECT r.key, LENGTH(r.value) FROM responses r "
+                    "LEFT JOIN access a ON a.key = r.key "
+                    "ORDER BY COALESCE(a.used, 0), r.expires"
+                )
+                for key, size in rows:
+                    if total <= target:
+                        break
+                    victims.append((key,))
+                    total -= size or 0
+                con.executemany("DELETE FROM responses WHERE key = ?", victims)
+                removed += len(victims)
+            con.execute("DELETE FROM access WHERE key NOT IN (SELECT key FROM responses)")
+            con.execute("COMMIT")
+        except BaseException:
+            if con.in_transaction:
+                con.execute("ROLLBACK")
+            raise
+        finally:
+            if own:
+                con.close()
+        with self._lock:
+            self._pruned += removed
+        if removed:
+            _log.info("HTTP cache pruned %d response(s)", removed)
+        return removed
+
+    def compact(self, con: Optional[sqlite3.Connection] = None, force: bool = False) -> bool:
+        """
+        Fold the WAL back into the database and VACUUM if free pages are worth it
+        (or force=True); returns True if it vacuumed.
+        """
+        own = con is None
+        con = con or self._connect()
+        try:
+            page_size = con.execute("PRAGMA page_size").fetchone()[0]
+            pages = con.execute("PRAGMA page_count").fetchone()[0]
+            free = con.execute("PRAGMA freelist_count").fetchone()[0]
+            vacuum = force or (
+                free * page_size >= COMPACT_MIN_FREE_BYTES
+                and free >= pages * COMPACT_FREE_RATIO
+            )
+            if vacuum:
+                con.execute("VACUUM")
+                with self._lock:
+                    self._compactions += 1
+                _log.info("HTTP cache compacted (%.1f MB free)", free * page_size / 1024 / 1024)
+            con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return vacuum
+        finally:
+            if own:
+                con.close()
+
+    def maintain(self) -> bool:
+        """
+        Prune and compact unless another process is already doing it; returns False
+        when skipped.
+        """
+        lock_path = self.db_path.with_name(self.db_path.name + ".lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return False
+            try:
+                con = self._connect()
+                try:
+                    self.prune(con)
+                    self.compact(con)
+                finally:
+                    con.close()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self._last_maintenance = time.time()
+        return True
+
+    def start(self, interval: float = CACHE_MAINTENANCE_SECONDS) -> None:
+        """Run maintain() every interval seconds on a daemon thread (interval <= 0 = never)."""
+        if interval <= 0 or self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.maintain()
+                except sqlite3.Error as e:
+                    _log.warning("HTTP cache maintenance failed: %s", e)
+
+        self._thread = threading.Thread(target=run, name="http-cache-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict:
+        """Entries, content and file bytes, this process's hits/misses and prune counts."""
+        con = self._connect()
+        try:
+            entries, content = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()
+        finally:
+            con.close()
+        file_bytes = sum(
+            p.stat().st_size
+            for p in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal"))
+            if p.exists()
+        )
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": True,
+                "path": str(self.db_path),
+                "entries": entries,
+                "bytes": content,
+                "file_bytes": file_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "pruned": self._pruned,
+                "compactions": self._compactions,
+                "last_maintenance": (
+                    datetime.fromtimestamp(self._last_maintenance, tz=timezone.utc).isoformat()
+                    if self._last_maintenance
+                    else None
+                ),
+            }
+
+
+def _session_factory(requests_cache: Any) -> type:
+    class ManagedCachedSession(requests_cache.CachedSession):
+        """CachedSession that picks each request's TTL with cache_ttl and reports to the manager."""
+
+        def request(
+            self, method: str, url: str, *args: Any, expire_after: Any = None, **kwargs: Any
+        ):
+            if expire_after is None:
+                expire_after = cache_ttl(url, kwargs.get("params"))
+            response = super().request(method, url, *args, expire_after=expire_after, **kwargs)
+            if _MANAGER is not None:
+                _MANAGER.record(response)
+            return response
+
+    return ManagedCachedSession
 
 
 def install_http_cache(
     cache_dir: Optional[Path] = None,
     enabled: Optional[bool] = None,
     ttl_seconds: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    maintenance_seconds: Optional[float] = None,
 ) -> None:
     """
     Enable a local HTTP cache using requests-cache.
 
     This speeds up repeated lookups and reduces upstream requests. If requests-cache
-    is not installed, this is a no-op.
+    is not installed, this is a no-op. Stooq bar requests get range-based TTLs
+    (see cache_ttl; ttl_seconds applies to everything else, including the fake
+    upstream's Yahoo endpoint). yfinance's own requests are not cached. The SQLite file runs in
+    WAL mode so workers read while one writes, and a background thread keeps it
+    under max_bytes every maintenance_seconds.
 
     Can be disabled by setting env var NOKEYFINANCE_CACHE=0.
     """
-    global _INSTALLED
+    global _INSTALLED, _MANAGER
     if _INSTALLED:
         return
 
@@ -43,6 +357,7 @@ def install_http_cache(
         return
 
     ttl_seconds = CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
     cache_dir = CACHE_DIR if cache_dir is None else cache_dir
     cache_dir.mkdir(parents=True, exist_ok=True)
     cache_path = cache_dir / "http_cache"
@@ -54,13 +369,35 @@ def install_http_cache(
         _INSTALLED = True
         return
 
-    # Cache GETs in a local SQLite DB
+    # Cache GETs in a local SQLite DB; WAL lets readers proceed while a worker writes
+    backend = requests_cache.SQLiteCache(
+        cache_path, wal=True, busy_timeout=CACHE_BUSY_TIMEOUT_MS
+    )
     requests_cache.install_cache(
-        cache_name=str(cache_path),
-        backend="sqlite",
+        backend=backend,
+        session_factory=_session_factory(requests_cache),
         expire_after=ttl_seconds,
         allowable_methods=("GET",),
         stale_if_error=True,
     )
-    _log.info("HTTP cache enabled (ttl=%ss, path=%s)", ttl_seconds, cache_path)
+    _MANAGER = HttpCacheManager(Path(str(backend.db_path)), max_bytes=max_bytes)
+    if maintenance_seconds is None:
+        maintenance_seconds = CACHE_MAINTENANCE_SECONDS
+    _MANAGER.start(maintenance_seconds)
+    _log.info(
+        "HTTP cache enabled (ttl=%ss, max=%.0f MB, path=%s)",
+        ttl_seconds,
+        max_bytes / 1024 / 1024,
+        backend.db_path,
+    )
     _INSTALLED = True
+
+
+def http_cache_stats() -> dict:
+    """Stats of the installed cache, or {"enabled": False}."""
+    if _MANAGER is None:
+        return {"enabled": False}
+    try:
+        return _MANAGER.stats()
+    except sqlite3.Error as e:
+        return {"enabled": True, "error": str(e)}
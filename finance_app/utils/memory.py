@@ -0,0 +1,171 @@
+"""
+Per-request memory accounting: a rows x columns cost estimate used to admit,
+downsample or reject work before it is computed, and optional tracemalloc peaks.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
+
+from .exceptions import MemoryBudgetError
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+# float64/int64 cell
+BYTES_PER_VALUE = 8
+# Full-width frames alive at once while computing: the fetched bars, add_indicators'
+# copy and the sliced/reset output
+FRAME_COPIES = 3
+# A cell turned into a JSON record: Python float/str object plus its dict slot
+JSON_BYTES_PER_VALUE = 120
+
+MB = 1024 * 1024
+
+
+def indicator_columns(sma_count: int = 2, ema_count: int = 2) -> int:
+    """
+    Columns of an add_indicators frame: OHLCV, sma_*/ema_*, rsi, returns, volatility,
+    the 52-week range (3), drawdowns (2) and the Donchian channel (3).
+    """
+    return 5 + sma_count + ema_count + 3 + 8
+
+
+def estimate_bytes(rows: int, columns: int, fmt: str = "json") -> int:
+    """
+    Approximate peak bytes to compute and serialize rows x columns: FRAME_COPIES numeric
+    copies plus the response (JSON records cost far more per cell than Arrow/Parquet).
+    """
+    numeric = rows * columns * BYTES_PER_VALUE * FRAME_COPIES
+    per_cell = JSON_BYTES_PER_VALUE if fmt == "json" else BYTES_PER_VALUE
+    return numeric + rows * (columns + 1) * per_cell
+
+
+@dataclass(frozen=True)
+class MemoryBudget:
+    """
+    Bytes one request may use, what to do when its estimate is over (downsample or
+    reject) and the response format the estimate assumes. Passed down like a Deadline.
+    """
+
+    limit: int
+    action: str = "downsample"
+    fmt: str = "json"
+
+    def admit(self, rows: int, columns: int, what: str = "request") -> int:
+        """
+        Downsample factor for rows x columns: 1 when the estimate fits (or limit <= 0),
+        otherwise the number of bars to merge per output row to get under the limit.
+        With action="reject", raises MemoryBudgetError instead.
+        """
+        estimate = estimate_bytes(rows, columns, self.fmt)
+        if self.limit <= 0 or estimate <= self.limit:
+            return 1
+        if self.action == "reject":
+            raise MemoryBudgetError(
+                f"{what} needs about {estimate / MB:.0f} MB, over the {self.limit / MB:.0f} MB "
+                "memory budget. Narrow the date range or use a coarser interval.",
+                estimate=estimate,
+                budget=self.limit,
+            )
+        return math.ceil(estimate / self.limit)
+
+    def share(self, parts: int) -> "MemoryBudget":
+        """An equal slice of this budget, e.g. per ticker of a batch."""
+        return replace(self, limit=self.limit // max(1, parts))
+
+
+@dataclass
+class MemoryUsage:
+    """Result of measure_memory: peak_bytes is None when tracing is off."""
+
+    label: str
+    peak_bytes: Optional[int] = None
+
+
+class MemoryMetrics:
+    """Thread-safe per-endpoint counters: measured peaks, downsampled and rejected requests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def _entry(self, name: str) -> dict:
+        return self._stats.setdefault(
+            name,
+            {"measured": 0, "peak_max_mb": 0.0, "peak_last_mb": 0.0, "peak_total_mb": 0.0,
+             "downsampled": 0, "rejected": 0},
+        )
+
+    def record_peak(self, name: str, peak_bytes: int) -> None:
+        mb = peak_bytes / MB
+        with self._lock:
+            entry = self._entry(name)
+            entry["measured"] += 1
+            entry["peak_last_mb"] = mb
+            entry["peak_total_mb"] += mb
+            entry["peak_max_mb"] = max(entry["peak_max_mb"], mb)
+
+    def record(self, name: str, event: str) -> None:
+        """Count a "downsampled" or "rejected" request."""
+        with self._lock:
+            self._entry(name)[event] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            out = {}
+            for name, e in self._stats.items():
+                mean = e["peak_total_mb"] / e["measured"] if e["measured"] else 0.0
+                out[name] = {
+                    "measured": e["measured"],
+                    "peak_mean_mb": round(mean, 2),
+                    "peak_max_mb": round(e["peak_max_mb"], 2),
+                    "peak_last_mb": round(e["peak_last_mb"], 2),
+                    "downsampled": e["downsampled"],
+                    "rejected": e["rejected"],
+                }
+            return out
+
+
+_trace_lock = threading.Lock()
+_active = 0
+_started_here = False
+
+
+@contextmanager
+def measure_memory(label: str, enabled: bool = True) -> Iterator[MemoryUsage]:
+    """
+    Measure traced memory allocated while the block runs (peak minus the level at
+    entry). tracemalloc is process-wide: the peak is reset only when no other
+    measurement is running, so with overlapping requests a peak is an upper bound.
+    Tracing starts with the first measurement and stops after the last one if this
+    module started it.
+    """
+    global _active, _started_here
+    usage = MemoryUsage(label)
+    if not enabled:
+        yield usage
+        return
+    with _trace_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_here = True
+        if _active == 0:
+            tracemalloc.reset_peak()
+        _active += 1
+        baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield usage
+    finally:
+        with _trace_lock:
+            usage.peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            _active -= 1
+            if _active == 0 and _started_here:
+                tracemalloc.stop()
+                _started_here = False
+        _log.info("%s peak memory %.1f MB", label, usage.peak_bytes / MB)
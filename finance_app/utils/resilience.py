@@ -0,0 +1,267 @@
+"""
+Failure and load handling for upstream calls: negative cache, circuit breaker,
+request deadlines, concurrency limits and rate limits.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from .exceptions import DeadlineExceededError
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class NegativeCache:
+    """
+    Thread-safe TTL map remembering lookups that returned no data, so repeats of a
+    typo or delisted ticker are answered locally. Oldest entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Stored message for key, or None if absent or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, message = item
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            return message
+
+    def put(self, key: Hashable, message: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, message)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker.
+
+    closed: calls pass; failure_threshold consecutive failures open the circuit.
+    open: calls are refused until recovery_seconds have passed.
+    half_open: up to half_open_calls probes pass; a success closes the circuit,
+    a failure opens it again, and release() frees the slot of a probe that ended
+    with neither. Callers refused while a probe is in flight are told to retry
+    after probe_wait_seconds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        probe_wait_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_calls = half_open_calls
+        self.probe_wait_seconds = probe_wait_seconds
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a call may go upstream now (counts as a probe when half-open)."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a call may be allowed again: 0 when closed, the rest of the
+        cooldown when open, probe_wait_seconds while half-open probes are in flight.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return 0.0
+            if self._state == self.HALF_OPEN:
+                return 0.0 if self._probes < self.half_open_calls else self.probe_wait_seconds
+            return max(0.0, self._opened_at + self.recovery_seconds - self._clock())
+
+    def release(self) -> None:
+        """Free a half-open probe slot whose call neither succeeded nor failed upstream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                _log.info("Circuit for %s closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    _log.warning(
+                        "Circuit for %s opened after %d failure(s); retry in %.0fs",
+                        self.name,
+                        self._failures,
+                        self.recovery_seconds,
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def _refresh(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+
+class Deadline:
+    """
+    Point in time a request must finish by. Passed down to fetches, which use
+    timeout() for upstream HTTP timeouts and stop waiting once it has passed.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.budget = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def timeout(self, cap: float) -> float:
+        """Seconds to allow one upstream call: the time left, at most cap."""
+        return min(cap, self.remaining())
+
+    def check(self, what: str = "request") -> None:
+        """Raise DeadlineExceededError if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceededError(f"{what} missed its {self.budget:g}s deadline.")
+
+    def renewed(self) -> "Deadline":
+        """A fresh deadline with the same budget (e.g. for the next chunk of a stream)."""
+        return Deadline(self.budget, self._clock)
+
+
+class RateLimiter:
+    """
+    Token bucket allowing rate calls per second with bursts of up to burst calls.
+    acquire() reserves a token and sleeps until it is due, so waiting callers are
+    served in arrival order (rate <= 0 = unlimited).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a call is allowed; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight work. acquire() waits at most wait seconds for a slot and returns
+    False instead of queueing, so callers can shed load (limit <= 0 = unlimited).
+    """
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self._sem = threading.BoundedSemaphore(limit) if limit > 0 else None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, wait: float = 0.0) -> bool:
+        if self._sem is not None:
+            ok = self._sem.acquire(timeout=wait) if wait > 0 else self._sem.acquire(blocking=False)
+            if not ok:
+                return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        if self._sem is not None:
+            self._sem.release()
@@ -10,6 +10,10 @@ from .exceptions import ValidationError
 MAX_TICKER_LENGTH: int = 20
 MAX_DATE_RANGE_DAYS: int = 365 * 20  # 20 years
 
+# Bar intervals accepted anywhere an interval is taken; aliases map to these
+SUPPORTED_INTERVALS: tuple[str, ...] = ("1m", "5m", "15m", "30m", "1h", "1d")
+_INTERVAL_ALIASES = {"60m": "1h", "1d": "1d", "d": "1d", "daily": "1d"}
+
 
 def validate_ticker(ticker: str) -> str:
     """
@@ -30,6 +34,29 @@ def validate_ticker(ticker: str) -> str:
     return cleaned
 
 
+def validate_interval(interval: Optional[str]) -> str:
+    """
+    Normalize a bar interval (e.g. "5m", "1h", "1d"; None means "1d").
+    Raises ValidationError if unsupported.
+    """
+    if interval is None:
+        return "1d"
+    if not isinstance(interval, str):
+        raise ValidationError("Interval must be a string.")
+    cleaned = interval.strip().lower()
+    cleaned = _INTERVAL_ALIASES.get(cleaned, cleaned)
+    if cleaned not in SUPPORTED_INTERVALS:
+        raise ValidationError(
+            f"Unsupported interval: {interval!r}. Use one of {', '.join(SUPPORTED_INTERVALS)}."
+        )
+    return cleaned
+
+
+def is_intraday(interval: str) -> bool:
+    """True for sub-daily intervals."""
+    return interval != "1d"
+
+
 def validate_date_range(
     start: Optional[str],
     end: Optional[str],
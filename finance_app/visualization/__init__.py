@@ -2,6 +2,7 @@
 
 from .charts import (
     plot_comparison,
+    plot_drawdown,
     plot_price_with_indicators,
     plot_rsi,
     plot_volume,
@@ -16,6 +17,7 @@ def run_dashboard() -> None:
 
 __all__ = [
     "plot_comparison",
+    "plot_drawdown",
     "plot_price_with_indicators",
     "plot_rsi",
     "plot_volume",
@@ -14,15 +14,36 @@ def _ensure_index(df: pd.DataFrame) -> pd.DatetimeIndex:
     return df.index
 
 
+def _is_intraday(idx: pd.DatetimeIndex) -> bool:
+    return len(idx) > 0 and bool((idx != idx.normalize()).any())
+
+
+def _format_dates(ax: plt.Axes, idx: pd.DatetimeIndex) -> None:
+    """Date tick labels; show the time of day for intraday bars."""
+    fmt = "%Y-%m-%d %H:%M" if _is_intraday(idx) else "%Y-%m-%d"
+    ax.xaxis.set_major_formatter(mdates.DateFormatter(fmt))
+
+
+def _bar_width(idx: pd.DatetimeIndex) -> float:
+    """Bar width in days: 80% of the median bar spacing (0.8 for daily data)."""
+    if len(idx) < 2:
+        return 0.8
+    spacing = pd.Series(idx).diff().median() / pd.Timedelta(days=1)
+    return 0.8 * min(spacing, 1.0)
+
+
 def plot_price_with_indicators(
     df: pd.DataFrame,
     ticker: str,
     sma_cols: Optional[Sequence[str]] = None,
     ema_cols: Optional[Sequence[str]] = None,
     figsize: Tuple[float, float] = (10, 5),
+    channels: Optional[bool] = None,
 ) -> plt.Figure:
     """
-    Plot close price with optional SMA/EMA overlay. Returns a matplotlib Figure.
+    Plot close price with optional SMA/EMA overlay, the Donchian channel as a band and
+    the 52-week high/low as dashed lines. Returns a matplotlib Figure.
+    channels=None draws the channel/range lines when their columns are present.
     """
     if df is None or df.empty or "close" not in df.columns:
         fig, ax = plt.subplots(figsize=figsize)
@@ -42,10 +63,25 @@ def plot_price_with_indicators(
     for col in ema_cols:
         if col in df.columns:
             ax.plot(idx, df[col].values, label=col, alpha=0.8)
+    if channels is None:
+        channels = "donchian_upper" in df.columns
+    if channels:
+        if {"donchian_upper", "donchian_lower"}.issubset(df.columns):
+            ax.fill_between(
+                idx,
+                df["donchian_lower"].values,
+                df["donchian_upper"].values,
+                color="steelblue",
+                alpha=0.12,
+                label="Donchian",
+            )
+        for col, color in (("high_52w", "seagreen"), ("low_52w", "firebrick")):
+            if col in df.columns:
+                ax.plot(idx, df[col].values, label=col, color=color, linestyle="--", linewidth=0.8)
     ax.set_title(f"{ticker} - Price")
     ax.set_ylabel("Price")
     ax.legend(loc="best", fontsize=8)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    _format_dates(ax, idx)
     plt.xticks(rotation=45)
     fig.tight_layout()
     return fig
@@ -74,10 +110,10 @@ def plot_volume(
             colors.append("#26a69a")
         else:
             colors.append("#ef5350")
-    ax.bar(idx, df["volume"].values, color=colors, alpha=0.7, width=0.8)
+    ax.bar(idx, df["volume"].values, color=colors, alpha=0.7, width=_bar_width(idx))
     ax.set_title(f"{ticker} - Volume")
     ax.set_ylabel("Volume")
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    _format_dates(ax, idx)
     plt.xticks(rotation=45)
     fig.tight_layout()
     return fig
@@ -99,7 +135,31 @@ def plot_rsi(
     ax.set_ylim(0, 100)
     ax.set_title(f"{ticker} - RSI")
     ax.set_ylabel("RSI")
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    _format_dates(ax, idx)
+    plt.xticks(rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def plot_drawdown(
+    df: pd.DataFrame,
+    ticker: str,
+    figsize: Tuple[float, float] = (10, 2),
+) -> Optional[plt.Figure]:
+    """Plot drawdown (%) from the running high and the deepest so far. None if no drawdown."""
+    if df is None or df.empty or "drawdown" not in df.columns:
+        return None
+    idx = _ensure_index(df)
+    fig, ax = plt.subplots(figsize=figsize)
+    dd = df["drawdown"].values * 100
+    ax.fill_between(idx, dd, 0, color="firebrick", alpha=0.3, label="Drawdown")
+    if "max_drawdown" in df.columns:
+        ax.plot(idx, df["max_drawdown"].values * 100, color="firebrick", linewidth=0.8,
+                label="Max drawdown")
+    ax.set_title(f"{ticker} - Drawdown")
+    ax.set_ylabel("%")
+    ax.legend(loc="lower left", fontsize=8)
+    _format_dates(ax, idx)
     plt.xticks(rotation=45)
     fig.tight_layout()
     return fig
@@ -121,7 +181,11 @@ def plot_comparison(
     ax.set_title(title)
     ax.set_ylabel("Price")
     ax.legend(loc="best", fontsize=8)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    indexes = [
+        ser.index for _, ser in series_list
+        if ser is not None and isinstance(ser.index, pd.DatetimeIndex)
+    ]
+    _format_dates(ax, indexes[0] if indexes else pd.DatetimeIndex([]))
     plt.xticks(rotation=45)
     fig.tight_layout()
     return fig
@@ -5,12 +5,28 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import pandas as pd
 import streamlit as st
 
-from ..config import DEFAULT_LOOKBACK_DAYS
+from ..config import CACHE_TTL_SECONDS, DEFAULT_LOOKBACK_DAYS
+from ..models.stock import StockData
+from ..models.symbols import search_symbols, symbol_directory
 from ..services import get_ohlcv_with_indicators
+from ..utils.binary_formats import (
+    BINARY_FORMATS,
+    MEDIA_TYPES,
+    binary_formats_available,
+    encode_frames,
+)
 from ..utils.exceptions import DataSourceError, ValidationError
-from .charts import plot_price_with_indicators, plot_rsi, plot_volume
+from ..utils.validators import SUPPORTED_INTERVALS
+from .charts import plot_drawdown, plot_price_with_indicators, plot_rsi, plot_volume
+
+# Resolution for on-screen charts; exports render at EXPORT_DPI on demand
+SCREEN_DPI: int = 100
+EXPORT_DPI: int = 200
+# Distinct (ticker, range, source, interval, adjusted) inputs kept per cache
+CACHE_MAX_ENTRIES: int = 32
 
 
 def _safe_filename_part(value: str) -> str:
@@ -23,12 +39,110 @@ def _safe_filename_part(value: str) -> str:
     return "".join(out) or "export"
 
 
-def _fig_to_png_bytes(fig: plt.Figure) -> bytes:
+def _fig_to_png_bytes(fig: plt.Figure, dpi: int = EXPORT_DPI) -> bytes:
     buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
     return buf.getvalue()
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner="Fetching data...")
+def _load(
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    source: str,
+    interval: str = "1d",
+    adjusted: bool = False,
+) -> tuple[StockData, pd.DataFrame]:
+    """Fetched and enriched frame, cached on inputs. Errors are raised, not cached."""
+    return get_ohlcv_with_indicators(
+        ticker, start=start, end=end, source=source, interval=interval, adjusted=adjusted
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES * 4, show_spinner=False)
+def _chart_png(
+    kind: str,
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    source: str,
+    interval: str,
+    adjusted: bool,
+    show_indicators: bool,
+    dpi: int,
+) -> Optional[bytes]:
+    """
+    Render one chart to PNG, cached on inputs. Only the price chart depends on
+    show_indicators; callers pass False for the others so toggling reuses them.
+    """
+    _, df = _load(ticker, start, end, source, interval, adjusted)
+    if kind == "price":
+        fig = plot_price_with_indicators(
+            df,
+            ticker,
+            sma_cols=list(df.columns[df.columns.str.startswith("sma_")]) if show_indicators else [],
+            ema_cols=list(df.columns[df.columns.str.startswith("ema_")]) if show_indicators else [],
+            channels=show_indicators,
+        )
+    elif kind == "volume":
+        fig = plot_volume(df, ticker)
+    elif kind == "drawdown":
+        fig = plot_drawdown(df, ticker)
+    else:
+        fig = plot_rsi(df, ticker)
+    if fig is None:
+        return None
+    try:
+        return _fig_to_png_bytes(fig, dpi=dpi)
+    finally:
+        plt.close(fig)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _csv_bytes(
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    source: str,
+    interval: str,
+    adjusted: bool,
+) -> bytes:
+    _, df = _load(ticker, start, end, source, interval, adjusted)
+    return df.to_csv(index=True).encode("utf-8")
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _binary_bytes(
+    fmt: str,
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    source: str,
+    interval: str,
+    adjusted: bool,
+) -> bytes:
+    stock, df = _load(ticker, start, end, source, interval, adjusted)
+    meta = {
+        "ticker": stock.ticker,
+        "source": stock.source,
+        "interval": interval,
+        "adjusted": adjusted,
+    }
+    return encode_frames(df, fmt, meta)
+
+
+def _ticker_hint(ticker: str) -> None:
+    """Name of a known ticker, else up to five directory matches for the typed text."""
+    known = symbol_directory().get(ticker)
+    if known is not None:
+        st.caption(f"{known.name} ({known.exchange})")
+        return
+    matches = search_symbols(ticker, limit=5)
+    if matches:
+        st.caption("Matches: " + ", ".join(f"{m.symbol} ({m.name})" for m in matches))
+
+
 def run() -> None:
     """Render the Streamlit dashboard. Call from main or run this module with streamlit."""
     st.set_page_config(page_title="NoKeyFinance", layout="wide")
@@ -37,6 +151,7 @@ def run() -> None:
 
     with st.sidebar:
         ticker = st.text_input("Ticker", value="AAPL", max_chars=20).strip().upper() or "AAPL"
+        _ticker_hint(ticker)
         use_custom_dates = st.checkbox("Custom date range", value=False)
         start: Optional[str] = None
         end: Optional[str] = None
@@ -46,6 +161,15 @@ def run() -> None:
             start = st.date_input("Start", value=start_default).strftime("%Y-%m-%d")
             end = st.date_input("End", value=end_default).strftime("%Y-%m-%d")
         source = st.selectbox("Data source", options=["yahoo", "stooq"], index=0)
+        # Stooq serves daily bars only
+        intervals = SUPPORTED_INTERVALS if source == "yahoo" else ("1d",)
+        interval = st.selectbox("Interval", options=intervals, index=intervals.index("1d"))
+        adjusted = st.checkbox(
+            "Adjust for splits and dividends",
+            value=False,
+            disabled=source == "stooq",
+            help="Stooq prices are already adjusted.",
+        )
         show_indicators = st.checkbox("Show indicators (SMA, EMA, RSI)", value=True)
 
     if not ticker:
@@ -53,12 +177,7 @@ def run() -> None:
         return
 
     try:
-        stock, df = get_ohlcv_with_indicators(
-            ticker,
-            start=start,
-            end=end,
-            source=source,
-        )
+        stock, df = _load(ticker, start, end, source, interval, adjusted)
     except ValidationError as e:
         st.error(f"Invalid input: {e}")
         return
@@ -79,51 +198,43 @@ def run() -> None:
     date_suffix = ""
     if stock.date_range:
         date_suffix = f"_{stock.date_range[0].date()}_{stock.date_range[1].date()}"
-
-    csv_bytes = df.to_csv(index=True).encode("utf-8")
-    st.download_button(
+    if interval != "1d":
+        date_suffix += f"_{interval}"
+    if adjusted:
+        date_suffix += "_adj"
+    key = (ticker, start, end, source, interval, adjusted)
+
+    # Export bytes are produced only when a download button is clicked
+    formats = BINARY_FORMATS if binary_formats_available() else ()
+    cols = st.columns(1 + len(formats))
+    cols[0].download_button(
         "Download data (CSV)",
-        data=csv_bytes,
+        data=lambda: _csv_bytes(*key),
         file_name=f"{export_ticker}_{export_source}{date_suffix}.csv",
         mime="text/csv",
     )
+    for col, fmt in zip(cols[1:], formats):
+        col.download_button(
+            f"Download data ({fmt.capitalize()})",
+            data=lambda fmt=fmt: _binary_bytes(fmt, *key),
+            file_name=f"{export_ticker}_{export_source}{date_suffix}.{fmt}",
+            mime=MEDIA_TYPES[fmt],
+        )
 
-    fig_price = plot_price_with_indicators(
-        df,
-        ticker,
-        sma_cols=list(df.columns[df.columns.str.startswith("sma_")]) if show_indicators else [],
-        ema_cols=list(df.columns[df.columns.str.startswith("ema_")]) if show_indicators else [],
-    )
-    price_png = _fig_to_png_bytes(fig_price)
-    st.pyplot(fig_price)
-    st.download_button(
-        "Download price chart (PNG)",
-        data=price_png,
-        file_name=f"{export_ticker}_{export_source}{date_suffix}_price.png",
-        mime="image/png",
-    )
-    plt.close(fig_price)
-
-    fig_vol = plot_volume(df, ticker)
-    vol_png = _fig_to_png_bytes(fig_vol)
-    st.pyplot(fig_vol)
-    st.download_button(
-        "Download volume chart (PNG)",
-        data=vol_png,
-        file_name=f"{export_ticker}_{export_source}{date_suffix}_volume.png",
-        mime="image/png",
-    )
-    plt.close(fig_vol)
-
+    charts = [("price", "price", show_indicators), ("volume", "volume", False)]
     if show_indicators:
-        fig_rsi = plot_rsi(df, ticker)
-        if fig_rsi is not None:
-            rsi_png = _fig_to_png_bytes(fig_rsi)
-            st.pyplot(fig_rsi)
-            st.download_button(
-                "Download RSI chart (PNG)",
-                data=rsi_png,
-                file_name=f"{export_ticker}_{export_source}{date_suffix}_rsi.png",
-                mime="image/png",
-            )
-            plt.close(fig_rsi)
+        charts.append(("rsi", "RSI", False))
+        charts.append(("drawdown", "drawdown", False))
+    for kind, label, indicators in charts:
+        png = _chart_png(kind, *key, indicators, SCREEN_DPI)
+        if png is None:
+            continue
+        st.image(png, width="stretch")
+        st.download_button(
+            f"Download {label} chart (PNG)",
+            data=lambda kind=kind, indicators=indicators: _chart_png(
+                kind, *key, indicators, EXPORT_DPI
+            ),
+            file_name=f"{export_ticker}_{export_source}{date_suffix}_{kind}.png",
+            mime="image/png",
+        )
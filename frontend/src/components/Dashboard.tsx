@@ -1,10 +1,17 @@
-import { useCallback, useState } from "react";
-import type { OHLCVResponse } from "../types";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
+import type { OHLCVChunk, OHLCVResponse, OHLCVRow, SymbolMatch } from "../types";
 import PriceChart from "./PriceChart";
 import VolumeChart from "./VolumeChart";
 import RSIChart from "./RSIChart";
+import DrawdownChart from "./DrawdownChart";
 
 const API_BASE = "/api";
+const INTERVALS = ["1m", "5m", "15m", "30m", "1h", "1d"] as const;
+type Interval = (typeof INTERVALS)[number];
+// How often an open dashboard asks for bars newer than its cursor
+const POLL_MS = 60_000;
+// Pause after the last keystroke before asking for ticker suggestions
+const SUGGEST_DELAY_MS = 150;
 
 function safeFilename(s: string): string {
   return (s || "")
@@ -13,28 +20,141 @@ function safeFilename(s: string): string {
     .slice(0, 30) || "export";
 }
 
+/** Prepend an older chunk (chunks arrive newest first). */
+function mergeChunk(prev: OHLCVResponse | null, chunk: OHLCVChunk): OHLCVResponse {
+  if (!prev || chunk.chunk === 0) {
+    return {
+      ticker: chunk.ticker,
+      source: chunk.source,
+      dateRange: chunk.dateRange,
+      rows: chunk.rows,
+      cursor: chunk.cursor,
+    };
+  }
+  if (!chunk.rows.length) return prev;
+  const dateRange: [string, string] | null =
+    prev.dateRange && chunk.dateRange
+      ? [chunk.dateRange[0], prev.dateRange[1]]
+      : prev.dateRange ?? chunk.dateRange;
+  return { ...prev, dateRange, rows: [...chunk.rows, ...prev.rows] };
+}
+
+/** Apply a cursor response: its rows replace ours from their first date on. */
+function applyDelta(prev: OHLCVResponse, delta: OHLCVResponse): OHLCVResponse {
+  const cursor = delta.cursor ?? prev.cursor;
+  if (!delta.rows.length) return { ...prev, cursor };
+  const first = delta.rows[0].date;
+  const rows = [...prev.rows.filter((r) => r.date < first), ...delta.rows];
+  const dateRange: [string, string] | null =
+    prev.dateRange && delta.dateRange
+      ? [prev.dateRange[0], delta.dateRange[1]]
+      : prev.dateRange ?? delta.dateRange;
+  return { ...prev, dateRange, rows, cursor };
+}
+
+/** Streamed and delta rows omit drawdowns (they need the whole series); derive them from close. */
+function withDrawdown(rows: OHLCVRow[]): OHLCVRow[] {
+  let peak = -Infinity;
+  let worst = 0;
+  return rows.map((r) => {
+    if (r.close == null) return r;
+    peak = Math.max(peak, r.close);
+    const drawdown = r.close / peak - 1;
+    worst = Math.min(worst, drawdown);
+    return { ...r, drawdown, max_drawdown: worst };
+  });
+}
+
 export default function Dashboard() {
   const [ticker, setTicker] = useState("AAPL");
   const [start, setStart] = useState("");
   const [end, setEnd] = useState("");
   const [source, setSource] = useState<"yahoo" | "stooq">("yahoo");
+  const [barInterval, setBarInterval] = useState<Interval>("1d");
   const [showIndicators, setShowIndicators] = useState(true);
+  const [adjusted, setAdjusted] = useState(false);
   const [data, setData] = useState<OHLCVResponse | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [suggestions, setSuggestions] = useState<SymbolMatch[]>([]);
 
-  const fetchData = useCallback(async () => {
-    setError(null);
-    setLoading(true);
+  const [backfilling, setBackfilling] = useState(false);
+  const streamRef = useRef<EventSource | null>(null);
+  // Query of the last load, so binary exports match what is on screen
+  const loadedParams = useRef<URLSearchParams | null>(null);
+
+  useEffect(() => () => streamRef.current?.close(), []);
+
+  // Autocomplete from the server's local symbol directory (no upstream call)
+  useEffect(() => {
+    const q = ticker.trim();
+    if (!q) {
+      setSuggestions([]);
+      return;
+    }
+    const controller = new AbortController();
+    const id = window.setTimeout(async () => {
+      try {
+        const params = new URLSearchParams({ q, limit: "8" });
+        const res = await fetch(`${API_BASE}/symbols?${params}`, { signal: controller.signal });
+        if (!res.ok) return;
+        const json: { results: SymbolMatch[] } = await res.json();
+        setSuggestions(json.results);
+      } catch {
+        // Aborted by the next keystroke, or the API is down; keep the old list
+      }
+    }, SUGGEST_DELAY_MS);
+    return () => {
+      window.clearTimeout(id);
+      controller.abort();
+    };
+  }, [ticker]);
+
+  // Poll for new bars once loaded (open-ended ranges only); each poll returns a
+  // handful of rows with warmed-up indicators instead of the whole series.
+  const cursorRef = useRef<string | null>(null);
+  cursorRef.current = data?.cursor ?? null;
+  const live = Boolean(data?.cursor) && !loading && !backfilling;
+  useEffect(() => {
+    if (!live) return;
+    const id = window.setInterval(async () => {
+      const base = loadedParams.current;
+      const cursor = cursorRef.current;
+      if (!base || !cursor || base.has("end")) return;
+      const params = new URLSearchParams(base);
+      params.delete("start");
+      params.set("cursor", cursor);
+      try {
+        const res = await fetch(`${API_BASE}/ohlcv?${params}`);
+        if (!res.ok) return;
+        const delta: OHLCVResponse = await res.json();
+        // Ignore answers that arrive after a new load replaced the series
+        setData((prev) => (prev && prev.cursor === cursor ? applyDelta(prev, delta) : prev));
+      } catch {
+        // Transient; the next tick retries with the same cursor
+      }
+    }, POLL_MS);
+    return () => window.clearInterval(id);
+  }, [live]);
+
+  const buildParams = useCallback(() => {
+    const params = new URLSearchParams({
+      ticker: ticker.trim().toUpperCase() || "AAPL",
+      source,
+      interval: barInterval,
+      show_indicators: String(showIndicators),
+      adjusted: String(adjusted && source === "yahoo"),
+    });
+    if (start) params.set("start", start);
+    if (end) params.set("end", end);
+    return params;
+  }, [ticker, start, end, source, barInterval, showIndicators, adjusted]);
+
+  // Plain JSON request; used when the stream fails before its first chunk so the
+  // user still gets data or the API's error detail (EventSource hides the body).
+  const fetchJSON = useCallback(async () => {
     try {
-      const params = new URLSearchParams({
-        ticker: ticker.trim().toUpperCase() || "AAPL",
-        source,
-        show_indicators: String(showIndicators),
-      });
-      if (start) params.set("start", start);
-      if (end) params.set("end", end);
-      const res = await fetch(`${API_BASE}/ohlcv?${params}`);
+      const res = await fetch(`${API_BASE}/ohlcv?${buildParams()}`);
       if (!res.ok) {
         const err = await res.json().catch(() => ({}));
         throw new Error(err.detail || res.statusText);
@@ -47,7 +167,48 @@ export default function Dashboard() {
     } finally {
       setLoading(false);
     }
-  }, [ticker, start, end, source, showIndicators]);
+  }, [buildParams]);
+
+  const fetchData = useCallback(() => {
+    streamRef.current?.close();
+    setError(null);
+    setData(null);
+    setLoading(true);
+    setBackfilling(false);
+    loadedParams.current = buildParams();
+    // Intraday ranges are short; the stream endpoint serves daily bars only
+    if (barInterval !== "1d") {
+      fetchJSON();
+      return;
+    }
+    let received = 0;
+    const es = new EventSource(`${API_BASE}/ohlcv/stream?${buildParams()}`);
+    streamRef.current = es;
+    const finish = () => {
+      es.close();
+      setBackfilling(false);
+      setLoading(false);
+    };
+    es.addEventListener("chunk", (ev) => {
+      const chunk: OHLCVChunk = JSON.parse((ev as MessageEvent).data);
+      received += 1;
+      setData((prev) => mergeChunk(prev, chunk));
+      setLoading(false);
+      setBackfilling(true);
+    });
+    es.addEventListener("backfill_error", (ev) => {
+      const { detail } = JSON.parse((ev as MessageEvent).data);
+      setError(`Older history incomplete: ${detail}`);
+    });
+    es.addEventListener("done", finish);
+    es.onerror = () => {
+      finish();
+      if (received === 0) {
+        setLoading(true);
+        fetchJSON();
+      }
+    };
+  }, [buildParams, fetchJSON, barInterval]);
 
   const exportCSV = useCallback(() => {
     if (!data?.rows?.length) return;
@@ -70,6 +231,18 @@ export default function Dashboard() {
     URL.revokeObjectURL(url);
   }, [data]);
 
+  // Arrow/Parquet are encoded server-side from the enriched frame
+  const exportBinary = useCallback((format: "arrow" | "parquet") => {
+    if (!loadedParams.current) return;
+    const params = new URLSearchParams(loadedParams.current);
+    params.set("format", format);
+    const a = document.createElement("a");
+    a.href = `${API_BASE}/ohlcv?${params}`;
+    a.click();
+  }, []);
+
+  const chartRows = useMemo(() => withDrawdown(data?.rows ?? []), [data]);
+
   const dateSuffix = data?.dateRange
     ? `_${data.dateRange[0]}_${data.dateRange[1]}`
     : "";
@@ -97,8 +270,10 @@ export default function Dashboard() {
           type="text"
           value={ticker}
           onChange={(e) => setTicker(e.target.value.toUpperCase())}
-          placeholder="AAPL"
+          placeholder="AAPL or a company name"
           maxLength={20}
+          list="ticker-suggestions"
+          autoComplete="off"
           style={{
             width: "100%",
             padding: 8,
@@ -109,6 +284,13 @@ export default function Dashboard() {
             borderRadius: 4,
           }}
         />
+        <datalist id="ticker-suggestions">
+          {suggestions.map((m) => (
+            <option key={m.symbol} value={m.symbol}>
+              {m.name} ({m.exchange})
+            </option>
+          ))}
+        </datalist>
         <label style={{ display: "block", marginBottom: 4, fontSize: 12 }}>
           Start (YYYY-MM-DD)
         </label>
@@ -150,7 +332,11 @@ export default function Dashboard() {
         </label>
         <select
           value={source}
-          onChange={(e) => setSource(e.target.value as "yahoo" | "stooq")}
+          onChange={(e) => {
+            const next = e.target.value as "yahoo" | "stooq";
+            setSource(next);
+            if (next === "stooq") setBarInterval("1d");
+          }}
           style={{
             width: "100%",
             padding: 8,
@@ -164,6 +350,37 @@ export default function Dashboard() {
           <option value="yahoo">Yahoo</option>
           <option value="stooq">Stooq</option>
         </select>
+        <label style={{ display: "block", marginBottom: 4, fontSize: 12 }}>
+          Interval
+        </label>
+        <select
+          value={barInterval}
+          onChange={(e) => setBarInterval(e.target.value as Interval)}
+          style={{
+            width: "100%",
+            padding: 8,
+            marginBottom: 12,
+            background: "#222",
+            border: "1px solid #444",
+            color: "#eee",
+            borderRadius: 4,
+          }}
+        >
+          {INTERVALS.filter((iv) => source === "yahoo" || iv === "1d").map((iv) => (
+            <option key={iv} value={iv}>
+              {iv}
+            </option>
+          ))}
+        </select>
+        <label style={{ display: "flex", alignItems: "center", gap: 8, marginBottom: 8 }}>
+          <input
+            type="checkbox"
+            checked={adjusted && source === "yahoo"}
+            disabled={source === "stooq"}
+            onChange={(e) => setAdjusted(e.target.checked)}
+          />
+          <span style={{ fontSize: 12 }}>Adjust for splits and dividends</span>
+        </label>
         <label style={{ display: "flex", alignItems: "center", gap: 8, marginBottom: 16 }}>
           <input
             type="checkbox"
@@ -215,6 +432,13 @@ export default function Dashboard() {
               {data.dateRange && (
                 <p style={{ margin: 0, fontSize: 14, color: "#888" }}>
                   {data.dateRange[0]} – {data.dateRange[1]}
+                  {backfilling && " (loading older history…)"}
+                </p>
+              )}
+              {data.downsample !== undefined && data.downsample > 1 && (
+                <p style={{ margin: "4px 0 0", fontSize: 13, color: "#c90" }}>
+                  Each row merges {data.downsample} bars to stay within the server's memory
+                  budget; narrow the range for full resolution.
                 </p>
               )}
               {data.rows.length > 0 && (
@@ -233,6 +457,25 @@ export default function Dashboard() {
                   Download data (CSV)
                 </button>
               )}
+              {data.rows.length > 0 &&
+                (["arrow", "parquet"] as const).map((format) => (
+                  <button
+                    key={format}
+                    onClick={() => exportBinary(format)}
+                    style={{
+                      marginTop: 12,
+                      marginLeft: 8,
+                      padding: "8px 16px",
+                      background: "#333",
+                      border: "1px solid #555",
+                      color: "#eee",
+                      borderRadius: 4,
+                      cursor: "pointer",
+                    }}
+                  >
+                    {format === "arrow" ? "Arrow" : "Parquet"}
+                  </button>
+                ))}
             </header>
 
             {data.rows.length === 0 ? (
@@ -263,6 +506,15 @@ export default function Dashboard() {
                     />
                   </section>
                 )}
+                {showIndicators && (
+                  <section style={{ marginTop: 32 }}>
+                    <h3 style={{ margin: "0 0 8px", fontSize: 16 }}>Drawdown</h3>
+                    <DrawdownChart
+                      rows={chartRows}
+                      exportFilename={`${exportTicker}_${exportSource}${dateSuffix}_drawdown.png`}
+                    />
+                  </section>
+                )}
               </>
             )}
           </>
@@ -102,6 +102,44 @@ export default function PriceChart({ rows, showIndicators, exportFilename }: Pro
                 dot={false}
                 connectNulls
               />
+              <Line
+                type="stepAfter"
+                dataKey="donchian_upper"
+                name="Donchian 20"
+                stroke="#4a7a9a"
+                strokeWidth={1}
+                dot={false}
+                connectNulls
+              />
+              <Line
+                type="stepAfter"
+                dataKey="donchian_lower"
+                legendType="none"
+                stroke="#4a7a9a"
+                strokeWidth={1}
+                dot={false}
+                connectNulls
+              />
+              <Line
+                type="stepAfter"
+                dataKey="high_52w"
+                name="52w high"
+                stroke="#4c4"
+                strokeDasharray="4 3"
+                strokeWidth={1}
+                dot={false}
+                connectNulls
+              />
+              <Line
+                type="stepAfter"
+                dataKey="low_52w"
+                name="52w low"
+                stroke="#c44"
+                strokeDasharray="4 3"
+                strokeWidth={1}
+                dot={false}
+                connectNulls
+              />
             </>
           )}
         </LineChart>
@@ -12,11 +12,35 @@ export interface OHLCVRow {
   rsi?: number | null;
   returns?: number | null;
   volatility?: number | null;
+  high_52w?: number | null;
+  low_52w?: number | null;
+  pct_from_high?: number | null;
+  drawdown?: number | null;
+  max_drawdown?: number | null;
+  donchian_upper?: number | null;
+  donchian_lower?: number | null;
+  donchian_mid?: number | null;
 }
 
 export interface OHLCVResponse {
   ticker: string;
   source: string;
+  interval?: string;
+  adjusted?: boolean;
+  downsample?: number;
   dateRange: [string, string] | null;
   rows: OHLCVRow[];
+  cursor?: string | null;
+  since?: string;
+}
+
+export interface OHLCVChunk extends OHLCVResponse {
+  chunk: number;
+}
+
+export interface SymbolMatch {
+  symbol: string;
+  name: string;
+  exchange: string;
+  stooq: string;
 }
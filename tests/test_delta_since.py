@@ -0,0 +1,44 @@
+"""Delta mode returns only bars after since, whatever time of day daily bars carry."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_app.models.indicators import add_indicators
+from finance_app.models.stock import StockData
+from finance_app.services import analysis_service
+
+
+@pytest.fixture
+def yahoo_daily(monkeypatch):
+    # Yahoo stamps daily bars at midnight New York time, i.e. 04:00 UTC in summer
+    index = pd.date_range("2025-09-01", "2025-10-10", freq="B") + pd.Timedelta(hours=4)
+    close = np.linspace(100.0, 120.0, len(index))
+    df = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1000},
+        index=pd.DatetimeIndex(index, name="date"),
+    )
+
+    def fake_fetch(ticker, **kwargs):
+        return StockData(ticker, "yahoo", df), add_indicators(df)
+
+    monkeypatch.setattr(analysis_service, "get_ohlcv_with_indicators", fake_fetch)
+    return df
+
+
+def test_date_only_since_excludes_that_day(yahoo_daily):
+    stock, enriched = analysis_service.get_ohlcv_since(
+        "AAPL", since=pd.Timestamp("2025-10-07"), end="2025-10-10"
+    )
+    assert [d.date().isoformat() for d in stock.df.index] == [
+        "2025-10-08", "2025-10-09", "2025-10-10"
+    ]
+    assert enriched.index.equals(stock.df.index)
+
+
+def test_cursor_resends_its_bar(yahoo_daily):
+    last = yahoo_daily.index[-2]
+    stock, _ = analysis_service.get_ohlcv_since(
+        "AAPL", since=last, end="2025-10-10", inclusive=True
+    )
+    assert list(stock.df.index) == list(yahoo_daily.index[-2:])
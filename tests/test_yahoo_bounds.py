@@ -0,0 +1,83 @@
+"""Fetch bounds reach Yahoo as the same instants whatever the server's time zone."""
+
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from yfinance.utils import _parse_user_dt
+
+from finance_app.data_sources import yahoo
+from finance_app.data_sources.yahoo import YahooSource
+from finance_app.services import data_service
+from finance_app.utils.exceptions import NoDataError
+
+NY = "America/New_York"
+CLOSE = pd.Timestamp("2025-10-15 16:00", tz=NY)
+
+
+@pytest.fixture
+def west_coast(monkeypatch):
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class _FakeTicker:
+    calls: list = []
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, **kwargs):
+        _FakeTicker.calls.append(kwargs)
+        idx = pd.date_range("2025-10-15 13:30", periods=3, freq="5min", tz="UTC")
+        return pd.DataFrame(
+            {"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1}, index=idx
+        )
+
+
+def test_session_close_is_exchange_time(west_coast):
+    _, end_dt, last, _ = data_service._session_bounds(
+        YahooSource(), "AAPL", datetime(2025, 10, 15), datetime(2025, 10, 16)
+    )
+    assert str(last) == "2025-10-15"
+    assert pd.Timestamp(end_dt) == CLOSE
+
+
+def test_yfinance_gets_the_close(west_coast, monkeypatch):
+    monkeypatch.setattr(yahoo, "YAHOO_BASE_URL", None)
+    monkeypatch.setattr(yahoo.yf, "Ticker", _FakeTicker)
+    _FakeTicker.calls = []
+    _, end_dt, _, _ = data_service._session_bounds(
+        YahooSource(), "AAPL", datetime(2025, 10, 15), datetime(2025, 10, 16)
+    )
+    YahooSource().fetch("AAPL", datetime(2025, 10, 15), end_dt, interval="5m")
+    # a naive non-midnight bound is local time: 13:00 in Los Angeles is the close
+    YahooSource().fetch("AAPL", datetime(2025, 10, 15), datetime(2025, 10, 15, 13), "5m")
+    for call in _FakeTicker.calls:
+        assert _parse_user_dt(call["end"], NY) == CLOSE
+        assert _parse_user_dt(call["start"], NY) == pd.Timestamp("2025-10-15", tz=NY)
+
+
+def test_chart_endpoint_gets_the_close(west_coast, monkeypatch):
+    sent = {}
+
+    class _Response:
+        status_code = 404
+
+    def fake_get(url, params, timeout):
+        sent.update(params)
+        return _Response()
+
+    monkeypatch.setattr(yahoo, "YAHOO_BASE_URL", "http://127.0.0.1:1")
+    monkeypatch.setattr(yahoo.requests, "get", fake_get)
+    _, end_dt, _, _ = data_service._session_bounds(
+        YahooSource(), "AAPL", datetime(2025, 10, 15), datetime(2025, 10, 16)
+    )
+    with pytest.raises(NoDataError):
+        YahooSource().fetch("AAPL", datetime(2025, 10, 15), end_dt, interval="5m")
+    assert sent["period2"] == int(CLOSE.timestamp())
+    assert sent["period1"] == int(pd.Timestamp("2025-10-15", tz=NY).timestamp())